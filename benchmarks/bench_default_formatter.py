@@ -0,0 +1,133 @@
+"""`default` output: the DefaultFormatter writer now vs the previous one,
+which split every file with `splitlines()` and wrote each line with its
+prefix rebuilt per file.
+
+    python benchmarks/bench_default_formatter.py [--files N] [--lines L]
+
+Feeds the same scan events for N files of L lines (20 per directory,
+directories nested four deep) to both, writing to os.devnull through a
+text stream as the CLI does. Reports wall time per formatter and checks
+that both outputs are identical.
+"""
+
+import argparse
+import gc
+import hashlib
+import os
+import sys
+from time import perf_counter
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "src"))
+
+from core.formatter import DefaultFormatter, FormatWriter  # noqa: E402
+from models import EnterDirEvent, ExitDirEvent, FileEvent, FileNode  # noqa: E402
+
+FILES_PER_DIR = 20
+DIRS_PER_DIR = 5
+DEPTH = 4
+
+
+class _SplitlinesWriter(FormatWriter):
+    """The previous implementation."""
+
+    def __init__(self, stream, prefix=""):
+        super().__init__(stream)
+        self._root_prefix = prefix
+        self._stack = []
+
+    def _next_child(self):
+        frame = self._stack[-1]
+        frame[1] -= 1
+        return frame[0], frame[1] == 0
+
+    def enter_dir(self, event):
+        if self._stack:
+            parent_prefix, is_last = self._next_child()
+            prefix = parent_prefix + ("    " if is_last else "│   ")
+        else:
+            prefix = self._root_prefix
+        self._out.write(f"{prefix}📁 {event.name}/\n")
+        self._stack.append([prefix, event.file_count + event.dir_count])
+
+    def file(self, file):
+        prefix, is_last = self._next_child()
+        connector = "└── " if is_last else "├── "
+        child_prefix = prefix + ("    " if is_last else "│   ")
+
+        self._out.write(f"{prefix}{connector}📄 {file.name} ({file.size} bytes)\n")
+        if file.content:
+            lines = file.content.splitlines()
+            for j, line in enumerate(lines):
+                is_last_line = j == len(lines) - 1
+                line_connector = "└── " if is_last_line else "│   "
+                self._out.write(f"{child_prefix}{line_connector}{line}\n")
+
+    def exit_dir(self, event):
+        self._stack.pop()
+
+
+class _HashingSink:
+    def __init__(self):
+        self._hash = hashlib.sha1()
+
+    def write(self, text):
+        self._hash.update(text.encode("utf-8"))
+        return len(text)
+
+
+def events(n_files: int, content: str):
+    remaining = [n_files]
+
+    def directory(name, depth):
+        files = min(FILES_PER_DIR, remaining[0])
+        remaining[0] -= files
+        dirs = DIRS_PER_DIR if depth < DEPTH and remaining[0] else 0
+        yield EnterDirEvent(name=name, file_count=files, dir_count=dirs)
+        for i in range(files):
+            text = content + str(i)
+            yield FileEvent(file=FileNode(name=f"file_{i}.py", content=text, size=len(text)))
+        for d in range(dirs):
+            yield from directory(f"dir_{d}", depth + 1)
+        yield ExitDirEvent(name=name)
+
+    while remaining[0]:
+        yield from directory("root", 0)
+
+
+def feed_old(stream, n_files, content):
+    writer = _SplitlinesWriter(stream)
+    for event in events(n_files, content):
+        writer.feed(event)
+    writer.close()
+
+
+def feed_new(stream, n_files, content):
+    DefaultFormatter().write(events(n_files, content), stream)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--files", type=int, default=50_000)
+    parser.add_argument("--lines", type=int, default=40)
+    args = parser.parse_args()
+    content = "def handler(event):\n    return event.name  # ü\n" * (args.lines // 2)
+
+    print(f"{args.files} files of {args.lines} lines, {FILES_PER_DIR} per directory")
+    digests = set()
+    for label, feed in (("splitlines per file", feed_old), ("line-streaming", feed_new)):
+        sink = _HashingSink()
+        feed(sink, args.files, content)
+        digests.add(sink._hash.hexdigest())
+
+        gc.collect()
+        with open(os.devnull, "w", encoding="utf-8") as devnull:
+            start = perf_counter()
+            feed(devnull, args.files, content)
+            elapsed = perf_counter() - start
+        print(f"{label:<22}{elapsed * 1000:>8.0f}ms")
+    if len(digests) != 1:
+        raise SystemExit("outputs differ")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,133 @@
+"""Nested `json` output: the streaming encoder JsonStringFormatter uses
+now vs building the whole document as dicts and lists and handing it to
+`json.dump` once the tree is complete, as it used to.
+
+    python benchmarks/bench_json_formatter.py [--files N] [--content-size B]
+
+Feeds the same scan events for N files (20 per directory) to both and
+discards the output, so only the encoding is measured. Reports wall
+time and, in a second run, the tracemalloc peak; both outputs are
+checked to be identical.
+"""
+
+import argparse
+import gc
+import hashlib
+import json
+import os
+import sys
+import tracemalloc
+from time import perf_counter
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "src"))
+
+from core.formatter import FormatWriter, JsonStringFormatter  # noqa: E402
+from models import EnterDirEvent, ExitDirEvent, FileEvent, FileNode  # noqa: E402
+
+FILES_PER_DIR = 20
+
+
+class _DictJsonWriter(FormatWriter):
+    """The previous implementation: one dict per node, `json.dump` at the
+    end."""
+
+    def __init__(self, stream, indent):
+        super().__init__(stream)
+        self._indent = indent
+        self._stack = []
+        self._root = None
+
+    def enter_dir(self, event):
+        node = {"name": event.name, "files": [], "subdirectories": []}
+        if self._stack:
+            self._stack[-1]["subdirectories"].append(node)
+        else:
+            self._root = node
+        self._stack.append(node)
+
+    def file(self, file):
+        self._stack[-1]["files"].append(
+            {"name": file.name, "content": file.content, "size": file.size}
+        )
+
+    def exit_dir(self, event):
+        self._stack.pop()
+
+    def close(self):
+        json.dump(self._root, self._out, indent=self._indent, ensure_ascii=False)
+
+
+class _HashingSink:
+    """Discards the output, keeping only a digest to compare runs."""
+
+    def __init__(self):
+        self._hash = hashlib.sha1()
+
+    def write(self, text):
+        self._hash.update(text.encode("utf-8"))
+        return len(text)
+
+    def hexdigest(self):
+        return self._hash.hexdigest()
+
+
+def events(n_files: int, content: str):
+    n_dirs = n_files // FILES_PER_DIR
+    yield EnterDirEvent(name="root", file_count=0, dir_count=n_dirs)
+    for d in range(n_dirs):
+        yield EnterDirEvent(name=f"dir_{d}", file_count=FILES_PER_DIR, dir_count=0)
+        for i in range(FILES_PER_DIR):
+            # A fresh string per file, as read from disk.
+            text = content[:-1] + str(i % 10)
+            yield FileEvent(file=FileNode(name=f"file_{i}.py", content=text, size=len(text)))
+        yield ExitDirEvent(name=f"dir_{d}")
+    yield ExitDirEvent(name="root")
+
+
+def feed(make_writer, n_files: int, content: str) -> str:
+    sink = _HashingSink()
+    writer = make_writer(sink)
+    for event in events(n_files, content):
+        writer.feed(event)
+    writer.close()
+    return sink.hexdigest()
+
+
+def run(make_writer, n_files: int, content: str) -> tuple[float, float, str]:
+    # Timed without tracemalloc, which slows allocation down a lot.
+    gc.collect()
+    start = perf_counter()
+    digest = feed(make_writer, n_files, content)
+    elapsed = perf_counter() - start
+
+    gc.collect()
+    tracemalloc.start()
+    feed(make_writer, n_files, content)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return elapsed, peak, digest
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--files", type=int, default=50_000)
+    parser.add_argument("--content-size", type=int, default=2_000)
+    args = parser.parse_args()
+    content = ('print("hello")\n\tx = "ü"\n' * args.content_size)[: args.content_size]
+
+    print(f"{args.files} files of {args.content_size} chars, {FILES_PER_DIR} per directory")
+    print(f"{'encoder':<22}{'time':>10}{'peak memory':>16}")
+    digests = set()
+    for label, make_writer in (
+        ("dicts + json.dump", lambda out: _DictJsonWriter(out, 2)),
+        ("streaming", JsonStringFormatter().writer),
+    ):
+        elapsed, peak, digest = run(make_writer, args.files, content)
+        digests.add(digest)
+        print(f"{label:<22}{elapsed * 1000:>8.0f}ms{peak / 2**10:>13.0f}KiB")
+    if len(digests) != 1:
+        raise SystemExit("outputs differ")
+
+
+if __name__ == "__main__":
+    main()
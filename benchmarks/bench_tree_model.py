@@ -0,0 +1,84 @@
+"""Construction cost of the pydantic File/Directory models vs the slots
+FileNode/DirNode the scanner uses internally.
+
+    python benchmarks/bench_tree_model.py [--files N]
+
+Builds N files spread over directories of 20 files each, once per
+model, and reports time and traced memory per node. File contents are
+shared string objects so only node overhead is measured.
+"""
+
+import argparse
+import gc
+import os
+import sys
+import tracemalloc
+from time import perf_counter
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "src"))
+
+from models import Directory, DirNode, File, FileNode  # noqa: E402
+
+FILES_PER_DIR = 20
+CONTENT = "print('hello')\n" * 10
+
+
+def build_pydantic(n_files: int) -> Directory:
+    dirs = []
+    for d in range(n_files // FILES_PER_DIR):
+        files = [
+            File(name=f"file_{i}.py", content=CONTENT, size=len(CONTENT))
+            for i in range(FILES_PER_DIR)
+        ]
+        dirs.append(Directory(name=f"dir_{d}", files=files, subdirectories=[]))
+    return Directory(name="root", files=[], subdirectories=dirs)
+
+
+def build_slots(n_files: int) -> DirNode:
+    root = DirNode(name="root")
+    for d in range(n_files // FILES_PER_DIR):
+        node = DirNode(name=f"dir_{d}")
+        node.files = [
+            FileNode(name=f"file_{i}.py", content=CONTENT, size=len(CONTENT))
+            for i in range(FILES_PER_DIR)
+        ]
+        root.subdirectories.append(node)
+    return root
+
+
+def measure(build, n_files: int) -> tuple[float, float]:
+    nodes = n_files + n_files // FILES_PER_DIR + 1
+
+    gc.collect()
+    start = perf_counter()
+    tree = build(n_files)
+    elapsed = perf_counter() - start
+    del tree
+
+    gc.collect()
+    tracemalloc.start()
+    tree = build(n_files)
+    current, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del tree
+
+    return elapsed / nodes * 1e9, current / nodes
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--files", type=int, default=200_000)
+    args = parser.parse_args()
+
+    print(f"{args.files} files, {FILES_PER_DIR} per directory")
+    print(f"{'model':<20}{'ns/node':>12}{'bytes/node':>14}")
+    for label, build in (
+        ("pydantic File/Dir", build_pydantic),
+        ("slots FileNode/Dir", build_slots),
+    ):
+        ns, size = measure(build, args.files)
+        print(f"{label:<20}{ns:>12.0f}{size:>14.0f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,4 +1,12 @@
 import sys
 import os
 
-sys.path.insert(0, os.path.join(os.path.dirname(__file__), "src"))
\ No newline at end of file
+ROOT = os.path.dirname(__file__)
+sys.path.insert(0, os.path.join(ROOT, "src"))
+
+# cli/_version.py is generated by build.py and not tracked; the CLI
+# imports it, so a fresh checkout needs it before the tests can run.
+if not os.path.exists(os.path.join(ROOT, "src", "cli", "_version.py")):
+    from build import read_version, write_version_file
+
+    write_version_file(read_version())
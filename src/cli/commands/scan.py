@@ -6,19 +6,46 @@ import typer
 from rich.console import Console
 
 from cli._version import __version__
+from core.compression import codec_for_path
 from core.config_discovery import ConfigDiscovery
 from core.config_reader import ConfigReader
-from core.scanner import BaseScanner
+from core.dedupe import Deduplicator
+from core.explain import PathExplainer
+from core.file_reader import FileReader, IFileReader
+from core.git_index import GitIndexError
+from core.git_index_scanner import GitIndexScanner, ParallelGitIndexScanner
+from core.minifier import ContentMinifier
+from core.parallel_scanner import ParallelScanner
+from core.process_scanner import ProcessScanner
+from core.rule_profiler import RuleProfiler
+from core.scan_cache import CACHE_DIR_NAME, CachedFileReader, ScanCache
+from core.scanner import BaseScanner, ScanError, track_scan
+from core.token_budget import (
+    CharRatioEstimator,
+    DepthPriority,
+    IBudgetPriority,
+    PathPatternPriority,
+    SmallestFirstPriority,
+    TokenBudget,
+    WalkOrderPriority,
+)
 from core.update_checker import REQUEST_TIMEOUT_SECONDS, UpdateChecker
-from models import ScanResult, ScanTimer
+from models import ScanStats, ScanTimer
 from models.scan_template import ScanTemplate
 
-from ..types import OutputDest, OutputFormat
-from ..utils import apply_gitignore, build_config, get_formatter, write_output
+from ..types import BudgetPriority, Compression, OutputDest, OutputFormat
+from ..utils import (
+    apply_gitignore,
+    build_config,
+    get_formatter,
+    OutputTarget,
+    write_chunked,
+    write_outputs,
+)
 
 
 def _print_stats(
-    result: ScanResult,
+    result: ScanStats,
     format_elapsed: float,
     write_elapsed: float,
     total_elapsed: float,
@@ -40,7 +67,8 @@ def _print_stats(
         con.print(
             f"   scan     {ms(result.elapsed)}\n"
             f"   format   {ms(format_elapsed)}\n"
-            f"   write    {ms(write_elapsed)}"
+            f"   write    {ms(write_elapsed)}\n"
+            f"   stat     [bold]{result.stat_calls}[/bold] calls"
         )
 
 
@@ -59,6 +87,135 @@ def _print_update_notice(
     )
 
 
+def _make_budget_priority(
+    priority: BudgetPriority, priority_paths: list[str]
+) -> IBudgetPriority:
+    if priority == BudgetPriority.depth:
+        return DepthPriority()
+    if priority == BudgetPriority.path:
+        return PathPatternPriority(priority_paths)
+    if priority == BudgetPriority.walk:
+        return WalkOrderPriority()
+    return SmallestFirstPriority()
+
+
+def _make_scanner(
+    jobs: int,
+    processes: int,
+    file_reader: IFileReader,
+    from_git_index: bool = False,
+    rule_profiler: RuleProfiler | None = None,
+    token_budget: TokenBudget | None = None,
+) -> BaseScanner:
+    if from_git_index:
+        if jobs > 1:
+            return ParallelGitIndexScanner(
+                file_reader, jobs=jobs, rule_profiler=rule_profiler, token_budget=token_budget
+            )
+        return GitIndexScanner(file_reader, rule_profiler, token_budget)
+    if processes > 1 and rule_profiler is None and token_budget is None:
+        return ProcessScanner(file_reader, processes=processes)
+    if jobs > 1:
+        return ParallelScanner(
+            file_reader, jobs=jobs, rule_profiler=rule_profiler, token_budget=token_budget
+        )
+    return BaseScanner(file_reader, rule_profiler, token_budget)
+
+
+Destination = tuple[OutputFormat, OutputDest, Optional[Path]]
+
+
+def _resolve_destinations(
+    fmts: list[OutputFormat],
+    outputs: list[OutputDest],
+    out_files: list[Path],
+    template: Optional[ScanTemplate],
+) -> list[Destination]:
+    """Pairs the n-th --fmt with the n-th --output (a flag given once goes
+    with all of the other's) and hands the --out-file paths to the file
+    outputs in order. What the CLI leaves out comes from the config —
+    its `outputs` list when neither --fmt nor --output is given — and
+    then the defaults."""
+    if not fmts and not outputs and template is not None and template.outputs:
+        specs = template.output_specs()
+        if out_files:
+            typer.echo("--out-file needs --output when the config lists outputs", err=True)
+            raise typer.Exit(1)
+        return [
+            (
+                OutputFormat(spec.mode),
+                OutputDest(spec.output),
+                Path(spec.out_file) if spec.out_file else None,
+            )
+            for spec in specs
+        ]
+
+    count = max(len(fmts), len(outputs), 1)
+    if len(fmts) not in (0, 1, count) or len(outputs) not in (0, 1, count):
+        typer.echo(
+            "Give --fmt and --output the same number of times, or one of them once",
+            err=True,
+        )
+        raise typer.Exit(1)
+    default_fmt = OutputFormat(template.mode) if template is not None else OutputFormat.default
+    default_output = OutputDest(template.output) if template is not None else OutputDest.stdout
+    pairs = [
+        (
+            fmts[i if len(fmts) == count else 0] if fmts else default_fmt,
+            outputs[i if len(outputs) == count else 0] if outputs else default_output,
+        )
+        for i in range(count)
+    ]
+
+    file_count = sum(dest == OutputDest.file for _, dest in pairs)
+    if file_count <= 1 and not out_files and template is not None and template.out_file:
+        out_files = [Path(template.out_file)]
+    if (file_count > 1 or len(out_files) > 1) and len(out_files) != file_count:
+        typer.echo(
+            f"Give one --out-file per file output ({file_count} expected, "
+            f"{len(out_files)} given)",
+            err=True,
+        )
+        raise typer.Exit(1)
+    remaining = iter(out_files)
+    destinations = [
+        (fmt, dest, next(remaining, None) if dest == OutputDest.file else None)
+        for fmt, dest in pairs
+    ]
+
+    seen = set()
+    for _, dest, file in destinations:
+        key = file.resolve() if file is not None else dest
+        if key in seen:
+            where = file if file is not None else dest.value
+            typer.echo(f"Output {where} is given more than once", err=True)
+            raise typer.Exit(1)
+        seen.add(key)
+    return destinations
+
+
+def _make_targets(
+    destinations: list[Destination], compress: Optional[Compression]
+) -> list[OutputTarget]:
+    """--compress applies to every output but the clipboard; a file's
+    suffix (.gz, .xz, .bz2) picks the codec when it isn't given."""
+    if compress is not None and all(
+        dest == OutputDest.clipboard for _, dest, _ in destinations
+    ):
+        typer.echo("--compress can't be used with --output clipboard", err=True)
+        raise typer.Exit(1)
+    targets = []
+    for fmt, dest, out_file in destinations:
+        codec = None
+        if dest != OutputDest.clipboard:
+            codec = compress
+        if codec is None and dest == OutputDest.file and out_file is not None:
+            detected = codec_for_path(str(out_file))
+            codec = Compression(detected) if detected is not None else None
+        targets.append(OutputTarget(get_formatter(fmt), dest, out_file, codec))
+    return targets
+
+
 def scan(
     path: Annotated[
         Path,
@@ -101,6 +258,16 @@ def scan(
             "--include-file", "-if", help="Only include files matching these names/patterns. Repeatable."
         ),
     ] = None,
+    include_paths: Annotated[
+        Optional[list[str]],
+        typer.Option(
+            "--include-path",
+            "-ip",
+            help="Only include files whose path relative to the scanned directory "
+            "matches these globs (e.g. 'src/core/**', '**/*.proto'); directories "
+            "that can't lead to a match are not walked at all. Repeatable.",
+        ),
+    ] = None,
     max_depth: Annotated[
         Optional[int],
         typer.Option("--max-depth", help="Limit recursion depth of the directory walk."),
@@ -112,6 +279,24 @@ def scan(
             help="Files larger than this size (bytes) are listed with a placeholder instead of their content.",
         ),
     ] = None,
+    head_lines: Annotated[
+        Optional[int],
+        typer.Option(
+            "--head-lines",
+            min=0,
+            help="Files over --max-file-size keep their first N lines instead of "
+            "getting a placeholder (combine with --tail-lines).",
+        ),
+    ] = None,
+    tail_lines: Annotated[
+        Optional[int],
+        typer.Option(
+            "--tail-lines",
+            min=0,
+            help="Files over --max-file-size keep their last N lines instead of "
+            "getting a placeholder (combine with --head-lines).",
+        ),
+    ] = None,
     only_tree: Annotated[
         bool,
         typer.Option(
@@ -123,34 +308,175 @@ def scan(
         typer.Option(
             "--gitignore/--no-gitignore",
             help=(
-                "Automatically exclude patterns from the project's .gitignore "
-                "(merged additively with --exclude-dir/--exclude-file and any "
-                "config file — nothing you've explicitly excluded gets un-excluded). "
+                "Automatically exclude what the .gitignore and .treesnakeignore "
+                "files in each scanned directory ignore (merged additively with "
+                "--exclude-dir/--exclude-file and any config file — nothing "
+                "you've explicitly excluded gets un-excluded). "
                 "Overrides the config file's use_gitignore if set there; "
                 "defaults to enabled when neither specifies it."
             ),
         ),
     ] = None,
     fmt: Annotated[
-        Optional[OutputFormat],
-        typer.Option("--fmt", "-f", help="Output format. Overrides config."),
+        Optional[list[OutputFormat]],
+        typer.Option(
+            "--fmt",
+            "-f",
+            help="Output format. Overrides config. Repeat together with --output "
+            "to write several formats from one scan.",
+        ),
     ] = None,
     output: Annotated[
-        Optional[OutputDest],
+        Optional[list[OutputDest]],
         typer.Option(
-            "--output", "-o", help="Where to send the result. Overrides config."
+            "--output",
+            "-o",
+            help="Where to send the result. Overrides config. Repeatable: the "
+            "n-th --output gets the n-th --fmt (or the only one).",
         ),
     ] = None,
     out_file: Annotated[
-        Optional[Path],
+        Optional[list[Path]],
+        typer.Option(
+            "--out-file",
+            help="Output file path (required when --output=file); one per "
+            "file output, in order.",
+        ),
+    ] = None,
+    compress: Annotated[
+        Optional[Compression],
+        typer.Option(
+            "--compress",
+            help="Compress the output (file or stdout) as it is written. "
+            "Defaults to the --out-file suffix: .gz, .xz or .bz2.",
+        ),
+    ] = None,
+    use_cache: Annotated[
+        Optional[bool],
+        typer.Option(
+            "--cache/--no-cache",
+            help=(
+                f"Keep file contents in {CACHE_DIR_NAME}/ under the scanned path and "
+                "only re-read files whose size, mtime or inode changed since the "
+                "last cached scan. Overrides the config file's use_cache; "
+                "disabled when neither specifies it."
+            ),
+        ),
+    ] = None,
+    dedupe: Annotated[
+        bool,
+        typer.Option(
+            "--dedupe",
+            help="Print the content of byte-identical files only once; later "
+            "copies get a reference to the first one.",
+        ),
+    ] = False,
+    minify: Annotated[
+        bool,
+        typer.Option(
+            "--minify",
+            help="Strip comments, docstrings, trailing whitespace and blank lines "
+            "from Python, C-family, JavaScript/TypeScript, Go, Rust, CSS and shell "
+            "files, and report the bytes saved. Other files are left as they are.",
+        ),
+    ] = False,
+    jobs: Annotated[
+        int,
+        typer.Option(
+            "--jobs",
+            "-j",
+            min=1,
+            help="Read file contents on N threads. Helps on network filesystems "
+            "and cold caches; 1 reads sequentially.",
+        ),
+    ] = 1,
+    processes: Annotated[
+        int,
+        typer.Option(
+            "--processes",
+            min=1,
+            help="Scan top-level subtrees in N worker processes. Only kicks in "
+            "when the tree is large enough to pay for the process start-up; "
+            "1 scans in-process.",
+        ),
+    ] = 1,
+    from_git_index: Annotated[
+        bool,
+        typer.Option(
+            "--from-git-index",
+            help="List only the files tracked by git, read from .git/index "
+            "instead of walking the filesystem. Much faster when there are "
+            "large untracked trees; all other filters still apply. "
+            "Ignores --processes.",
+        ),
+    ] = False,
+    max_tokens: Annotated[
+        Optional[int],
+        typer.Option(
+            "--max-tokens",
+            min=0,
+            help="Keep the output within about N tokens (estimated offline at "
+            "~4 characters per token): the whole tree is still listed, but only "
+            "the contents that fit are read; the rest get a placeholder. "
+            "Scans in-process (ignores --processes).",
+        ),
+    ] = None,
+    budget_priority: Annotated[
+        BudgetPriority,
         typer.Option(
-            "--out-file", help="Output file path (required when --output=file)."
+            "--budget-priority",
+            help="Which files get content first under --max-tokens: smallest, "
+            "shallowest (depth), those matching --priority-path (path), or walk order.",
+        ),
+    ] = BudgetPriority.smallest,
+    priority_paths: Annotated[
+        Optional[list[str]],
+        typer.Option(
+            "--priority-path",
+            help="Path glob for --budget-priority=path (e.g. 'src/core/**'); "
+            "earlier globs come first. Repeatable.",
+        ),
+    ] = None,
+    chunk_bytes: Annotated[
+        Optional[int],
+        typer.Option(
+            "--chunk-bytes",
+            min=1,
+            help="Write the output as numbered files (out.part1.txt, ...) of at "
+            "most N bytes each, with a 'part i/N' header, split between files "
+            "unless one file alone is bigger. Needs --out-file.",
+        ),
+    ] = None,
+    chunk_tokens: Annotated[
+        Optional[int],
+        typer.Option(
+            "--chunk-tokens",
+            min=1,
+            help="Like --chunk-bytes, with parts of at most about N tokens.",
         ),
     ] = None,
     stat: Annotated[
         bool,
         typer.Option("--stat", help="Show detailed timing breakdown."),
     ] = False,
+    profile_rules: Annotated[
+        bool,
+        typer.Option(
+            "--profile-rules",
+            help="After the scan, report per rule set the checks, hits and time "
+            "spent matching, and the hit count of every pattern. Scans "
+            "in-process (ignores --processes).",
+        ),
+    ] = False,
+    explain: Annotated[
+        Optional[list[str]],
+        typer.Option(
+            "--explain",
+            help="Instead of scanning, print whether this path (relative to the "
+            "scanned directory) would be included, and the rule or ignore-file "
+            "line that decides it. Repeatable.",
+        ),
+    ] = None,
 ) -> None:
     """Scan a directory tree and output its structure."""
     total_timer = ScanTimer()
@@ -165,6 +491,7 @@ def scan(
     exclude_content_files = exclude_content_files or []
     include_dirs = include_dirs or []
     include_files = include_files or []
+    include_paths = include_paths or []
 
     if only_tree:
         exclude_content_files = [*exclude_content_files, "*"]
@@ -183,7 +510,7 @@ def scan(
             typer.echo(f"Config file not found: {config}", err=True)
             raise typer.Exit(1)
         try:
-            template = ConfigReader().read(str(config))
+            template = ConfigReader(root=str(path)).read(str(config))
         except Exception as exc:
             typer.echo(f"Failed to read config: {exc}", err=True)
             raise typer.Exit(1)
@@ -191,7 +518,7 @@ def scan(
         discovered_config = ConfigDiscovery().find(str(path))
         if discovered_config is not None:
             try:
-                template = ConfigReader().read(discovered_config)
+                template = ConfigReader(root=str(path)).read(discovered_config)
             except Exception as exc:
                 typer.echo(
                     f"Warning: ignoring discovered config {discovered_config}: {exc}",
@@ -206,8 +533,11 @@ def scan(
             exclude_content_files,
             include_dirs,
             include_files,
+            include_paths,
             max_depth is not None,
             max_file_size is not None,
+            head_lines is not None,
+            tail_lines is not None,
         ]
     )
 
@@ -219,8 +549,11 @@ def scan(
             exclude_content_files=list(exclude_content_files),
             include_dirs=list(include_dirs),
             include_files=list(include_files),
+            include_paths=list(include_paths),
             max_depth=max_depth,
             max_file_size=max_file_size,
+            head_lines=head_lines,
+            tail_lines=tail_lines,
         )
     elif template is not None:
         scan_config = template.config
@@ -233,50 +566,125 @@ def scan(
         use_gitignore = True
 
     if use_gitignore:
-        scan_config = apply_gitignore(scan_config, path)
+        scan_config = apply_gitignore(scan_config)
 
-    resolved_fmt = fmt
-    if resolved_fmt is None and template is not None:
-        resolved_fmt = OutputFormat(template.mode)
-    if resolved_fmt is None:
-        resolved_fmt = OutputFormat.default
+    if use_cache is None and template is not None:
+        use_cache = template.use_cache
+    file_reader: IFileReader = FileReader()
+    if use_cache:
+        file_reader = CachedFileReader(ScanCache.for_project(path), file_reader)
+        scan_config = scan_config.model_copy(
+            update={"exclude_dirs": [*scan_config.exclude_dirs, CACHE_DIR_NAME]}
+        )
 
-    resolved_output = output
-    if resolved_output is None and template is not None:
-        resolved_output = OutputDest(template.output)
-    if resolved_output is None:
-        resolved_output = OutputDest.stdout
+    if explain:
+        file_reader.close()
+        explainer = PathExplainer(str(path), scan_config.compile())
+        for target in explain:
+            typer.echo(str(explainer.explain(target)))
+        return
 
-    resolved_out_file = out_file
-    if resolved_out_file is None and template is not None and template.out_file:
-        resolved_out_file = Path(template.out_file)
+    destinations = _resolve_destinations(fmt or [], output or [], out_file or [], template)
+    targets = _make_targets(destinations, compress)
 
-    try:
-        scan_result = BaseScanner().scan(str(path), scan_config)
-    except OSError as exc:
-        typer.echo(f"Scan failed: {exc}", err=True)
-        raise typer.Exit(1)
-    except Exception as exc:
-        typer.echo(f"Unexpected error during scan: {exc}", err=True)
+    if chunk_bytes is not None and chunk_tokens is not None:
+        typer.echo("Use either --chunk-bytes or --chunk-tokens, not both", err=True)
         raise typer.Exit(1)
+    if chunk_bytes is not None or chunk_tokens is not None:
+        if len(targets) > 1:
+            typer.echo("--chunk-bytes/--chunk-tokens take a single output", err=True)
+            raise typer.Exit(1)
+        if destinations[0][0] in (OutputFormat.json, OutputFormat.ndjson):
+            typer.echo("--chunk-bytes/--chunk-tokens can't split JSON output", err=True)
+            raise typer.Exit(1)
+        if targets[0].compress is not None:
+            typer.echo(
+                "--chunk-bytes/--chunk-tokens can't write compressed parts", err=True
+            )
+            raise typer.Exit(1)
 
-    format_timer = ScanTimer()
-    try:
-        result = get_formatter(resolved_fmt).format(scan_result.directory)
-    except Exception as exc:
-        typer.echo(f"Failed to format output: {exc}", err=True)
-        raise typer.Exit(1)
-    format_elapsed = format_timer.stop()
+    rule_profiler = RuleProfiler() if profile_rules else None
+    token_budget: TokenBudget | None = None
+    if max_tokens is not None:
+        token_budget = TokenBudget(
+            max_tokens,
+            priority=_make_budget_priority(budget_priority, priority_paths or []),
+        )
+    scanner = _make_scanner(
+        jobs, processes, file_reader, from_git_index, rule_profiler, token_budget
+    )
+    stats = ScanStats()
+    events = track_scan(scanner.iter_scan(str(path), scan_config), stats)
+    deduplicator = Deduplicator() if dedupe else None
+    if deduplicator is not None:
+        events = deduplicator.filter(events)
+    # After deduplication, so copies are minified once, as the original.
+    minifier = ContentMinifier() if minify else None
+    if minifier is not None:
+        events = minifier.filter(events)
 
-    write_timer = ScanTimer()
+    output_timer = ScanTimer()
     try:
-        write_output(result, resolved_output, resolved_out_file)
+        if chunk_bytes is not None:
+            write_elapsed = write_chunked(
+                targets[0].formatter, events, targets[0].out_file, chunk_bytes
+            )
+        elif chunk_tokens is not None:
+            write_elapsed = write_chunked(
+                targets[0].formatter,
+                events,
+                targets[0].out_file,
+                chunk_tokens,
+                CharRatioEstimator(),
+            )
+        else:
+            write_elapsed = write_outputs(targets, events)
+    except typer.Exit:
+        raise
+    except ScanError as exc:
+        cause = exc.__cause__
+        if isinstance(cause, (OSError, GitIndexError)):
+            typer.echo(f"Scan failed: {cause}", err=True)
+        else:
+            typer.echo(f"Unexpected error during scan: {cause}", err=True)
+        raise typer.Exit(1)
     except OSError as exc:
         typer.echo(f"Failed to write output: {exc}", err=True)
         raise typer.Exit(1)
-    write_elapsed = write_timer.stop()
+    except Exception as exc:
+        typer.echo(f"Failed to format output: {exc}", err=True)
+        raise typer.Exit(1)
+    finally:
+        file_reader.close()
+    stats.stat_calls = scanner.stat_calls
+    # Scanning, formatting and writing are interleaved; whatever wasn't
+    # spent producing events or inside the destination's writes is format.
+    format_elapsed = max(output_timer.stop() - stats.elapsed - write_elapsed, 0.0)
 
-    _print_stats(scan_result, format_elapsed, write_elapsed, total_timer.stop(), stat)
+    _print_stats(stats, format_elapsed, write_elapsed, total_timer.stop(), stat)
+    if rule_profiler is not None:
+        typer.echo(rule_profiler.report(), err=True)
+    if token_budget is not None:
+        typer.echo(
+            f"Token budget: used ~{token_budget.used_tokens} of {token_budget.max_tokens} "
+            f"tokens; omitted the content of {token_budget.omitted} files",
+            err=True,
+        )
+    if deduplicator is not None and deduplicator.duplicates:
+        typer.echo(
+            f"Deduplicated {deduplicator.duplicates} files "
+            f"({deduplicator.saved_chars} chars not repeated)",
+            err=True,
+        )
+    if minifier is not None:
+        saved_share = (
+            minifier.saved_bytes / minifier.input_bytes if minifier.input_bytes else 0.0
+        )
+        typer.echo(
+            f"Minified {minifier.files} files: saved {minifier.saved_bytes} bytes "
+            f"({saved_share:.0%} of their content) in {minifier.elapsed:.2f}s",
+            err=True,
+        )
 
     update_thread.join(timeout=REQUEST_TIMEOUT_SECONDS)
     _print_update_notice(update_checker, __version__)
\ No newline at end of file
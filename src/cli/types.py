@@ -5,6 +5,7 @@ class OutputFormat(str, Enum):
     default = "default"
     llm = "llm"
     json = "json"
+    ndjson = "ndjson"
 
 
 class OutputDest(str, Enum):
@@ -13,6 +14,19 @@ class OutputDest(str, Enum):
     clipboard = "clipboard"
 
 
+class Compression(str, Enum):
+    gzip = "gzip"
+    xz = "xz"
+    bz2 = "bz2"
+
+
+class BudgetPriority(str, Enum):
+    smallest = "smallest"
+    depth = "depth"
+    path = "path"
+    walk = "walk"
+
+
 class ConfigFormat(str, Enum):
     env = "env"
     json = "json"
@@ -1,43 +1,187 @@
+import sys
+from contextlib import ExitStack, contextmanager
 from pathlib import Path
-from typing import Optional
+from time import perf_counter
+from typing import Callable, Iterable, Iterator, NamedTuple, Optional, TextIO
 
 import typer
 
-from core.clipboard import Clipboard
-from core.formatter import DefaultFormatter, JsonStringFormatter, LLMFormatter
-from core.gitignore_parser import GitignoreParser
-from models import ScanConfig
-
-from .types import OutputDest, OutputFormat
-
-
-def get_formatter(fmt: OutputFormat):
+from core.atomic_write import replacing
+from core.chunked_output import ChunkedOutput
+from core.clipboard import Clipboard, ClipboardError
+from core.compression import compressed_text
+from core.formatter import (
+    DefaultFormatter,
+    IStreamFormatter,
+    JsonStringFormatter,
+    LLMFormatter,
+    NdjsonFormatter,
+    write_all,
+)
+from core.token_budget import ITokenEstimator
+from models import ScanConfig, ScanEvent
+
+from .types import Compression, OutputDest, OutputFormat
+
+
+def get_formatter(fmt: OutputFormat) -> IStreamFormatter:
     if fmt == OutputFormat.llm:
         return LLMFormatter()
     if fmt == OutputFormat.json:
         return JsonStringFormatter()
+    if fmt == OutputFormat.ndjson:
+        return NdjsonFormatter()
     return DefaultFormatter()
 
 
-def write_output(text: str, dest: OutputDest, out_file: Optional[Path]) -> None:
-    if dest == OutputDest.stdout:
-        typer.echo(text)
+class TimedStream:
+    """Text stream proxy that adds up the time spent inside the wrapped
+    stream's write/flush — i.e. the actual output, as opposed to the
+    scanning and formatting interleaved with it."""
+
+    def __init__(self, stream: TextIO):
+        self._stream = stream
+        self.elapsed = 0.0
+        self.ends_line = False
+
+    def write(self, text: str) -> int:
+        start = perf_counter()
+        written = self._stream.write(text)
+        self.elapsed += perf_counter() - start
+        if text:
+            self.ends_line = text[-1] == "\n"
+        return written
+
+    def flush(self) -> None:
+        start = perf_counter()
+        self._stream.flush()
+        self.elapsed += perf_counter() - start
+
+
+class OutputTarget(NamedTuple):
+    formatter: IStreamFormatter
+    dest: OutputDest
+    out_file: Optional[Path] = None
+    compress: Optional[Compression] = None
+
+
+class _OpenedTarget(NamedTuple):
+    stream: TimedStream
+    # Called once everything is written, before the stream is closed.
+    finish: Callable[[], None]
+    # Echoed once the stream is closed.
+    message: str = ""
+
+
+@contextmanager
+def _clipboard_stream() -> Iterator[TextIO]:
+    try:
+        with Clipboard().open() as stream:
+            yield stream
+    except ClipboardError as exc:
+        typer.echo(f"Clipboard error: {exc}", err=True)
+        raise typer.Exit(1)
+
+
+def _open_target(stack: ExitStack, target: OutputTarget) -> _OpenedTarget:
+    if target.dest == OutputDest.stdout:
+        if target.compress is None:
+            out = TimedStream(sys.stdout)
+        else:
+            sys.stdout.flush()
+            stack.callback(sys.stdout.buffer.flush)
+            out = TimedStream(
+                stack.enter_context(
+                    compressed_text(sys.stdout.buffer, target.compress.value)
+                )
+            )
+
+        def finish_stdout() -> None:
+            # End the last line for the terminal, but never add a blank
+            # one: ndjson output must stay one record per line.
+            if not out.ends_line:
+                out.write("\n")
+            out.flush()
+
+        return _OpenedTarget(out, finish_stdout)
+
+    if target.dest == OutputDest.clipboard:
+        out = TimedStream(stack.enter_context(_clipboard_stream()))
+        return _OpenedTarget(out, lambda: None, "Copied to clipboard.")
+
+    out_file = target.out_file
+    if out_file is None:
+        typer.echo("--out-file is required when --output=file", err=True)
+        raise typer.Exit(1)
+    out_file.parent.mkdir(parents=True, exist_ok=True)
+    if target.compress is None:
+        out = TimedStream(stack.enter_context(replacing(str(out_file))))
+        return _OpenedTarget(out, lambda: None, f"Saved to {out_file}")
+    binary = stack.enter_context(replacing(str(out_file), binary=True))
+    out = TimedStream(stack.enter_context(compressed_text(binary, target.compress.value)))
+    return _OpenedTarget(
+        out, lambda: None, f"Saved to {out_file} ({target.compress.value})"
+    )
 
-    elif dest == OutputDest.clipboard:
-        try:
-            Clipboard().copy(text)
-            typer.echo("Copied to clipboard.", err=True)
-        except RuntimeError as exc:
-            typer.echo(f"Clipboard error: {exc}", err=True)
-            raise typer.Exit(1)
 
-    elif dest == OutputDest.file:
-        if out_file is None:
-            typer.echo("--out-file is required when --output=file", err=True)
-            raise typer.Exit(1)
-        out_file.parent.mkdir(parents=True, exist_ok=True)
-        out_file.write_text(text, encoding="utf-8")
-        typer.echo(f"Saved to {out_file}", err=True)
+def write_outputs(targets: list[OutputTarget], events: Iterable[ScanEvent]) -> float:
+    """Formats `events` straight into every target as they arrive, so
+    each destination, the clipboard tool's stdin included on macOS and
+    Linux, starts receiving output right away: one scan, one read per
+    file, any number of formats and destinations. With `compress`, the
+    text is compressed on its way to stdout or the file. A file is only
+    replaced once it is fully written (see `replacing`). Returns the
+    time spent writing to the destinations themselves, including
+    compression."""
+    messages: list[str] = []
+    with ExitStack() as stack:
+        opened = [_open_target(stack, target) for target in targets]
+        write_all(
+            events,
+            [(target.formatter, o.stream) for target, o in zip(targets, opened)],
+        )
+        for o in opened:
+            o.finish()
+            if o.message:
+                messages.append(o.message)
+    for message in messages:
+        typer.echo(message, err=True)
+    return sum(o.stream.elapsed for o in opened)
+
+
+def write_output(
+    formatter: IStreamFormatter,
+    events: Iterable[ScanEvent],
+    dest: OutputDest,
+    out_file: Optional[Path],
+    compress: Optional[Compression] = None,
+) -> float:
+    """`write_outputs` for a single target."""
+    return write_outputs([OutputTarget(formatter, dest, out_file, compress)], events)
+
+
+def write_chunked(
+    formatter: IStreamFormatter,
+    events: Iterable[ScanEvent],
+    out_file: Optional[Path],
+    limit: int,
+    estimator: Optional[ITokenEstimator] = None,
+) -> float:
+    """Writes `events` as numbered part files next to `out_file` (see
+    ChunkedOutput), each at most `limit` bytes, or tokens with an
+    `estimator`. Returns the time spent writing the parts."""
+    if out_file is None:
+        typer.echo("--out-file is required with --chunk-bytes/--chunk-tokens", err=True)
+        raise typer.Exit(1)
+    try:
+        chunked = ChunkedOutput(formatter, str(out_file), limit, estimator)
+    except ValueError as exc:
+        typer.echo(f"Invalid chunk size: {exc}", err=True)
+        raise typer.Exit(1)
+    paths = chunked.write(events)
+    if paths:
+        typer.echo(f"Saved {len(paths)} parts: {paths[0]} … {paths[-1]}", err=True)
+    return chunked.write_elapsed
 
 
 def _split_values(values: list[str]) -> list[str]:
@@ -56,6 +200,9 @@ def build_config(
     include_files: Optional[list[str]] = None,
     max_depth: Optional[int] = None,
     max_file_size: Optional[int] = None,
+    head_lines: Optional[int] = None,
+    tail_lines: Optional[int] = None,
+    include_paths: Optional[list[str]] = None,
 ) -> ScanConfig:
     return ScanConfig(
         exclude_dirs=_split_values(exclude_dirs),
@@ -66,36 +213,24 @@ def build_config(
         include_files=_split_values(include_files or []),
         max_depth=max_depth,
         max_file_size=max_file_size,
+        head_lines=head_lines,
+        tail_lines=tail_lines,
+        include_paths=_split_values(include_paths or []),
     )
 
 
-def _dedupe(values: list[str]) -> list[str]:
-    seen: set[str] = set()
-    result: list[str] = []
-    for value in values:
-        if value not in seen:
-            seen.add(value)
-            result.append(value)
-    return result
-
+IGNORE_FILES = [".gitignore", ".treesnakeignore"]
 
-def apply_gitignore(scan_config: ScanConfig, project_root: Path) -> ScanConfig:
-    """Additively merges `<project_root>/.gitignore` patterns into
-    exclude_dirs/exclude_files. Never removes anything the caller already
-    set (via CLI flags or a config file) — only adds to it. Returns the
-    same config unchanged if there's no .gitignore or it has no usable
-    patterns."""
-    gitignore_path = project_root / ".gitignore"
-    if not gitignore_path.is_file():
-        return scan_config
 
-    patterns = GitignoreParser().parse(str(gitignore_path))
-    if not patterns.dirs and not patterns.files:
+def apply_gitignore(scan_config: ScanConfig) -> ScanConfig:
+    """Adds IGNORE_FILES to ignore_files, so the walk reads them in every
+    directory it enters and matches their patterns path-aware (negation,
+    anchoring, "**") against everything below. Never removes anything the
+    caller already set (via CLI flags or a config file) — only adds to
+    it."""
+    missing = [name for name in IGNORE_FILES if name not in scan_config.ignore_files]
+    if not missing:
         return scan_config
-
     return scan_config.model_copy(
-        update={
-            "exclude_dirs": _dedupe([*scan_config.exclude_dirs, *patterns.dirs]),
-            "exclude_files": _dedupe([*scan_config.exclude_files, *patterns.files]),
-        }
-    )
\ No newline at end of file
+        update={"ignore_files": [*scan_config.ignore_files, *missing]}
+    )
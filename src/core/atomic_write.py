@@ -0,0 +1,50 @@
+import os
+import shutil
+import tempfile
+from contextlib import contextmanager
+from typing import IO, Iterator
+
+
+def open_temporary(path: str, binary: bool = False, newline: str | None = None) -> IO:
+    """A new temporary file next to `path`, in the same directory so that
+    `replace_with` is a rename. The caller closes it and either moves it
+    onto `path` with `replace_with` or removes it."""
+    directory, name = os.path.split(os.path.abspath(path))
+    return tempfile.NamedTemporaryFile(
+        "wb" if binary else "w",
+        encoding=None if binary else "utf-8",
+        newline=None if binary else newline,
+        dir=directory,
+        prefix=f".{name}.",
+        suffix=".tmp",
+        delete=False,
+    )
+
+
+def replace_with(tmp: str, path: str) -> None:
+    """Moves the closed temporary file `tmp` onto `path`. It gets the mode
+    the file it replaces had, or the one `open` would have given a new
+    file — NamedTemporaryFile creates it 0600."""
+    if os.path.exists(path):
+        shutil.copymode(path, tmp)
+    else:
+        umask = os.umask(0)
+        os.umask(umask)
+        os.chmod(tmp, 0o666 & ~umask)
+    os.replace(tmp, path)
+
+
+@contextmanager
+def replacing(path: str, binary: bool = False) -> Iterator[IO]:
+    """Yields a temporary file next to `path` that takes its place once
+    the block is done, so a write that fails halfway leaves whatever was
+    at `path` before as it was. The temporary file is removed on
+    failure."""
+    tmp = open_temporary(path, binary)
+    try:
+        with tmp:
+            yield tmp
+        replace_with(tmp.name, path)
+    except BaseException:
+        os.unlink(tmp.name)
+        raise
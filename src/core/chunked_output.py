@@ -0,0 +1,185 @@
+import io
+import os
+from time import perf_counter
+from typing import Callable, Iterable, TextIO
+
+from models import ScanEvent
+
+from .atomic_write import open_temporary, replace_with
+from .formatter import IStreamFormatter
+from .token_budget import ITokenEstimator
+
+# Digits reserved in every part header for the part number and count.
+# The count is only known once the last part is written, and every
+# header has the same size, so parts all have the same room.
+PART_COUNT_WIDTH = 6
+_HEADER_WIDTH = len("# part /") + 2 * PART_COUNT_WIDTH
+
+
+def _part_header(index: int, total: int | None = None) -> str:
+    count = "" if total is None else str(total)
+    return f"{f'# part {index}/{count}':<{_HEADER_WIDTH}}\n"
+
+
+def part_path(path: str, index: int) -> str:
+    """"out.txt" → "out.part1.txt"."""
+    stem, suffix = os.path.splitext(path)
+    return f"{stem}.part{index}{suffix}"
+
+
+class ChunkedOutput:
+    """Writes a formatter's output as numbered files of at most `limit`
+    bytes — or tokens, when given an `estimator` — each starting with a
+    "# part i/N" header, for pasting a large scan into several prompts.
+
+    The output is cut between the records the formatter writes per
+    event, so with LLMFormatter a file's block (path header, content,
+    separator) always stays in one part, unless the block alone is over
+    the limit: then it starts a new part and is cut at line ends, or
+    mid-line for a line that doesn't fit on its own.
+
+    Everything happens in one pass, holding only the current record. N
+    isn't known until the end, so every header is padded to the same
+    width and the count is filled in place afterwards: the header's size
+    never changes, so nothing after it moves.
+
+    Parts are written to temporary files that replace the real ones only
+    once every part is complete, and higher-numbered parts left over from
+    an earlier, longer run are then removed. A failed run leaves the
+    parts of the previous one as they were."""
+
+    def __init__(
+        self,
+        formatter: IStreamFormatter,
+        path: str,
+        limit: int,
+        estimator: ITokenEstimator | None = None,
+    ):
+        self._formatter = formatter
+        self._path = path
+        self._measure: Callable[[str], int] = (
+            estimator.count if estimator is not None else _utf8_size
+        )
+        self._capacity = limit - self._measure(_part_header(1))
+        if self._capacity <= 0:
+            raise ValueError(f"limit {limit} leaves no room after the part header")
+        self._paths: list[str] = []
+        # The temporary file each of `_paths` is written to.
+        self._tmp_paths: list[str] = []
+        self._stream: TextIO | None = None
+        self._used = 0
+        self.write_elapsed = 0.0
+
+    def write(self, events: Iterable[ScanEvent]) -> list[str]:
+        """Writes the parts and returns their paths, in order."""
+        os.makedirs(os.path.dirname(os.path.abspath(self._path)), exist_ok=True)
+        self._paths = []
+        self._tmp_paths = []
+        buffer = io.StringIO()
+        writer = self._formatter.writer(buffer)
+        try:
+            try:
+                for event in events:
+                    writer.feed(event)
+                    self._emit(buffer)
+                writer.close()
+                self._emit(buffer)
+            finally:
+                self._close_part()
+            self._fill_in_headers()
+        except BaseException:
+            for tmp in self._tmp_paths:
+                os.unlink(tmp)
+            raise
+        for tmp, path in zip(self._tmp_paths, self._paths):
+            replace_with(tmp, path)
+        self._remove_stale_parts()
+        return list(self._paths)
+
+    def _emit(self, buffer: io.StringIO) -> None:
+        record = buffer.getvalue()
+        if not record:
+            return
+        buffer.seek(0)
+        buffer.truncate()
+
+        size = self._measure(record)
+        if size <= self._capacity:
+            if self._stream is None or self._used + size > self._capacity:
+                self._open_part()
+            self._append(record, size)
+            return
+        for piece in self._split(record):
+            self._open_part()
+            self._append(piece, self._measure(piece))
+
+    def _split(self, record: str) -> list[str]:
+        pieces: list[str] = []
+        lines: list[str] = []
+        used = 0
+        for line in record.splitlines(keepends=True):
+            size = self._measure(line)
+            if lines and used + size > self._capacity:
+                pieces.append("".join(lines))
+                lines, used = [], 0
+            while size > self._capacity:
+                cut = self._longest_prefix(line)
+                pieces.append(line[:cut])
+                line = line[cut:]
+                size = self._measure(line)
+            if line:
+                lines.append(line)
+                used += size
+        if lines:
+            pieces.append("".join(lines))
+        return pieces
+
+    def _longest_prefix(self, text: str) -> int:
+        # Binary search for the longest prefix within capacity; at least
+        # one character, so a capacity smaller than one still progresses.
+        low, high = 1, len(text)
+        while low < high:
+            middle = (low + high + 1) // 2
+            if self._measure(text[:middle]) <= self._capacity:
+                low = middle
+            else:
+                high = middle - 1
+        return low
+
+    def _open_part(self) -> None:
+        self._close_part()
+        if len(str(len(self._paths) + 1)) > PART_COUNT_WIDTH:
+            raise ValueError(f"more than {10**PART_COUNT_WIDTH - 1} parts")
+        path = part_path(self._path, len(self._paths) + 1)
+        self._paths.append(path)
+        self._stream = open_temporary(path, newline="")
+        self._tmp_paths.append(self._stream.name)
+        self._stream.write(_part_header(len(self._paths)))
+        self._used = 0
+
+    def _append(self, text: str, size: int) -> None:
+        start = perf_counter()
+        self._stream.write(text)
+        self.write_elapsed += perf_counter() - start
+        self._used += size
+
+    def _close_part(self) -> None:
+        if self._stream is not None:
+            self._stream.close()
+            self._stream = None
+
+    def _fill_in_headers(self) -> None:
+        total = len(self._tmp_paths)
+        for index, tmp in enumerate(self._tmp_paths, start=1):
+            with open(tmp, "r+b") as f:
+                f.write(_part_header(index, total).encode("utf-8"))
+
+    def _remove_stale_parts(self) -> None:
+        index = len(self._paths) + 1
+        while os.path.exists(stale := part_path(self._path, index)):
+            os.remove(stale)
+            index += 1
+
+
+def _utf8_size(text: str) -> int:
+    return len(text.encode("utf-8"))
@@ -1,6 +1,14 @@
+import io
 import platform
+import shutil
 import subprocess
 from abc import ABC, abstractmethod
+from contextlib import contextmanager
+from typing import ContextManager, Iterator, TextIO
+
+
+class ClipboardError(RuntimeError):
+    """Raised when the text can't be put on the clipboard."""
 
 
 class IClipboard(ABC):
@@ -8,6 +16,58 @@ class IClipboard(ABC):
     def copy(self, text: str) -> None:
         raise NotImplementedError
 
+    @contextmanager
+    def open(self) -> Iterator[TextIO]:
+        """Yields a text stream whose contents end up on the clipboard
+        once the block exits normally; if it raises, the clipboard is
+        left as it was.
+
+        This default collects the text and hands it to `copy`, for
+        backends that need all of it at once. Backends that feed a
+        command's stdin override it to pass writes straight through."""
+        buffer = io.StringIO()
+        yield buffer
+        self.copy(buffer.getvalue())
+
+
+@contextmanager
+def _pipe_to(cmd: list[str]) -> Iterator[TextIO]:
+    """Runs `cmd` and yields a UTF-8 text stream onto its stdin, so text
+    reaches the clipboard tool as it is written and only the pipe's
+    buffer is held here. Closing stdin tells the tool the text is
+    complete; if the block raises, the tool is killed first, before it
+    sees EOF, so a partial text is never copied."""
+    try:
+        proc = subprocess.Popen(cmd, stdin=subprocess.PIPE)
+    except FileNotFoundError as e:
+        raise ClipboardError(f"{cmd[0]} not found") from e
+
+    stream = io.TextIOWrapper(proc.stdin, encoding="utf-8")
+    try:
+        yield stream
+        stream.close()
+    except BrokenPipeError as e:
+        _discard(stream)
+        proc.wait()
+        raise ClipboardError(
+            f"{cmd[0]} exited early with code {proc.returncode}"
+        ) from e
+    except BaseException:
+        proc.kill()
+        proc.wait()
+        _discard(stream)
+        raise
+    if proc.wait() != 0:
+        raise ClipboardError(f"{cmd[0]} failed with code {proc.returncode}")
+
+
+def _discard(stream: TextIO) -> None:
+    # Whatever is still buffered has nowhere to go once the tool is gone.
+    try:
+        stream.close()
+    except OSError:
+        pass
+
 
 class WindowsClipboard(IClipboard):
     def copy(self, text: str) -> None:
@@ -41,29 +101,29 @@ class WindowsClipboard(IClipboard):
 
             h_mem = kernel32.GlobalAlloc(GMEM_MOVEABLE, size)
             if not h_mem:
-                raise RuntimeError("Failed to allocate clipboard memory")
+                raise ClipboardError("Failed to allocate clipboard memory")
 
             p_mem = kernel32.GlobalLock(h_mem)
             if not p_mem:
                 kernel32.GlobalFree(h_mem)
-                raise RuntimeError("Failed to lock clipboard memory")
+                raise ClipboardError("Failed to lock clipboard memory")
 
             ctypes.memmove(p_mem, encoded, size)
             kernel32.GlobalUnlock(h_mem)
 
             if not user32.OpenClipboard(None):
                 kernel32.GlobalFree(h_mem)
-                raise RuntimeError("Failed to open clipboard")
+                raise ClipboardError("Failed to open clipboard")
 
             try:
                 user32.EmptyClipboard()
                 if not user32.SetClipboardData(CF_UNICODETEXT, h_mem):
-                    raise RuntimeError("Failed to set clipboard data")
+                    raise ClipboardError("Failed to set clipboard data")
             finally:
                 user32.CloseClipboard()
 
         except (AttributeError, OSError) as e:
-            raise RuntimeError(f"Windows clipboard error: {e}") from e
+            raise ClipboardError(f"Windows clipboard error: {e}") from e
 
 
 class MacOSClipboard(IClipboard):
@@ -75,20 +135,25 @@ class MacOSClipboard(IClipboard):
                 check=True,
             )
         except FileNotFoundError as e:
-            raise RuntimeError("pbcopy not found") from e
+            raise ClipboardError("pbcopy not found") from e
         except subprocess.CalledProcessError as e:
-            raise RuntimeError(f"pbcopy failed with code {e.returncode}") from e
+            raise ClipboardError(f"pbcopy failed with code {e.returncode}") from e
+
+    def open(self) -> ContextManager[TextIO]:
+        return _pipe_to(["pbcopy"])
 
 
 class LinuxClipboard(IClipboard):
+    _commands = (
+        ["xclip", "-selection", "clipboard"],
+        ["xsel", "--clipboard", "--input"],
+    )
+
     def copy(self, text: str) -> None:
         encoded = text.encode("utf-8")
         errors: list[str] = []
 
-        for cmd in (
-            ["xclip", "-selection", "clipboard"],
-            ["xsel", "--clipboard", "--input"],
-        ):
+        for cmd in self._commands:
             try:
                 subprocess.run(cmd, input=encoded, check=True)
                 return
@@ -97,7 +162,19 @@ class LinuxClipboard(IClipboard):
             except subprocess.CalledProcessError as e:
                 errors.append(f"{cmd[0]!r} failed with code {e.returncode}")
 
-        raise RuntimeError(
+        raise self._unavailable(errors)
+
+    def open(self) -> ContextManager[TextIO]:
+        # Once part of the text is written to xclip it can't be replayed
+        # to xsel, so the fallback is decided up front, by what's on PATH.
+        for cmd in self._commands:
+            if shutil.which(cmd[0]):
+                return _pipe_to(cmd)
+        raise self._unavailable([f"{cmd[0]!r} not found" for cmd in self._commands])
+
+    @staticmethod
+    def _unavailable(errors: list[str]) -> ClipboardError:
+        return ClipboardError(
             "Linux clipboard unavailable. Install xclip or xsel:\n"
             "  sudo apt install xclip\n"
             "  sudo dnf install xclip\n"
@@ -120,7 +197,7 @@ class Clipboard(IClipboard):
         impl_class = self._implementations.get(system)
 
         if impl_class is None:
-            raise RuntimeError(
+            raise ClipboardError(
                 f"Unsupported platform: {platform.system()!r}. "
                 f"Supported: {list(self._implementations)}"
             )
@@ -129,3 +206,6 @@ class Clipboard(IClipboard):
 
     def copy(self, text: str) -> None:
         self._impl.copy(text)
+
+    def open(self) -> ContextManager[TextIO]:
+        return self._impl.open()
@@ -0,0 +1,48 @@
+import bz2
+import gzip
+import io
+import lzma
+import os
+from contextlib import contextmanager
+from typing import BinaryIO, Iterator, TextIO
+
+CODECS = ("gzip", "xz", "bz2")
+
+_SUFFIXES = {".gz": "gzip", ".xz": "xz", ".bz2": "bz2"}
+
+# gzip(1)'s default; gzip.GzipFile's own default of 9 is several times
+# slower for a few percent smaller output.
+GZIP_LEVEL = 6
+
+
+def codec_for_path(path: str) -> str | None:
+    """The codec an output file's suffix asks for ("scan.txt.gz" →
+    "gzip"), or None."""
+    return _SUFFIXES.get(os.path.splitext(path)[1].lower())
+
+
+def _compressor(stream: BinaryIO, codec: str) -> BinaryIO:
+    if codec == "gzip":
+        return gzip.GzipFile(fileobj=stream, mode="wb", compresslevel=GZIP_LEVEL)
+    if codec == "xz":
+        return lzma.LZMAFile(stream, "wb")
+    if codec == "bz2":
+        return bz2.BZ2File(stream, "wb")
+    raise ValueError(f"Unknown compression {codec!r}, expected one of {', '.join(CODECS)}")
+
+
+@contextmanager
+def compressed_text(stream: BinaryIO, codec: str) -> Iterator[TextIO]:
+    """Yields a UTF-8 text stream whose writes are compressed with `codec`
+    into the binary `stream` as they come — the compressor only holds
+    its window, never the whole text or the whole result. On exit the
+    compressed stream is finished (trailer and checksum written); the
+    caller's `stream` is left open."""
+    compressor = _compressor(stream, codec)
+    text = io.TextIOWrapper(compressor, encoding="utf-8")
+    try:
+        yield text
+    finally:
+        text.flush()
+        text.detach()
+        compressor.close()
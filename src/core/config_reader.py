@@ -2,7 +2,7 @@ import json
 import os
 import tomllib
 from abc import ABC, abstractmethod
-from typing import List
+from typing import List, Optional
 
 import yaml
 from dotenv import dotenv_values
@@ -10,8 +10,6 @@ from dotenv import dotenv_values
 from models import ScanConfig
 from models.scan_template import ScanTemplate
 
-from .gitignore_parser import GitignoreParser
-
 
 class IConfigReader(ABC):
     @abstractmethod
@@ -27,6 +25,10 @@ class EnvConfigReader(IConfigReader):
         "exclude_content_files",
         "include_dirs",
         "include_files",
+        "include_paths",
+        "ignore_patterns",
+        "ignore_files",
+        "outputs",
     }
 
     def read(self, path: str) -> ScanTemplate:
@@ -52,7 +54,9 @@ class EnvConfigReader(IConfigReader):
             mode=data.get("mode", "default") or "default",
             output=data.get("output", "stdout") or "stdout",
             out_file=data.get("out_file") or None,
+            outputs=data.get("outputs") or [],
             use_gitignore=data.get("use_gitignore", True),
+            use_cache=data.get("use_cache", False),
         )
 
     def _parse_list(self, value: str) -> List[str]:
@@ -70,7 +74,9 @@ class YamlConfigReader(IConfigReader):
             mode=data.get("mode", "default") or "default",
             output=data.get("output", "stdout") or "stdout",
             out_file=data.get("out_file") or None,
+            outputs=data.get("outputs") or [],
             use_gitignore=data.get("use_gitignore", True),
+            use_cache=data.get("use_cache", False),
         )
 
 
@@ -84,7 +90,9 @@ class TomlConfigReader(IConfigReader):
             mode=data.get("mode", "default") or "default",
             output=data.get("output", "stdout") or "stdout",
             out_file=data.get("out_file") or None,
+            outputs=data.get("outputs") or [],
             use_gitignore=data.get("use_gitignore", True),
+            use_cache=data.get("use_cache", False),
         )
 
 
@@ -98,21 +106,47 @@ class JsonConfigReader(IConfigReader):
             mode=data.get("mode", "default") or "default",
             output=data.get("output", "stdout") or "stdout",
             out_file=data.get("out_file") or None,
+            outputs=data.get("outputs") or [],
             use_gitignore=data.get("use_gitignore", True),
+            use_cache=data.get("use_cache", False),
         )
 
 
 class TreesnakeIgnoreConfigReader(IConfigReader):
     """.treesnakeignore is gitignore-syntax, not a key/value config file —
-    reuses GitignoreParser instead of a structured-format parser. There's
-    no mode/output section in this format, so the template falls back to
+    its lines become ignore_patterns, matched path-aware like a
+    .gitignore's (negation, anchoring, "**"). Anchored lines are relative
+    to the file's directory: with `root`, the scan root, below it, they
+    keep matching from there (with_ignore_patterns_root). There's no
+    mode/output section in this format, so the template falls back to
     the same defaults as an empty config file."""
 
+    def __init__(self, root: Optional[str] = None):
+        self._root = root
+
     def read(self, path: str) -> ScanTemplate:
-        patterns = GitignoreParser().parse(path)
-        config = ScanConfig(exclude_dirs=patterns.dirs, exclude_files=patterns.files)
+        try:
+            with open(path, "r", encoding="utf-8") as f:
+                lines = f.read().splitlines()
+        except OSError:
+            lines = []
+        config = ScanConfig(ignore_patterns=lines).with_ignore_patterns_root(
+            self._root_below(path)
+        )
         return ScanTemplate(config=config, mode="default", output="stdout")
 
+    def _root_below(self, path: str) -> str:
+        """The scan root relative to the directory of `path`, "/"-separated;
+        "" when it is that directory or not inside it."""
+        if self._root is None:
+            return ""
+        relative = os.path.relpath(
+            os.path.abspath(self._root), os.path.dirname(os.path.abspath(path))
+        )
+        if relative == os.curdir or relative.startswith(os.pardir):
+            return ""
+        return relative.replace(os.sep, "/")
+
 
 class ConfigReader(IConfigReader):
     _readers_by_name = {
@@ -127,6 +161,11 @@ class ConfigReader(IConfigReader):
         ".json": JsonConfigReader,
     }
 
+    def __init__(self, root: Optional[str] = None):
+        """`root` is the directory about to be scanned, for the formats
+        whose patterns are relative to where the file is."""
+        self._root = root
+
     def read(self, path: str) -> ScanTemplate:
         filename = os.path.basename(path).lower()
 
@@ -138,4 +177,6 @@ class ConfigReader(IConfigReader):
         if reader_cls is None:
             raise ValueError(f"Unsupported config format: {filename!r}")
 
-        return reader_cls().read(path)
\ No newline at end of file
+        if reader_cls is TreesnakeIgnoreConfigReader:
+            return TreesnakeIgnoreConfigReader(self._root).read(path)
+        return reader_cls().read(path)
@@ -0,0 +1,61 @@
+import hashlib
+from typing import Iterable, Iterator
+
+from models import EnterDirEvent, ExitDirEvent, FileEvent, FileNode, ScanEvent
+
+MIN_DEDUPE_CHARS = 64
+
+
+def _same_as_placeholder(path: str) -> str:
+    return f"[Same as {path}]"
+
+
+class Deduplicator:
+    """Scan event filter that replaces the content of every file already
+    seen earlier in the stream with a "[Same as <path>]" reference to the
+    first copy. Paths are spelled the way LLMFormatter prints them (root
+    directory name first, "/"-separated).
+
+    Files are identified by a 128-bit BLAKE2b digest of their UTF-8
+    content — one pass over the text at memory speed, well under the
+    cost of having read it. Contents shorter than MIN_DEDUPE_CHARS are
+    left alone: the reference would be about as long as the text, and
+    empty/placeholder contents would otherwise all collapse into one."""
+
+    def __init__(self, min_chars: int = MIN_DEDUPE_CHARS):
+        self._min_chars = min_chars
+        self._first_paths: dict[bytes, str] = {}
+        self.duplicates = 0
+        self.saved_chars = 0
+
+    def filter(self, events: Iterable[ScanEvent]) -> Iterator[ScanEvent]:
+        paths: list[str] = []
+        for event in events:
+            if isinstance(event, EnterDirEvent):
+                paths.append(f"{paths[-1]}/{event.name}" if paths else event.name)
+            elif isinstance(event, ExitDirEvent):
+                paths.pop()
+            else:
+                event = self._dedupe(event, paths[-1])
+            yield event
+
+    def _dedupe(self, event: FileEvent, dir_path: str) -> FileEvent:
+        file = event.file
+        if len(file.content) < self._min_chars:
+            return event
+
+        digest = hashlib.blake2b(
+            file.content.encode("utf-8", "surrogatepass"), digest_size=16
+        ).digest()
+        first_path = self._first_paths.get(digest)
+        if first_path is None:
+            self._first_paths[digest] = f"{dir_path}/{file.name}"
+            return event
+
+        self.duplicates += 1
+        self.saved_chars += len(file.content)
+        return FileEvent(
+            file=FileNode(
+                name=file.name, content=_same_as_placeholder(first_path), size=file.size
+            )
+        )
@@ -0,0 +1,42 @@
+from typing import Iterable, Iterator
+
+from models import DirNode, Directory, EnterDirEvent, ExitDirEvent, FileEvent, ScanEvent
+
+
+def directory_events(directory: Directory | DirNode) -> Iterator[ScanEvent]:
+    """Replays an already materialized tree as the event stream a scanner
+    would have produced for it: files before subdirectories, both in
+    list order."""
+    yield EnterDirEvent(
+        name=directory.name,
+        file_count=len(directory.files),
+        dir_count=len(directory.subdirectories),
+    )
+    for file in directory.files:
+        yield FileEvent(file=file)
+    for subdir in directory.subdirectories:
+        yield from directory_events(subdir)
+    yield ExitDirEvent(name=directory.name)
+
+
+def collect_directory(events: Iterable[ScanEvent]) -> DirNode:
+    """Inverse of directory_events: builds the tree for one complete root
+    EnterDirEvent ... ExitDirEvent stream. Call `to_model()` on the
+    result for a pydantic Directory."""
+    stack: list[DirNode] = []
+    root: DirNode | None = None
+
+    for event in events:
+        if isinstance(event, EnterDirEvent):
+            node = DirNode(name=event.name)
+            if stack:
+                stack[-1].subdirectories.append(node)
+            stack.append(node)
+        elif isinstance(event, FileEvent):
+            stack[-1].files.append(event.file)
+        else:
+            root = stack.pop()
+
+    if root is None or stack:
+        raise ValueError("Incomplete scan event stream")
+    return root
@@ -0,0 +1,166 @@
+import os
+from typing import NamedTuple
+
+from models.scan_config import CompiledRules
+
+from .ignore_spec import GitignoreSpec
+from .scanner import DirScope
+
+INCLUDED = "included"
+EXCLUDED = "excluded"
+CONTENT_EXCLUDED = "content excluded"
+TRUNCATED = "truncated"
+NOT_FOUND = "not found"
+
+
+class Explanation(NamedTuple):
+    path: str
+    decision: str
+    reason: str = ""
+
+    def __str__(self) -> str:
+        if not self.reason:
+            return f"{self.path}: {self.decision}"
+        return f"{self.path}: {self.decision} — {self.reason}"
+
+
+class PathExplainer:
+    """Answers "why is (or isn't) this path in the output?" for one path
+    at a time, by replaying the scanner's decisions along the path from
+    the scan root: for every directory on the way and then the path
+    itself, the same checks in the same order as BaseScanner's walk —
+    exclude/include rules, ignore files, include paths, max_depth,
+    content exclusion, max_file_size. The first check that decides
+    names the rule behind it: the pattern and which of the CompiledRules
+    sets it's from, or the ignore file and line."""
+
+    def __init__(self, root: str, rules: CompiledRules):
+        self._root = os.path.abspath(root)
+        self._rules = rules
+
+    def explain(self, path: str) -> Explanation:
+        """`path` is absolute or relative to the scan root."""
+        full_path = os.path.normpath(os.path.join(self._root, path))
+        rel = os.path.relpath(full_path, self._root)
+        display = rel.replace(os.sep, "/")
+        if rel == os.curdir:
+            return Explanation(display, INCLUDED, "the scan root")
+        if rel.startswith(os.pardir):
+            return Explanation(display, NOT_FOUND, "outside the scanned directory")
+        if not os.path.lexists(full_path):
+            return Explanation(display, NOT_FOUND)
+
+        rules = self._rules
+        parts = display.split("/")
+        scope = self._with_ignore_files(DirScope.root(rules), self._root)
+        directory = self._root
+        for depth, name in enumerate(parts[:-1], start=1):
+            reason = self._dir_filter_reason(name, scope)
+            if reason:
+                on = scope.path_of(name)
+                return Explanation(display, EXCLUDED, f"{reason} (on {on}/)")
+            match = rules.exclude_content_dirs.explain(name)
+            if match is not None:
+                return Explanation(
+                    display,
+                    EXCLUDED,
+                    f"{scope.path_of(name)}/ is listed without contents "
+                    f"(exclude_content_dirs: {match.describe()})",
+                )
+            if rules.max_depth is not None and depth > rules.max_depth:
+                return Explanation(
+                    display,
+                    EXCLUDED,
+                    f"{scope.path_of(name)}/ is deeper than max_depth={rules.max_depth}",
+                )
+            directory = os.path.join(directory, name)
+            scope = self._with_ignore_files(scope.child(name, rules), directory)
+
+        name = parts[-1]
+        if os.path.isdir(full_path):
+            return self._explain_dir(display, name, scope, len(parts))
+        return self._explain_file(display, full_path, name, scope)
+
+    def _explain_dir(
+        self, display: str, name: str, scope: DirScope, depth: int
+    ) -> Explanation:
+        reason = self._dir_filter_reason(name, scope)
+        if reason:
+            return Explanation(display, EXCLUDED, reason)
+        match = self._rules.exclude_content_dirs.explain(name)
+        if match is not None:
+            return Explanation(
+                display, CONTENT_EXCLUDED, f"exclude_content_dirs: {match.describe()}"
+            )
+        max_depth = self._rules.max_depth
+        if max_depth is not None and depth > max_depth:
+            return Explanation(
+                display, CONTENT_EXCLUDED, f"deeper than max_depth={max_depth}"
+            )
+        return Explanation(display, INCLUDED)
+
+    def _explain_file(
+        self, display: str, full_path: str, name: str, scope: DirScope
+    ) -> Explanation:
+        rules = self._rules
+        match = rules.exclude_files.explain(name)
+        if match is not None:
+            return Explanation(display, EXCLUDED, f"exclude_files: {match.describe()}")
+        reason = self._ignore_reason(scope, name, is_dir=False)
+        if reason:
+            return Explanation(display, EXCLUDED, reason)
+        if rules.include_files.rules and not rules.include_files.matches(name):
+            return Explanation(display, EXCLUDED, "matches none of include_files")
+        if scope.includes is not None and not rules.include_paths.accepts(
+            rules.include_paths.step(scope.includes, name)
+        ):
+            return Explanation(display, EXCLUDED, "matches none of include_paths")
+
+        match = rules.exclude_content_files.explain(name)
+        if match is not None:
+            return Explanation(
+                display, CONTENT_EXCLUDED, f"exclude_content_files: {match.describe()}"
+            )
+        if rules.max_file_size is not None:
+            size = os.path.getsize(full_path)
+            if size > rules.max_file_size:
+                limit = f"{size} bytes > max_file_size={rules.max_file_size}"
+                if rules.truncate_lines is not None:
+                    return Explanation(display, TRUNCATED, limit)
+                return Explanation(display, CONTENT_EXCLUDED, limit)
+        return Explanation(display, INCLUDED)
+
+    def _dir_filter_reason(self, name: str, scope: DirScope) -> str:
+        rules = self._rules
+        match = rules.exclude_dirs.explain(name)
+        if match is not None:
+            return f"exclude_dirs: {match.describe()}"
+        reason = self._ignore_reason(scope, name, is_dir=True)
+        if reason:
+            return reason
+        if rules.include_dirs.rules and not rules.include_dirs.matches(name):
+            return "matches none of include_dirs"
+        includes = scope.includes
+        if includes is not None and not rules.include_paths.step(includes, name):
+            return "no include_paths pattern leads into it"
+        return ""
+
+    def _ignore_reason(self, scope: DirScope, name: str, is_dir: bool) -> str:
+        found = scope.ignores.explain(scope.path_of(name), is_dir)
+        if found is None:
+            return ""
+        spec, rule = found
+        if rule.negated:
+            return ""
+        source = spec.source
+        if os.path.isabs(source):
+            source = os.path.relpath(source, self._root).replace(os.sep, "/")
+        return f"{source}:{rule.line_number}: {rule.line.strip()}"
+
+    def _with_ignore_files(self, scope: DirScope, directory: str) -> DirScope:
+        ignores = scope.ignores
+        for ignore_file in self._rules.ignore_files:
+            path = os.path.join(directory, ignore_file)
+            if os.path.isfile(path):
+                ignores = ignores.push(GitignoreSpec.from_file(path, base=scope.rel))
+        return scope._replace(ignores=ignores)
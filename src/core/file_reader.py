@@ -1,27 +1,203 @@
+import codecs
+import mmap
 import os
 from abc import ABC, abstractmethod
 
-from models import File
+from models import FileNode
+
+SNIFF_BYTES = 8192
+
+# Most bytes `read_truncated` keeps of each of the head and the tail.
+MAX_PART_BYTES = 64 * 1024
+
+BINARY_EXTENSIONS = frozenset(
+    {
+        # images
+        ".png", ".jpg", ".jpeg", ".gif", ".bmp", ".ico", ".webp", ".tif", ".tiff",
+        ".psd", ".heic",
+        # documents
+        ".pdf", ".doc", ".docx", ".xls", ".xlsx", ".ppt", ".pptx", ".odt",
+        # archives
+        ".zip", ".gz", ".tgz", ".bz2", ".xz", ".7z", ".rar", ".tar", ".zst",
+        ".jar", ".war", ".whl", ".egg", ".iso", ".dmg",
+        # compiled / native
+        ".exe", ".dll", ".so", ".dylib", ".o", ".a", ".lib", ".obj", ".class",
+        ".pyc", ".pyo", ".pyd", ".wasm",
+        # media
+        ".mp3", ".mp4", ".wav", ".flac", ".ogg", ".avi", ".mov", ".mkv", ".webm",
+        # fonts
+        ".woff", ".woff2", ".ttf", ".otf", ".eot",
+        # data
+        ".sqlite", ".sqlite3", ".db", ".parquet", ".npy", ".npz", ".pkl",
+        ".pickle", ".h5", ".onnx", ".pt",
+    }
+)
+
+
+def _omitted_marker(omitted_bytes: int) -> str:
+    return f"[... {omitted_bytes} bytes omitted ...]\n"
+
+
+def _char_boundary(data: mmap.mmap, pos: int, step: int) -> int:
+    """`pos`, moved by `step` (-1 or 1) off any UTF-8 continuation byte,
+    so that cutting there doesn't split a character."""
+    while 0 < pos < len(data) and data[pos] & 0xC0 == 0x80:
+        pos += step
+    return pos
+
+
+def _head_tail_bounds(
+    data: mmap.mmap, head_lines: int, tail_lines: int, max_bytes: int = MAX_PART_BYTES
+) -> tuple[int, int]:
+    """Byte offsets where the first `head_lines` lines end and the last
+    `tail_lines` lines start; found with find/rfind so only the pages
+    around those offsets are faulted in. Neither part is longer than
+    `max_bytes`: lines that don't fit (a minified bundle is one long
+    line) are cut at the character boundary within it. `tail_start <=
+    head_end` means the two overlap and nothing would be cut."""
+    size = len(data)
+
+    head_end = 0
+    for _ in range(head_lines):
+        newline = data.find(b"\n", head_end, max_bytes)
+        if newline == -1:
+            head_end = _char_boundary(data, min(size, max_bytes), -1)
+            break
+        head_end = newline + 1
+
+    # The tail starts after the head, and no earlier than its budget allows.
+    tail_floor = max(head_end, size - max_bytes)
+    tail_start = size
+    # A final newline terminates the last line rather than starting one.
+    search_end = size - 1 if data[size - 1 : size] == b"\n" else size
+    for _ in range(tail_lines):
+        newline = data.rfind(b"\n", tail_floor, search_end)
+        if newline == -1:
+            tail_start = _char_boundary(data, tail_floor, 1)
+            break
+        tail_start = newline + 1
+        search_end = newline
+
+    return head_end, tail_start
 
 
 class IFileReader(ABC):
     @abstractmethod
-    def read(self, path: str) -> File:
+    def read(self, path: str, stat: os.stat_result | None = None) -> FileNode:
+        """`stat` is the caller's already-fetched stat of `path`, if any —
+        readers use it instead of stat'ing the file again."""
         raise NotImplementedError
 
+    def read_truncated(
+        self, path: str, stat: os.stat_result | None, head_lines: int, tail_lines: int
+    ) -> FileNode:
+        """Like `read`, but keeps only the first `head_lines` and last
+        `tail_lines` lines, at most MAX_PART_BYTES of each. Readers that
+        can't do that cheaply may return the whole file, which is what
+        this default does."""
+        return self.read(path, stat)
+
+    def close(self) -> None:
+        """Releases whatever the reader keeps open across reads. Called
+        once the scan is over."""
+
 
 class FileReader(IFileReader):
+    """Reads files as UTF-8 text, rejecting binaries as early as possible:
+    extensions in BINARY_EXTENSIONS are never opened, and everything else
+    is opened in binary mode and its first SNIFF_BYTES checked for NUL
+    bytes or invalid UTF-8 before the rest is read. Either way the file
+    gets the CONTENT_BINARY placeholder. Newlines are translated the way
+    text-mode `open` does.
+
+    `read_truncated` maps the file and only touches the pages holding the
+    head and tail lines it keeps; the middle is never read, however few
+    lines the file has."""
+
     CONTENT_UNREADABLE = "[Content could not be read]"
+    CONTENT_BINARY = "[Binary file]"
+
+    def read(self, path: str, stat: os.stat_result | None = None) -> FileNode:
+        if os.path.splitext(path)[1].lower() in BINARY_EXTENSIONS:
+            content = self.CONTENT_BINARY
+        else:
+            content = self._read_text(path)
 
-    def read(self, path: str) -> File:
+        return FileNode(
+            name=os.path.basename(path),
+            content=content,
+            size=stat.st_size if stat is not None else os.path.getsize(path),
+        )
+
+    def _read_text(self, path: str) -> str:
         try:
-            with open(path, "r", encoding="utf-8") as f:
-                content = f.read()
-        except (UnicodeDecodeError, PermissionError, OSError):
-            content = self.CONTENT_UNREADABLE
+            with open(path, "rb") as f:
+                head = f.read(SNIFF_BYTES)
+                if self._looks_binary(head):
+                    return self.CONTENT_BINARY
+                if len(head) < SNIFF_BYTES:
+                    data = head
+                else:
+                    # Re-reading the prefix from the page cache is cheaper
+                    # than concatenating it onto a possibly huge rest.
+                    f.seek(0)
+                    data = f.read()
+            content = data.decode("utf-8")
+        except (UnicodeDecodeError, OSError):
+            return self.CONTENT_UNREADABLE
+
+        return self._translate_newlines(content)
 
-        return File(
+    def read_truncated(
+        self, path: str, stat: os.stat_result | None, head_lines: int, tail_lines: int
+    ) -> FileNode:
+        if os.path.splitext(path)[1].lower() in BINARY_EXTENSIONS:
+            content = self.CONTENT_BINARY
+        else:
+            content = self._read_head_tail(path, head_lines, tail_lines)
+
+        return FileNode(
             name=os.path.basename(path),
             content=content,
-            size=os.path.getsize(path),
+            size=stat.st_size if stat is not None else os.path.getsize(path),
         )
+
+    def _read_head_tail(self, path: str, head_lines: int, tail_lines: int) -> str:
+        try:
+            with open(path, "rb") as f:
+                if os.fstat(f.fileno()).st_size == 0:
+                    return ""
+                with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+                    if self._looks_binary(mm[:SNIFF_BYTES]):
+                        return self.CONTENT_BINARY
+                    head_end, tail_start = _head_tail_bounds(mm, head_lines, tail_lines)
+                    if tail_start <= head_end:
+                        content = mm[:].decode("utf-8")
+                    else:
+                        content = (
+                            mm[:head_end].decode("utf-8")
+                            + _omitted_marker(tail_start - head_end)
+                            + mm[tail_start:].decode("utf-8")
+                        )
+        except (UnicodeDecodeError, OSError, ValueError):
+            return self.CONTENT_UNREADABLE
+
+        return self._translate_newlines(content)
+
+    @staticmethod
+    def _translate_newlines(content: str) -> str:
+        if "\r" in content:
+            content = content.replace("\r\n", "\n").replace("\r", "\n")
+        return content
+
+    @staticmethod
+    def _looks_binary(head: bytes) -> bool:
+        if b"\x00" in head:
+            return True
+        try:
+            # Incremental, so a multi-byte character cut off at the end of
+            # the prefix doesn't count as invalid.
+            codecs.getincrementaldecoder("utf-8")().decode(head, final=False)
+        except UnicodeDecodeError:
+            return True
+        return False
@@ -1,9 +1,14 @@
+import io
 import json
+import re
 from abc import ABC, abstractmethod
-from typing import Generic, TypeVar
-import io
+from contextlib import ExitStack, contextmanager
+from json.encoder import encode_basestring
+from typing import IO, Generic, Iterable, Iterator, Sequence, TextIO, TypeVar
+
+from models import Directory, EnterDirEvent, ExitDirEvent, FileEvent, FileNode, ScanEvent
 
-from models import Directory, File
+from .events import directory_events
 
 T = TypeVar("T")
 
@@ -14,64 +19,250 @@ class IFormatter(ABC, Generic[T]):
         raise NotImplementedError
 
 
-class DefaultFormatter(IFormatter[str]):
-    """Human-readable text with indentation."""
+@contextmanager
+def text_stream(stream: IO) -> Iterator[TextIO]:
+    """Yields `stream` itself if it takes str, or a UTF-8 text layer over
+    it if it's a binary stream. The layer is flushed and detached
+    afterwards, so the caller's stream is left open."""
+    if not isinstance(stream, (io.RawIOBase, io.BufferedIOBase)):
+        yield stream
+        return
 
-    def format(self, directory: Directory, prefix: str = "") -> str:
-        buffer = io.StringIO()
-        self._write(directory, prefix, buffer)
-        return buffer.getvalue()
+    wrapper = io.TextIOWrapper(stream, encoding="utf-8", newline="")
+    try:
+        yield wrapper
+    finally:
+        wrapper.flush()
+        wrapper.detach()
 
-    def _write(self, directory: Directory, prefix: str, buffer: io.StringIO) -> None:
-        buffer.write(f"{prefix}📁 {directory.name}/\n")
 
-        items = [*directory.files, *directory.subdirectories]
+# Texts at least this long are passed on as they are rather than joined
+# with the rest of their event's output, which would copy them again.
+BATCH_SIZE = 64 * 1024
 
-        for i, item in enumerate(items):
-            is_last = i == len(items) - 1
-            connector = "└── " if is_last else "├── "
-            child_prefix = prefix + ("    " if is_last else "│   ")
 
-            if isinstance(item, File):
-                buffer.write(f"{prefix}{connector}📄 {item.name} ({item.size} bytes)\n")
-                if item.content:
-                    lines = item.content.splitlines()
-                    for j, line in enumerate(lines):
-                        is_last_line = j == len(lines) - 1
-                        line_connector = "└── " if is_last_line else "│   "
-                        buffer.write(f"{child_prefix}{line_connector}{line}\n")
-            else:
-                self._write(item, child_prefix, buffer)
+class _BatchedStream:
+    """Joins the many small writes a writer makes for one event (names,
+    prefixes, separators) into a single write, so the output stream —
+    and whatever wraps it, like a text layer or a timing proxy — is
+    called about once per event. `drain` after every event keeps the
+    output as live as the writes themselves."""
 
+    def __init__(self, stream: TextIO):
+        self._stream = stream
+        self._pending: list[str] = []
 
-class LLMFormatter(IFormatter[str]):
-    """Token-efficient format for LLM consumption."""
+    def write(self, text: str) -> int:
+        if len(text) >= BATCH_SIZE:
+            self.drain()
+            return self._stream.write(text)
+        self._pending.append(text)
+        return len(text)
 
-    FILE_SEPARATOR = "---"
+    def drain(self) -> None:
+        """Passes on what's pending (without flushing the stream)."""
+        if self._pending:
+            self._stream.write("".join(self._pending))
+            self._pending.clear()
+
+
+class FormatWriter(ABC):
+    """Renders one scan event at a time into a text stream. Created per
+    output by IStreamFormatter.writer; holds the per-output state (depth,
+    path, ...) that a recursive formatter would keep on the call stack."""
+
+    def __init__(self, stream: TextIO):
+        self._out = stream
+
+    def feed(self, event: ScanEvent) -> None:
+        if isinstance(event, FileEvent):
+            self.file(event.file)
+        elif isinstance(event, EnterDirEvent):
+            self.enter_dir(event)
+        else:
+            self.exit_dir(event)
+
+    @abstractmethod
+    def enter_dir(self, event: EnterDirEvent) -> None:
+        raise NotImplementedError
+
+    @abstractmethod
+    def file(self, file: FileNode) -> None:
+        raise NotImplementedError
+
+    @abstractmethod
+    def exit_dir(self, event: ExitDirEvent) -> None:
+        raise NotImplementedError
 
-    def format(self, directory: Directory, _path: str = "") -> str:
+    def close(self) -> None:
+        """Called once after the last event."""
+
+
+class IStreamFormatter(IFormatter[str]):
+    """A formatter that writes as the scan goes instead of returning one
+    big string: `write` feeds scan events (e.g. straight from
+    IScanner.iter_scan) into a text or binary stream, holding no more
+    than the current file. `format` is the same rendering collected into
+    a string."""
+
+    @abstractmethod
+    def writer(self, stream: TextIO) -> FormatWriter:
+        raise NotImplementedError
+
+    def write(self, events: Iterable[ScanEvent], stream: IO) -> None:
+        write_all(events, [(self, stream)])
+
+    def format(self, directory: Directory) -> str:
         buffer = io.StringIO()
-        self._write(directory, _path, buffer)
+        self.write(directory_events(directory), buffer)
         return buffer.getvalue()
 
-    def _write(self, directory: Directory, _path: str, buffer: io.StringIO) -> None:
-        path = f"{_path}/{directory.name}" if _path else directory.name
 
-        if not directory.files and not directory.subdirectories:
-            buffer.write(f"# {path}/\n{self.FILE_SEPARATOR}\n")
+def write_all(
+    events: Iterable[ScanEvent], targets: Sequence[tuple[IStreamFormatter, IO]]
+) -> None:
+    """Writes one pass over `events` with every (formatter, stream) of
+    `targets` — several formats and destinations from a single scan,
+    each event rendered by all of them before the next one is pulled."""
+    with ExitStack() as stack:
+        outputs: list[tuple[FormatWriter, _BatchedStream]] = []
+        for formatter, stream in targets:
+            batched = _BatchedStream(stack.enter_context(text_stream(stream)))
+            stack.callback(batched.drain)
+            outputs.append((formatter.writer(batched), batched))
+        for event in events:
+            for writer, batched in outputs:
+                writer.feed(event)
+                batched.drain()
+        for writer, _ in outputs:
+            writer.close()
+
+
+# Line boundaries str.splitlines() knows besides "\n". A substring test
+# per character is much faster than a regex search, especially on
+# non-ASCII text, and nearly all files have none of them.
+_ASCII_LINE_BREAKS = ("\r", "\v", "\f", "\x1c", "\x1d", "\x1e")
+_OTHER_LINE_BREAKS = (*_ASCII_LINE_BREAKS, "\x85", "\u2028", "\u2029")
+_LINE_BREAKS = re.compile("\r\n|[\r\v\f\x1c\x1d\x1e\x85\u2028\u2029]")
+
+
+def _only_newlines(content: str) -> bool:
+    breaks = _ASCII_LINE_BREAKS if content.isascii() else _OTHER_LINE_BREAKS
+    for line_break in breaks:
+        if line_break in content:
+            return False
+    return True
+
+
+def _file_prefixes(prefix: str) -> tuple[tuple[str, str, str, str], ...]:
+    """For the files of a directory drawn at `prefix`, indexed by whether
+    the file is the directory's last child: the file line's start, and
+    for its content the first line's prefix, the "\n" + prefix that
+    goes between lines, and the last line's prefix."""
+    prefixes = []
+    for branch, child in (("├── ", "│   "), ("└── ", "    ")):
+        inner = prefix + child
+        line = inner + "│   "
+        prefixes.append((prefix + branch + "📄 ", line, "\n" + line, inner + "└── "))
+    return tuple(prefixes)
+
+
+class _DefaultWriter(FormatWriter):
+    """Draws each file, content included, with one write and no list of
+    lines: the content is reduced to "\n" line ends (only when it has
+    others — the same boundaries, so the same lines, as `splitlines`),
+    and one `str.replace` turns every line break but the last into "\n"
+    plus the line prefix. The prefixes are built once per directory."""
+
+    def __init__(self, stream: TextIO, prefix: str):
+        super().__init__(stream)
+        self._root_prefix = prefix
+        # One [prefix, children still to come, file prefixes] per open
+        # directory.
+        self._stack: list[list] = []
+
+    def enter_dir(self, event: EnterDirEvent) -> None:
+        if self._stack:
+            frame = self._stack[-1]
+            frame[1] -= 1
+            prefix = frame[0] + ("    " if frame[1] == 0 else "│   ")
+        else:
+            prefix = self._root_prefix
+        self._out.write(f"{prefix}📁 {event.name}/\n")
+        file_prefixes = _file_prefixes(prefix) if event.file_count else ()
+        self._stack.append([prefix, event.file_count + event.dir_count, file_prefixes])
+
+    def file(self, file: FileNode) -> None:
+        frame = self._stack[-1]
+        frame[1] -= 1
+        head, first, between, last = frame[2][frame[1] == 0]
+        content = file.content
+        if not content:
+            self._out.write(f"{head}{file.name} ({file.size} bytes)\n")
             return
 
-        for file in directory.files:
-            file_path = f"{path}/{file.name}"
-            buffer.write(f"# {file_path}\n")
-            if file.content:
-                buffer.write(file.content)
-                buffer.write(f"\n{self.FILE_SEPARATOR}\n")
-            else:
-                buffer.write(f"{self.FILE_SEPARATOR}\n")
+        if not _only_newlines(content):
+            content = _LINE_BREAKS.sub("\n", content)
+        if content[-1] == "\n":
+            content = content[:-1]
+        cut = content.rfind("\n")
+        if cut == -1:
+            self._out.write(f"{head}{file.name} ({file.size} bytes)\n{last}{content}\n")
+        else:
+            lines = content[:cut].replace("\n", between)
+            self._out.write(
+                f"{head}{file.name} ({file.size} bytes)\n"
+                f"{first}{lines}\n{last}{content[cut + 1:]}\n"
+            )
+
+    def exit_dir(self, event: ExitDirEvent) -> None:
+        self._stack.pop()
 
-        for subdir in directory.subdirectories:
-            self._write(subdir, path, buffer)
+
+class DefaultFormatter(IStreamFormatter):
+    """Human-readable text with indentation."""
+
+    def __init__(self, prefix: str = ""):
+        self._prefix = prefix
+
+    def writer(self, stream: TextIO) -> FormatWriter:
+        return _DefaultWriter(stream, self._prefix)
+
+
+class _LLMWriter(FormatWriter):
+    def __init__(self, stream: TextIO, separator: str, root_path: str):
+        super().__init__(stream)
+        self._separator = separator
+        self._paths = [root_path] if root_path else []
+
+    def enter_dir(self, event: EnterDirEvent) -> None:
+        path = f"{self._paths[-1]}/{event.name}" if self._paths else event.name
+        self._paths.append(path)
+        if not event.file_count and not event.dir_count:
+            self._out.write(f"# {path}/\n{self._separator}\n")
+
+    def file(self, file: FileNode) -> None:
+        self._out.write(f"# {self._paths[-1]}/{file.name}\n")
+        if file.content:
+            self._out.write(file.content)
+            self._out.write(f"\n{self._separator}\n")
+        else:
+            self._out.write(f"{self._separator}\n")
+
+    def exit_dir(self, event: ExitDirEvent) -> None:
+        self._paths.pop()
+
+
+class LLMFormatter(IStreamFormatter):
+    """Token-efficient format for LLM consumption."""
+
+    FILE_SEPARATOR = "---"
+
+    def __init__(self, root_path: str = ""):
+        self._root_path = root_path
+
+    def writer(self, stream: TextIO) -> FormatWriter:
+        return _LLMWriter(stream, self.FILE_SEPARATOR, self._root_path)
 
 
 class JsonFormatter(IFormatter[dict]):
@@ -90,16 +281,161 @@ class JsonFormatter(IFormatter[dict]):
         }
 
 
-class JsonStringFormatter(IFormatter[str]):
+class _JsonWriter(FormatWriter):
+    """Encodes the same document as `json.dump(JsonFormatter().format(...))`
+    straight from the events, without building the dicts: every node is
+    written as soon as its event arrives, with the indentation and
+    separators `json.dump` would use and its string escaping
+    (`encode_basestring`, i.e. ensure_ascii=False).
+
+    A directory object is written up to its "files" key on entering it.
+    The files list is opened by its first file and closed by whatever
+    comes after the last one (a subdirectory or the exit), so the
+    writer never relies on the event's counts; the same goes for the
+    subdirectories list."""
+
+    def __init__(self, stream: TextIO, indent: int | None):
+        super().__init__(stream)
+        self._indent = indent
+        self._item_separator = "," if indent is not None else ", "
+        # Newline plus indentation per nesting level, built on demand.
+        self._newlines: list[str] = []
+        # One [level, files written, subdirectories written] per open
+        # directory; the files list is closed once subdirectories > 0.
+        self._stack: list[list[int]] = []
+        self._written = False
+
+    def _newline(self, level: int) -> str:
+        if self._indent is None:
+            return ""
+        while len(self._newlines) <= level:
+            self._newlines.append("\n" + " " * (self._indent * len(self._newlines)))
+        return self._newlines[level]
+
+    def _close_files(self, frame: list[int]) -> None:
+        level, files, _ = frame
+        if files:
+            self._out.write(f"{self._newline(level + 1)}]")
+        else:
+            self._out.write("[]")
+        self._out.write(
+            f"{self._item_separator}{self._newline(level + 1)}\"subdirectories\": "
+        )
+
+    def enter_dir(self, event: EnterDirEvent) -> None:
+        level = 0
+        if self._stack:
+            frame = self._stack[-1]
+            level = frame[0] + 2
+            if frame[2] == 0:
+                self._close_files(frame)
+                self._out.write("[")
+            else:
+                self._out.write(self._item_separator)
+            self._out.write(self._newline(level))
+            frame[2] += 1
+        self._written = True
+        inner = self._newline(level + 1)
+        self._out.write(
+            f"{{{inner}\"name\": {encode_basestring(event.name)}"
+            f"{self._item_separator}{inner}\"files\": "
+        )
+        self._stack.append([level, 0, 0])
+
+    def file(self, file: FileNode) -> None:
+        frame = self._stack[-1]
+        level = frame[0] + 2
+        if frame[1] == 0:
+            self._out.write("[")
+        else:
+            self._out.write(self._item_separator)
+        frame[1] += 1
+        inner = self._newline(level + 1)
+        separator = self._item_separator
+        self._out.write(
+            f"{self._newline(level)}{{{inner}\"name\": {encode_basestring(file.name)}"
+            f"{separator}{inner}\"content\": {encode_basestring(file.content)}"
+            f"{separator}{inner}\"size\": {file.size}"
+            f"{self._newline(level)}}}"
+        )
+
+    def exit_dir(self, event: ExitDirEvent) -> None:
+        frame = self._stack.pop()
+        level, _, subdirectories = frame
+        if subdirectories:
+            self._out.write(f"{self._newline(level + 1)}]")
+        else:
+            self._close_files(frame)
+            self._out.write("[]")
+        self._out.write(f"{self._newline(level)}}}")
+
+    def close(self) -> None:
+        if not self._written:
+            self._out.write("null")
+
+
+class JsonStringFormatter(IStreamFormatter):
     """Returns a JSON string."""
 
     def __init__(self, indent: int | None = 2):
         self._indent = indent
-        self._json_formatter = JsonFormatter()
 
-    def format(self, directory: Directory) -> str:
-        return json.dumps(
-            self._json_formatter.format(directory),
-            indent=self._indent,
-            ensure_ascii=False,
+    def writer(self, stream: TextIO) -> FormatWriter:
+        return _JsonWriter(stream, self._indent)
+
+
+class _NdjsonWriter(FormatWriter):
+    def __init__(self, stream: TextIO):
+        super().__init__(stream)
+        # Relative path of every open directory; the scan root is "".
+        self._paths: list[str] = []
+
+    def _record(self, record: dict) -> None:
+        self._out.write(json.dumps(record, ensure_ascii=False))
+        self._out.write("\n")
+
+    def enter_dir(self, event: EnterDirEvent) -> None:
+        if not self._paths:
+            path = ""
+        elif self._paths[-1]:
+            path = f"{self._paths[-1]}/{event.name}"
+        else:
+            path = event.name
+        self._paths.append(path)
+        self._record(
+            {
+                "type": "dir",
+                "path": path or ".",
+                "name": event.name,
+                "files": event.file_count,
+                "dirs": event.dir_count,
+            }
+        )
+
+    def file(self, file: FileNode) -> None:
+        parent = self._paths[-1]
+        self._record(
+            {
+                "type": "file",
+                "path": f"{parent}/{file.name}" if parent else file.name,
+                "size": file.size,
+                "content": file.content,
+            }
         )
+
+    def exit_dir(self, event: ExitDirEvent) -> None:
+        self._paths.pop()
+
+
+class NdjsonFormatter(IStreamFormatter):
+    """JSON Lines: one object per directory and per file, written as soon
+    as the scan reaches it, so consumers can parse the output line by
+    line while it's still being produced. Paths are "/"-separated and
+    relative to the scan root, which is "."; a directory's record comes
+    before everything in it.
+
+        {"type": "dir", "path": ".", "name": "root", "files": 1, "dirs": 0}
+        {"type": "file", "path": "main.py", "size": 8, "content": "print(1)"}"""
+
+    def writer(self, stream: TextIO) -> FormatWriter:
+        return _NdjsonWriter(stream)
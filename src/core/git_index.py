@@ -0,0 +1,155 @@
+import os
+import re
+import struct
+from typing import List, NamedTuple, Optional
+
+INDEX_SIGNATURE = b"DIRC"
+SUPPORTED_VERSIONS = (2, 3, 4)
+
+# ctime, mtime (sec + nsec each), dev, ino, mode, uid, gid, size.
+_STAT_FIELDS = struct.Struct(">10I")
+_HEADER = struct.Struct(">4sII")
+
+_MODE_TYPE_MASK = 0o170000
+_MODE_GITLINK = 0o160000
+_MODE_DIRECTORY = 0o040000
+
+_FLAG_EXTENDED = 0x4000
+
+
+class GitIndexError(ValueError):
+    """The index file is missing, truncated or in a format we don't read."""
+
+
+class GitRepository(NamedTuple):
+    worktree: str
+    git_dir: str
+
+
+def find_repository(path: str) -> Optional[GitRepository]:
+    """The repository `path` is in: the nearest ancestor (or `path`
+    itself) with a `.git` directory, or a `.git` file pointing at one
+    ("gitdir: ..." — linked worktrees, submodules). None outside a
+    repository."""
+    current = os.path.abspath(path)
+    while True:
+        dot_git = os.path.join(current, ".git")
+        if os.path.isdir(dot_git):
+            return GitRepository(worktree=current, git_dir=dot_git)
+        if os.path.isfile(dot_git):
+            git_dir = _read_gitdir_file(dot_git)
+            if git_dir is not None:
+                return GitRepository(worktree=current, git_dir=git_dir)
+        parent = os.path.dirname(current)
+        if parent == current:
+            return None
+        current = parent
+
+
+def _read_gitdir_file(path: str) -> Optional[str]:
+    try:
+        with open(path, encoding="utf-8") as f:
+            line = f.readline().strip()
+    except (OSError, UnicodeDecodeError):
+        return None
+    if not line.startswith("gitdir:"):
+        return None
+    git_dir = line[len("gitdir:"):].strip()
+    return os.path.normpath(os.path.join(os.path.dirname(path), git_dir))
+
+
+def _hash_size(git_dir: str) -> int:
+    """20 for SHA-1 repositories, 32 for `extensions.objectFormat = sha256`."""
+    try:
+        with open(os.path.join(git_dir, "config"), encoding="utf-8") as f:
+            config = f.read()
+    except (OSError, UnicodeDecodeError):
+        return 20
+    sha256 = re.compile(r"^\s*objectformat\s*=\s*sha256\s*$", re.IGNORECASE | re.MULTILINE)
+    if sha256.search(config):
+        return 32
+    return 20
+
+
+class GitIndexReader:
+    """Reads the paths of the files tracked in a repository straight from
+    `.git/index`, without running git — the same list `git ls-files`
+    prints.
+
+    Handles index versions 2 and 3 (NUL-padded names, extended flags)
+    and 4 (prefix-compressed names). A conflicted path is listed once,
+    not once per stage, and gitlinks (submodules) are skipped. So are a
+    sparse index's directory entries: their files aren't checked out.
+    Extensions after the entries are never needed and never read."""
+
+    def read(self, git_dir: str) -> List[str]:
+        index_path = os.path.join(git_dir, "index")
+        try:
+            with open(index_path, "rb") as f:
+                data = f.read()
+        except FileNotFoundError:
+            # A fresh repository has no index until the first `git add`.
+            return []
+        except OSError as exc:
+            raise GitIndexError(f"Can't read {index_path}: {exc}") from exc
+        return self.parse(data, _hash_size(git_dir))
+
+    def parse(self, data: bytes, hash_size: int = 20) -> List[str]:
+        if len(data) < _HEADER.size:
+            raise GitIndexError("Git index is truncated")
+        signature, version, count = _HEADER.unpack_from(data)
+        if signature != INDEX_SIGNATURE:
+            raise GitIndexError("Not a git index file")
+        if version not in SUPPORTED_VERSIONS:
+            raise GitIndexError(f"Unsupported git index version {version}")
+
+        paths: List[str] = []
+        previous = b""
+        offset = _HEADER.size
+        try:
+            for _ in range(count):
+                entry_start = offset
+                fields = _STAT_FIELDS.unpack_from(data, offset)
+                mode = fields[6]
+                offset += _STAT_FIELDS.size + hash_size
+                (flags,) = struct.unpack_from(">H", data, offset)
+                offset += 2
+                if version >= 3 and flags & _FLAG_EXTENDED:
+                    offset += 2
+
+                if version == 4:
+                    strip, offset = _read_varint(data, offset)
+                    end = data.index(b"\0", offset)
+                    name = previous[: len(previous) - strip] + data[offset:end]
+                    offset = end + 1
+                else:
+                    end = data.index(b"\0", offset)
+                    name = data[offset:end]
+                    # Entries are NUL-padded (1-8 bytes) to a multiple of 8.
+                    entry_length = offset - entry_start + len(name)
+                    offset = entry_start + ((entry_length + 8) & ~7)
+                if name == previous:
+                    # Conflicted paths have one entry per stage, in a row.
+                    continue
+                previous = name
+
+                mode_type = mode & _MODE_TYPE_MASK
+                if mode_type in (_MODE_GITLINK, _MODE_DIRECTORY):
+                    continue
+                paths.append(name.decode("utf-8", errors="surrogateescape"))
+        except (struct.error, ValueError, IndexError) as exc:
+            raise GitIndexError("Git index is truncated or corrupt") from exc
+        return paths
+
+
+def _read_varint(data: bytes, offset: int) -> tuple[int, int]:
+    """Git's offset varint (index v4 name prefixes): big-endian 7-bit
+    groups, each continuation adding one so encodings are unique."""
+    byte = data[offset]
+    offset += 1
+    value = byte & 0x7F
+    while byte & 0x80:
+        byte = data[offset]
+        offset += 1
+        value = ((value + 1) << 7) | (byte & 0x7F)
+    return value, offset
@@ -0,0 +1,119 @@
+import os
+import stat
+from typing import Iterator
+
+from models import ScanConfig, ScanEvent
+from models.scan_config import CompiledRules
+
+from .git_index import GitIndexError, GitIndexReader, find_repository
+from .parallel_scanner import ParallelScanner
+from .scanner import BaseScanner, DirScope
+
+
+class _IndexEntry:
+    """Stands in for an os.DirEntry, built from a path in the index
+    instead of a directory listing. A file is only stat'ed when the
+    scanner asks for its size — by then it has passed the rules."""
+
+    __slots__ = ("name", "path", "_is_dir", "_stat")
+
+    def __init__(self, name: str, path: str, is_dir: bool):
+        self.name = name
+        self.path = path
+        self._is_dir = is_dir
+        self._stat: os.stat_result | None = None
+
+    def is_dir(self) -> bool:
+        return self._is_dir
+
+    def is_file(self) -> bool:
+        return not self._is_dir
+
+    def is_symlink(self) -> bool:
+        return False
+
+    def exists(self) -> bool:
+        """Whether the tracked file is still a regular file on disk (it
+        may have been deleted or replaced without being staged)."""
+        try:
+            self._stat = os.stat(self.path)
+        except OSError:
+            return False
+        return stat.S_ISREG(self._stat.st_mode)
+
+    def stat(self) -> os.stat_result:
+        if self._stat is None:
+            self._stat = os.stat(self.path)
+        return self._stat
+
+
+class GitIndexScanner(BaseScanner):
+    """BaseScanner that lists the files tracked by git instead of walking
+    the filesystem.
+
+    The paths come from parsing `.git/index` once (GitIndexReader — no
+    git binary needed) and are arranged into per-directory listings up
+    front, so untracked trees — build output, virtualenvs,
+    node_modules — are never even opened. Everything after listing is
+    the usual walk: ScanConfig's rules, ignore files and max_depth apply
+    on top, and only the files that pass them are stat'ed and read.
+    Directories without tracked files don't appear, as in git.
+
+    Scanning a subdirectory of a checkout lists the tracked files below
+    it. Raises GitIndexError if the path isn't inside a git repository."""
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self._listings: dict[str, dict[str, _IndexEntry]] = {}
+
+    def iter_scan(self, path: str, config: ScanConfig) -> Iterator[ScanEvent]:
+        root = os.path.normpath(path)
+        self._listings = self._build_listings(root)
+        try:
+            yield from super().iter_scan(path, config)
+        finally:
+            self._listings = {}
+
+    def _list_dir(self, path: str, rel: str) -> list[os.DirEntry]:
+        return list(self._listings.get(rel, {}).values())
+
+    def _filter_files(
+        self,
+        entries: list[os.DirEntry],
+        rules: CompiledRules,
+        scope: DirScope | None = None,
+    ) -> list[os.DirEntry]:
+        kept = super()._filter_files(entries, rules, scope)
+        return [entry for entry in kept if entry.exists()]
+
+    @staticmethod
+    def _build_listings(root: str) -> dict[str, dict[str, _IndexEntry]]:
+        repository = find_repository(root)
+        if repository is None:
+            raise GitIndexError(f"{root} is not inside a git repository")
+
+        prefix = os.path.relpath(os.path.abspath(root), repository.worktree)
+        prefix = "" if prefix == "." else prefix.replace(os.sep, "/") + "/"
+
+        listings: dict[str, dict[str, _IndexEntry]] = {}
+        for tracked in GitIndexReader().read(repository.git_dir):
+            if not tracked.startswith(prefix):
+                continue
+            parts = tracked[len(prefix):].split("/")
+            parent = ""
+            directory = root
+            for part in parts[:-1]:
+                directory = os.path.join(directory, part)
+                siblings = listings.setdefault(parent, {})
+                if part not in siblings:
+                    siblings[part] = _IndexEntry(part, directory, is_dir=True)
+                parent = f"{parent}/{part}" if parent else part
+            name = parts[-1]
+            listings.setdefault(parent, {})[name] = _IndexEntry(
+                name, os.path.join(directory, name), is_dir=False
+            )
+        return listings
+
+
+class ParallelGitIndexScanner(GitIndexScanner, ParallelScanner):
+    """GitIndexScanner listing, ParallelScanner reads (`--jobs`)."""
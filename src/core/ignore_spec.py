@@ -0,0 +1,294 @@
+import re
+from pathlib import Path
+from typing import Iterable, List, NamedTuple, Optional, Tuple
+
+
+class IgnoreRule(NamedTuple):
+    pattern: re.Pattern
+    negated: bool
+    dir_only: bool
+    # The line as written and its 1-based number, for --explain.
+    line: str = ""
+    line_number: int = 0
+
+
+class GitignoreSpec:
+    """Path-aware matcher for gitignore syntax.
+
+    Unlike the name-only exclude lists of ScanConfig, this follows
+    gitignore(5):
+
+    - "!pattern" re-includes what an earlier pattern excluded; the last
+      matching line wins
+    - a pattern with a "/" at the start or in the middle is anchored to
+      the directory of the ignore file ("/build", "docs/gen"); one
+      without matches at any level ("*.pyc")
+    - a trailing "/" only matches directories
+    - "**/" matches any number of leading directories, "/**" everything
+      inside, "/**/" zero or more directories in between; "*", "?" and
+      "[...]" never cross a "/"
+    - "\\" escapes the next character ("\\#", "\\!", trailing "\\ ")
+
+    Paths are "/"-separated and relative to the scan root; `base` is the
+    directory the patterns were read from, relative to the same root.
+    Patterns read above the scan root (a .treesnakeignore found by
+    walking up from it) take `root` instead: the scan root's path
+    relative to their directory, which is put in front of every path
+    before matching. `match` only looks at the path itself. As in git, a
+    file inside an ignored directory can't be re-included, and the
+    scanner relies on that to prune ignored directories without listing
+    them.
+
+    Every line is compiled to its own regex. All of them are also merged
+    into one alternation, so a path no line matches, which is the common
+    case, costs a single regex call. When a spec has no negations, any
+    hit is final and the lines never need to be checked one by one."""
+
+    def __init__(
+        self, lines: Iterable[str], base: str = "", source: str = "", root: str = ""
+    ):
+        self.base = base.strip("/")
+        self.source = source
+        self.root = root.strip("/")
+        self.rules: List[IgnoreRule] = []
+        for line_number, line in enumerate(lines, start=1):
+            rule = self._compile_line(line)
+            if rule is not None:
+                self.rules.append(rule._replace(line=line, line_number=line_number))
+
+        self._prefix = f"{self.base}/" if self.base else ""
+        self._root_prefix = f"{self.root}/" if self.root else ""
+        self._has_negations = any(rule.negated for rule in self.rules)
+        self._any_dir = self._alternation(self.rules)
+        self._any_file = self._alternation(
+            [rule for rule in self.rules if not rule.dir_only]
+        )
+
+    @classmethod
+    def from_file(cls, path: str, base: str = "") -> "GitignoreSpec":
+        """Reads an ignore file; a missing or unreadable one gives an empty
+        spec."""
+        try:
+            lines = Path(path).read_text(encoding="utf-8").splitlines()
+        except (OSError, UnicodeDecodeError):
+            lines = []
+        return cls(lines, base, source=path)
+
+    def __bool__(self) -> bool:
+        return bool(self.rules)
+
+    def match(self, path: str, is_dir: bool) -> Optional[bool]:
+        """True if `path` is ignored, False if a negation re-includes it,
+        None if no line mentions it (or it isn't under `base`)."""
+        if self._prefix:
+            if not path.startswith(self._prefix):
+                return None
+            path = path[len(self._prefix):]
+        path = self._root_prefix + path
+
+        combined = self._any_dir if is_dir else self._any_file
+        if combined is None or not combined.match(path):
+            return None
+        if not self._has_negations:
+            return True
+        for rule in reversed(self.rules):
+            if rule.dir_only and not is_dir:
+                continue
+            if rule.pattern.match(path):
+                return not rule.negated
+        return None
+
+    def ignores(self, path: str, is_dir: bool) -> bool:
+        return bool(self.match(path, is_dir))
+
+    def explain(self, path: str, is_dir: bool) -> Optional[IgnoreRule]:
+        """The line that decides `match` for `path` — the last one that
+        matches it — or None."""
+        if self._prefix:
+            if not path.startswith(self._prefix):
+                return None
+            path = path[len(self._prefix):]
+        path = self._root_prefix + path
+        for rule in reversed(self.rules):
+            if rule.dir_only and not is_dir:
+                continue
+            if rule.pattern.match(path):
+                return rule
+        return None
+
+    @staticmethod
+    def _alternation(rules: List[IgnoreRule]) -> Optional[re.Pattern]:
+        if not rules:
+            return None
+        return re.compile("|".join(f"(?:{rule.pattern.pattern})" for rule in rules))
+
+    @classmethod
+    def _compile_line(cls, line: str) -> Optional[IgnoreRule]:
+        line = cls._strip_trailing_spaces(line)
+        if not line or line.startswith("#"):
+            return None
+
+        negated = line.startswith("!")
+        if negated:
+            line = line[1:]
+        dir_only = line.endswith("/") and not line.endswith("\\/")
+        if dir_only:
+            line = line.rstrip("/")
+        if not line:
+            return None
+
+        anchored = "/" in line
+        line = line.lstrip("/")
+        if not line:
+            return None
+
+        body = cls._translate(line)
+        if not anchored and not body.startswith("(?:.*/)?"):
+            body = "(?:.*/)?" + body
+        return IgnoreRule(re.compile(body + r"\Z", re.DOTALL), negated, dir_only)
+
+    @staticmethod
+    def _strip_trailing_spaces(line: str) -> str:
+        line = line.rstrip("\n\r")
+        end = len(line)
+        while end and line[end - 1] == " ":
+            if end >= 2 and line[end - 2] == "\\":
+                break
+            end -= 1
+        return line[:end]
+
+    @staticmethod
+    def _translate(pattern: str) -> str:
+        """Regex for a pattern with its "!" and leading/trailing "/"
+        already removed."""
+        segments = pattern.split("/")
+        parts: List[str] = []
+        last = len(segments) - 1
+        for index, segment in enumerate(segments):
+            if segment == "**":
+                if index == last:
+                    # "a/**": everything inside a, but not a itself.
+                    parts.append(".*")
+                    continue
+                # "**/" and "a/**/b": zero or more whole directories.
+                parts.append("(?:.*/)?")
+                continue
+            parts.append(_translate_segment(segment))
+            if index != last:
+                parts.append("/")
+
+        regex = "".join(parts)
+        if regex.startswith(".*") and len(segments) == 1:
+            # A lone "**" is just "*" repeated: anything but "/".
+            return "[^/]*"
+        return regex
+
+
+def _translate_segment(segment: str) -> str:
+    out: List[str] = []
+    i, n = 0, len(segment)
+    while i < n:
+        char = segment[i]
+        i += 1
+        if char == "\\" and i < n:
+            out.append(re.escape(segment[i]))
+            i += 1
+        elif char == "*":
+            while i < n and segment[i] == "*":
+                i += 1
+            out.append("[^/]*")
+        elif char == "?":
+            out.append("[^/]")
+        elif char == "[":
+            end = _class_end(segment, i)
+            if end is None:
+                out.append(re.escape(char))
+                continue
+            out.append(_translate_class(segment[i:end]))
+            i = end + 1
+        else:
+            out.append(re.escape(char))
+    return "".join(out)
+
+
+def _translate_class(body: str) -> str:
+    negated = body[:1] in ("!", "^")
+    if negated:
+        body = body[1:]
+    out: List[str] = []
+    i = 0
+    while i < len(body):
+        char = body[i]
+        i += 1
+        if char == "\\" and i < len(body):
+            char = body[i]
+            i += 1
+            out.append(re.escape(char))
+        elif char == "-" and out and i < len(body):
+            out.append("-")
+        else:
+            out.append(re.escape(char))
+    if negated:
+        return "[^/" + "".join(out) + "]"
+    return "(?!/)[" + "".join(out) + "]"
+
+
+def _class_end(segment: str, start: int) -> Optional[int]:
+    """Index of the "]" closing a bracket expression that opened just
+    before `start`, or None if it never closes."""
+    i = start
+    if i < len(segment) and segment[i] in ("!", "^"):
+        i += 1
+    if i < len(segment) and segment[i] == "]":
+        i += 1
+    while i < len(segment):
+        if segment[i] == "]":
+            return i
+        i += 1
+    return None
+
+
+class IgnoreStack:
+    """The GitignoreSpecs in effect in one directory: the scan-wide
+    ignore_patterns at the bottom, then one spec per ignore file found on
+    the way down, deepest last. Each directory pushes onto its parent's
+    stack, so siblings share it and an ignore file is read once.
+
+    A path is checked against the deepest spec first and the first one
+    that mentions it decides — a nested .gitignore overrides its
+    parents, as in git. Since every spec is a single regex call for a
+    path it doesn't mention, the cost per entry grows with the number of
+    ignore files above it, not with their line count."""
+
+    __slots__ = ("_specs",)
+
+    def __init__(self, specs: Tuple[GitignoreSpec, ...] = ()):
+        self._specs = specs
+
+    def push(self, spec: Optional[GitignoreSpec]) -> "IgnoreStack":
+        if not spec:
+            return self
+        return IgnoreStack(self._specs + (spec,))
+
+    def __bool__(self) -> bool:
+        return bool(self._specs)
+
+    def __len__(self) -> int:
+        return len(self._specs)
+
+    def ignores(self, path: str, is_dir: bool) -> bool:
+        for spec in reversed(self._specs):
+            result = spec.match(path, is_dir)
+            if result is not None:
+                return result
+        return False
+
+    def explain(
+        self, path: str, is_dir: bool
+    ) -> Optional[Tuple[GitignoreSpec, IgnoreRule]]:
+        """The spec and line that decide `ignores` for `path`, or None."""
+        for spec in reversed(self._specs):
+            rule = spec.explain(path, is_dir)
+            if rule is not None:
+                return spec, rule
+        return None
@@ -0,0 +1,91 @@
+import re
+from typing import FrozenSet, List, Tuple, Union
+
+from .ignore_spec import _translate_segment
+
+# Positions (pattern index, segments matched so far) still alive after
+# the path walked so far.
+IncludeState = FrozenSet[Tuple[int, int]]
+
+_Segment = Union[str, re.Pattern, None]
+_GLOBSTAR: _Segment = None
+
+
+class PathIncludes:
+    """Path-glob includes ("src/core/**", "docs/*.md", "**/*.proto"),
+    compiled into a segment-by-segment automaton so the walk knows, at
+    each directory, whether anything below it can still match.
+
+    A pattern is split on "/"; each segment is a name glob ("*", "?",
+    "[...]" — matched against one path component), and "**" stands for
+    any number of components. A state is the set of (pattern, segments
+    matched) positions alive for the current directory; `step` advances
+    it by one name. A directory whose step comes back empty can't lead
+    to a match, so the walk never enters it — scanning two packages of a
+    huge repo only lists the directories on the way to them. A pattern
+    that matches a directory outright includes everything under it, so
+    "src/core" and "src/core/**" are equivalent for files."""
+
+    def __init__(self, patterns: List[str]):
+        self.patterns = patterns
+        self._segments: List[Tuple[_Segment, ...]] = [
+            tuple(self._compile_segment(part) for part in self._split(pattern))
+            for pattern in patterns
+        ]
+        self.root: IncludeState = self._closure(
+            {(index, 0) for index in range(len(self._segments))}
+        )
+
+    def step(self, state: IncludeState, name: str) -> IncludeState:
+        """The state for `name` inside a directory whose state is `state`;
+        empty when no pattern can match `name` or anything below it."""
+        advanced = set()
+        for index, position in state:
+            segments = self._segments[index]
+            if position == len(segments):
+                advanced.add((index, position))
+                continue
+            segment = segments[position]
+            if segment is _GLOBSTAR:
+                advanced.add((index, position))
+            elif _matches(segment, name):
+                advanced.add((index, position + 1))
+        return self._closure(advanced)
+
+    def accepts(self, state: IncludeState) -> bool:
+        """Whether the path `state` was stepped to matches a pattern."""
+        return any(position == len(self._segments[index]) for index, position in state)
+
+    def _closure(self, positions: set) -> IncludeState:
+        # "**" also matches zero components: a position in front of one
+        # is at the same time just past it.
+        stack = list(positions)
+        while stack:
+            index, position = stack.pop()
+            segments = self._segments[index]
+            if position < len(segments) and segments[position] is _GLOBSTAR:
+                following = (index, position + 1)
+                if following not in positions:
+                    positions.add(following)
+                    stack.append(following)
+        return frozenset(positions)
+
+    @staticmethod
+    def _split(pattern: str) -> List[str]:
+        if pattern.startswith("./"):
+            pattern = pattern[2:]
+        return [part for part in pattern.split("/") if part and part != "."]
+
+    @staticmethod
+    def _compile_segment(part: str) -> _Segment:
+        if part == "**":
+            return _GLOBSTAR
+        if not any(char in part for char in "*?[\\"):
+            return part
+        return re.compile(_translate_segment(part) + r"\Z", re.DOTALL)
+
+
+def _matches(segment: Union[str, re.Pattern], name: str) -> bool:
+    if isinstance(segment, str):
+        return segment == name
+    return segment.match(name) is not None
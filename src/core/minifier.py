@@ -0,0 +1,585 @@
+import os
+import re
+from abc import ABC, abstractmethod
+from time import perf_counter
+from typing import Iterable, Iterator, NamedTuple
+
+from models import FileEvent, FileNode, ScanEvent
+
+
+class _Unlexable(Exception):
+    """The text doesn't lex as the language its name says: left as is."""
+
+
+class _Span(NamedTuple):
+    """A stretch of the original text the lexer found: replaced by
+    `replacement`, or kept byte for byte when that is None (a string
+    spanning lines, whose whitespace is part of its value)."""
+
+    start: int
+    end: int
+    replacement: str | None
+
+
+class IContentMinifier(ABC):
+    @abstractmethod
+    def minify(self, text: str) -> str:
+        """`text` without comments and with whitespace collapsed, meaning
+        the same code; `text` itself when it can't be lexed."""
+        raise NotImplementedError
+
+
+class LexingMinifier(IContentMinifier):
+    """Base for the minifiers here: a subclass lexes just enough of the
+    language to find comments and strings (`_spans`), and this class
+    rebuilds the text around them. Outside of strings that span lines,
+    trailing whitespace and blank lines are dropped and line breaks
+    become "\\n"; indentation is kept, since it is syntax in some
+    languages and a cheap hint of structure in all of them. The result
+    is never longer than `text`."""
+
+    def minify(self, text: str) -> str:
+        try:
+            spans = list(self._spans(text))
+        except _Unlexable:
+            return text
+        minified = _rebuild(text, spans)
+        return minified if len(minified) < len(text) else text
+
+    @abstractmethod
+    def _spans(self, text: str) -> Iterable[_Span]:
+        """Comments and strings of `text`, in order. Raises _Unlexable
+        when the text isn't what the lexer expects."""
+        raise NotImplementedError
+
+
+def _rebuild(text: str, spans: Iterable[_Span]) -> str:
+    out: list[str] = []
+    code: list[str] = []
+    # Whether `out` ends a line, so the code that follows starts one.
+    at_line_start = True
+
+    def flush() -> None:
+        # Split and rstrip rather than a regex: several times faster, as
+        # the regex engine stops at every run of indentation.
+        nonlocal at_line_start
+        lines = "".join(code).split("\n")
+        code.clear()
+        if len(lines) == 1:
+            out.append(lines[0])
+            at_line_start = at_line_start and not lines[0]
+            return
+        # The first and last line may be the end and start of lines that
+        # go on in a kept string; only the lines in between are whole.
+        first = lines[0].rstrip()
+        kept = [first] if first or not at_line_start else []
+        kept += [line for line in map(str.rstrip, lines[1:-1]) if line]
+        kept.append(lines[-1])
+        out.append("\n".join(kept))
+        at_line_start = not lines[-1]
+
+    pos = 0
+    for span in spans:
+        code.append(text[pos : span.start])
+        if span.replacement is not None:
+            code.append(span.replacement)
+        else:
+            flush()
+            kept = text[span.start : span.end]
+            out.append(kept)
+            at_line_start = kept.endswith("\n")
+        pos = span.end
+    code.append(text[pos:])
+    flush()
+
+    result = "".join(out).rstrip()
+    return result + "\n" if result and text.endswith("\n") else result
+
+
+def _token_regex(alternatives: dict[str, str], flags: int = 0) -> re.Pattern[str]:
+    """One regex matching any of `alternatives`, with `lastgroup` naming
+    the one that matched. Each must start with a literal character —
+    that lets the regex engine skip to where a token can start instead
+    of trying every one at each position, several times faster on
+    source code — so the name marks the end of the match, as an empty
+    group, rather than wrapping it."""
+    return re.compile(
+        "|".join(f"{pattern}(?P<{name}>)" for name, pattern in alternatives.items()),
+        flags,
+    )
+
+
+def _starts_shebang(text: str, start: int) -> bool:
+    return start == 0 and text.startswith("#!")
+
+
+# String prefixes are picked up once a string is found, so that every
+# alternative starts with "#" or a quote.
+_PY_TOKEN = _token_regex(
+    {
+        "comment": r"#[^\r\n]*",
+        "triple_single": r"'''[^\\']*(?:(?:\\[\s\S]|'(?!''))[^\\']*)*'''",
+        "triple_double": r'"""[^\\"]*(?:(?:\\[\s\S]|"(?!""))[^\\"]*)*"""',
+        "unclosed_triple": r"'''|\"\"\"",
+        "single": r"'[^'\\\r\n]*(?:\\[\s\S][^'\\\r\n]*)*'",
+        "double": r'"[^"\\\r\n]*(?:\\[\s\S][^"\\\r\n]*)*"',
+        "unclosed": r"['\"]",
+    }
+)
+_PY_STRINGS = frozenset(("triple_single", "triple_double", "single", "double"))
+_PY_STRING_PREFIX = frozenset("rRbBuUfF")
+# Prefixes a docstring may have: an f-string or bytes isn't one.
+_PY_DOCSTRING_PREFIX = frozenset("rRuU")
+_PY_DEF_OR_CLASS = re.compile(r"[ \t]*(?:async[ \t]+)?(?:def|class)\b")
+# What may follow a docstring on its line.
+_PY_REST_OF_STATEMENT = re.compile(r"[ \t\f]*(?:\#[^\r\n]*)?(?:\r?\n|\Z)")
+
+
+def _bracket_balance(code: str) -> int:
+    return (
+        code.count("(") + code.count("[") + code.count("{")
+        - code.count(")") - code.count("]") - code.count("}")
+    )
+
+
+class _PendingDocstring(NamedTuple):
+    """A docstring that opened its block: if nothing but other docstrings
+    follow in the block, it becomes `...` instead of nothing."""
+
+    span: int
+    indent: int
+
+
+class PythonMinifier(LexingMinifier):
+    """Drops comments (the shebang line stays) and docstrings: a plain
+    string literal that is the first statement of the module, a class or
+    a def. Other string statements stay, f-strings above all, which are
+    evaluated. A block whose only statement was its docstring gets `...`
+    so it stays valid.
+
+    `tokenize` would do the lexing but runs at a couple of MB/s, which
+    would make this the slowest step of a scan. Comments and strings are
+    found with one regex instead (every prefix and quote form, escapes
+    included), and the rest of what a docstring needs is worked out from
+    the code between them: the bracket depth, whether the string starts
+    its line, the header of the block it opens, and indentation for
+    where that block ends. Text with an unterminated string is left
+    alone."""
+
+    def _spans(self, text: str) -> list[_Span]:
+        spans: list[_Span] = []
+        # Bracket depth, as of the code in `uncounted`: only needed for
+        # the few strings that could be docstrings, so counted then.
+        depth = 0
+        uncounted: list[str] = []
+        # Last non-blank character of the code kept so far, and where it
+        # is: "" means no statement yet, ":" that the next statement is
+        # the first of a block.
+        last_code = ""
+        last_code_at = -1
+        pending: _PendingDocstring | None = None
+        pos = 0
+
+        def code_starts(at: int) -> None:
+            nonlocal pending, last_code
+            indent = at - (text.rfind("\n", 0, at) + 1)
+            if indent < pending.indent:
+                spans[pending.span] = spans[pending.span]._replace(replacement="...")
+                last_code = "."
+            pending = None
+
+        def code_between(start: int, end: int) -> None:
+            nonlocal last_code, last_code_at
+            gap = text[start:end]
+            code = gap.rstrip()
+            if code:
+                if pending is not None:
+                    code_starts(start + len(gap) - len(gap.lstrip()))
+                last_code = code[-1]
+                last_code_at = start + len(code) - 1
+                uncounted.append(code)
+
+        for match in _PY_TOKEN.finditer(text):
+            kind = match.lastgroup
+            start, end = match.span()
+            if kind in _PY_STRINGS and start and text[start - 1] in _PY_STRING_PREFIX:
+                start = self._prefix_start(text, start)
+            code_between(pos, start)
+
+            if kind == "comment":
+                if not _starts_shebang(text, start):
+                    spans.append(_Span(start, end, ""))
+            elif kind in _PY_STRINGS:
+                line_start = text.rfind("\n", 0, start) + 1
+                docstring = (
+                    (last_code == "" or last_code == ":")
+                    and _PY_DOCSTRING_PREFIX.issuperset(text[start : match.start()])
+                    and self._starts_statement(text, line_start, start, end)
+                )
+                if docstring and uncounted:
+                    counted = "".join(uncounted)
+                    uncounted.clear()
+                    depth += _bracket_balance(counted)
+                docstring = docstring and not depth and (
+                    last_code == "" or self._opens_def_or_class(text, last_code_at)
+                )
+                if docstring:
+                    if last_code == ":":
+                        pending = _PendingDocstring(len(spans), start - line_start)
+                    spans.append(_Span(start, end, ""))
+                else:
+                    if pending is not None:
+                        code_starts(start)
+                    if kind.startswith("triple") and "\n" in text[start:end]:
+                        spans.append(_Span(start, end, None))
+                # A docstring is a statement too: a string after it isn't one.
+                last_code = text[end - 1]
+                last_code_at = end - 1
+            else:
+                raise _Unlexable
+            pos = end
+        code_between(pos, len(text))
+
+        if pending is not None:
+            spans[pending.span] = spans[pending.span]._replace(replacement="...")
+        return spans
+
+    @staticmethod
+    def _prefix_start(text: str, quote: int) -> int:
+        start = quote
+        while quote - start < 2 and start and text[start - 1] in _PY_STRING_PREFIX:
+            start -= 1
+        if start != quote and start and (text[start - 1].isalnum() or text[start - 1] == "_"):
+            # The end of a name, as in `x in"ab"`.
+            return quote
+        return start
+
+    @staticmethod
+    def _opens_def_or_class(text: str, colon: int) -> bool:
+        """Whether the block header ending at `colon` is a def or class:
+        its first line is the one from which the brackets up to the
+        colon balance (a def's parameters may span lines)."""
+        line_start = text.rfind("\n", 0, colon) + 1
+        balance = _bracket_balance(text[line_start:colon])
+        while balance < 0 and line_start:
+            line_end = line_start - 1
+            line_start = text.rfind("\n", 0, line_end) + 1
+            balance += _bracket_balance(text[line_start:line_end])
+        return _PY_DEF_OR_CLASS.match(text, line_start) is not None
+
+    @staticmethod
+    def _starts_statement(text: str, line_start: int, start: int, end: int) -> bool:
+        """Whether the string from `start` to `end` is all of its line,
+        comments aside, and the line starts a statement unless it is
+        inside brackets."""
+        if text[line_start:start].strip():
+            return False
+        # Not if the line before ends in a "\\" continuation.
+        before = line_start - 2
+        if before >= 0 and text[before] == "\r":
+            before -= 1
+        if before >= 0 and text[before] == "\\":
+            return False
+        return _PY_REST_OF_STATEMENT.match(text, end) is not None
+
+
+# The text of a template literal after its opening "`" or the "}" of a
+# substitution, up to and including the next "`" or "${".
+_TEMPLATE_PART = r"[^`\\$]*(?:(?:\\[\s\S]|\$(?!\{))[^`\\$]*)*(?:`|\$\{)"
+_TEMPLATE_REST = re.compile(_TEMPLATE_PART)
+_REGEX_LITERAL_AFTER = frozenset("(,=:[!&|?{};+-*%<>~^")
+_REGEX_LITERAL_AFTER_WORD = re.compile(
+    r"(?<![\w$.])(?:return|typeof|case|do|else|in|of|new|delete|void|throw|yield|await)$"
+)
+
+
+class CStyleMinifier(LexingMinifier):
+    """`/* */` and (with `line_comments`) `//` comments, for the C family,
+    JavaScript/TypeScript, Go, Rust, CSS and the like. Strings are lexed
+    so comment markers inside them stay: double- and triple-quoted ones
+    always, single-quoted ones as strings (`single_quote_strings`) or
+    one-character literals (so Rust lifetimes don't open a string), plus
+    the language's `extra_strings` patterns (raw strings). With
+    `regex_literals`, a `/.../` where an expression can start is a
+    JavaScript regex, not a division followed by a comment.
+
+    With `template_literals`, backquoted JavaScript templates are lexed
+    with their `${...}` substitutions, which are code — and can hold
+    strings, comments and templates of their own — up to the `}` that
+    balances the `${`. The whole outermost template is kept as it is.
+
+    A one-line block comment becomes a space only between two word
+    characters, where removing it would merge them; one spanning lines
+    becomes a line break, which is what JavaScript's semicolon insertion
+    sees it as."""
+
+    def __init__(
+        self,
+        line_comments: bool = True,
+        single_quote_strings: bool = False,
+        extra_strings: Iterable[str] = (),
+        regex_literals: bool = False,
+        nested_comments: bool = False,
+        template_literals: bool = False,
+    ):
+        strings = [r'"""[\s\S]*?"""', *extra_strings, r'"[^"\\\n]*(?:\\[\s\S][^"\\\n]*)*"']
+        if single_quote_strings:
+            strings.append(r"'[^'\\\n]*(?:\\[\s\S][^'\\\n]*)*'")
+        else:
+            strings.append(r"'(?:[^'\\\n]|\\[^\n][^'\n]{0,9})'")
+        alternatives = {"block": r"/\*[\s\S]*?\*/"}
+        if line_comments:
+            alternatives["line"] = r"//[^\r\n]*"
+        for i, pattern in enumerate(strings):
+            alternatives[f"string{i}"] = pattern
+        self._strings = frozenset(f"string{i}" for i in range(len(strings)))
+        if regex_literals:
+            alternatives["regex"] = r"/(?![*/])(?:[^/\\\[\n]|\\.|\[(?:[^\]\\\n]|\\.)*\])+/"
+        if template_literals:
+            # Up to the closing "`" or the "${" of a substitution.
+            alternatives["template"] = rf"`{_TEMPLATE_PART}"
+            alternatives["unclosed_template"] = "`"
+        alternatives["unclosed"] = r"/\*"
+        self._token = _token_regex(alternatives)
+        # Inside a substitution, braces are counted to find its end.
+        self._substitution_token = _token_regex(
+            {**alternatives, "open_brace": r"\{", "close_brace": r"\}"}
+        )
+        self._nested_comments = nested_comments
+
+    def _spans(self, text: str) -> Iterator[_Span]:
+        token = self._token
+        matches = token.finditer(text)
+        # Start of the outermost template being lexed, and for each of
+        # its substitutions still open, the braces open inside it.
+        template_start = -1
+        braces: list[int] = []
+        while (match := next(matches, None)) is not None:
+            kind = match.lastgroup
+            start, end = match.span()
+            if kind == "template" or kind == "close_brace":
+                if kind == "close_brace":
+                    if braces[-1]:
+                        braces[-1] -= 1
+                        continue
+                    # The end of a substitution: the template goes on.
+                    braces.pop()
+                    part = _TEMPLATE_REST.match(text, end)
+                    if part is None:
+                        raise _Unlexable
+                    end = part.end()
+                elif not braces:
+                    template_start = start
+                if text.endswith("${", 0, end):
+                    braces.append(0)
+                elif not braces:
+                    if "\n" in text[template_start:end]:
+                        yield _Span(template_start, end, None)
+                token = self._substitution_token if braces else self._token
+                matches = token.finditer(text, end)
+            elif kind == "open_brace":
+                braces[-1] += 1
+            elif braces and kind != "regex":
+                # Comments and strings inside a substitution go with the
+                # template, as they are; only the end of each is needed.
+                if kind == "unclosed" or kind == "unclosed_template":
+                    raise _Unlexable
+                if kind == "block" and self._nested_comments and "/*" in text[start + 2 : end]:
+                    raise _Unlexable
+            elif kind in self._strings:
+                if "\n" in text[start:end]:
+                    yield _Span(start, end, None)
+            elif kind == "block":
+                if self._nested_comments and "/*" in text[start + 2 : end]:
+                    raise _Unlexable
+                yield _Span(start, end, self._block_replacement(text, start, end))
+            elif kind == "line":
+                yield _Span(start, end, "")
+            elif kind == "regex":
+                if not self._expression_can_start(text, start):
+                    # A division: rescan from the character after it.
+                    matches = token.finditer(text, start + 1)
+            else:
+                raise _Unlexable
+        if braces:
+            raise _Unlexable
+
+    @staticmethod
+    def _block_replacement(text: str, start: int, end: int) -> str:
+        if "\n" in text[start:end]:
+            return "\n"
+        before = text[start - 1 : start]
+        after = text[end : end + 1]
+        if (before.isalnum() or before == "_") and (after.isalnum() or after == "_"):
+            return " "
+        return ""
+
+    @staticmethod
+    def _expression_can_start(text: str, start: int) -> bool:
+        before = text[max(0, start - 16) : start].rstrip()
+        if not before:
+            return True
+        return (
+            before[-1] in _REGEX_LITERAL_AFTER
+            or _REGEX_LITERAL_AFTER_WORD.search(before) is not None
+        )
+
+
+_SHELL_TOKEN = _token_regex(
+    {
+        "single": r"'[^']*'",
+        "double": r'"[^"\\]*(?:\\[\s\S][^"\\]*)*"',
+        "escape": r"\\[\s\S]",
+        "heredoc": r"""<<(?<!<<<)(?!<)-?[ \t]*(?P<quote>['"]?)[A-Za-z_]\w*(?P=quote)""",
+        # A "#" starting a word.
+        "comment": r"#(?<![^\s;&|()]#)[^\r\n]*",
+        "unclosed": r"""['"]""",
+    }
+)
+_HEREDOC = re.compile(
+    r"""(?<!<)<<(?!<)(?P<strip>-?)[ \t]*(?P<quote>['"]?)(?P<delim>[A-Za-z_]\w*)(?P=quote)"""
+)
+
+
+class ShellMinifier(LexingMinifier):
+    """`#` comments of sh/bash/zsh — a `#` starting a word, so `$#`,
+    `${#var}` and `a#b` stay. Quoted strings and here-document bodies are
+    kept as they are; text with an unmatched quote or a here-document
+    without its closing line is left alone."""
+
+    def _spans(self, text: str) -> Iterator[_Span]:
+        matches = _SHELL_TOKEN.finditer(text)
+        while (match := next(matches, None)) is not None:
+            kind = match.lastgroup
+            start, end = match.span()
+            if kind == "comment":
+                if not _starts_shebang(text, start):
+                    yield _Span(start, end, "")
+            elif kind in ("single", "double"):
+                if "\n" in text[start:end]:
+                    yield _Span(start, end, None)
+            elif kind == "heredoc":
+                end = yield from self._heredoc_bodies(text, start)
+                matches = _SHELL_TOKEN.finditer(text, end)
+            elif kind == "unclosed":
+                raise _Unlexable
+
+    @staticmethod
+    def _heredoc_bodies(text: str, start: int) -> Iterator[_Span]:
+        # The rest of the line is taken as it is; the bodies of every
+        # here-document it opens follow it, in order.
+        line_end = text.find("\n", start)
+        if line_end == -1:
+            raise _Unlexable
+        pos = line_end + 1
+        for heredoc in _HEREDOC.finditer(text, start, line_end):
+            indent = r"\t*" if heredoc.group("strip") else ""
+            closing = re.compile(
+                rf"^{indent}{re.escape(heredoc.group('delim'))}\r?$", re.MULTILINE
+            ).search(text, pos)
+            if closing is None:
+                raise _Unlexable
+            body_end = closing.end()
+            if text.startswith("\n", body_end):
+                body_end += 1
+            yield _Span(pos, body_end, None)
+            pos = body_end
+        return pos
+
+
+PYTHON = PythonMinifier()
+C = CStyleMinifier()
+CPP = CStyleMinifier(extra_strings=[r'R"(?P<delim>[^()\\\s]{0,16})\([\s\S]*?\)(?P=delim)"'])
+NESTING_COMMENTS = CStyleMinifier(nested_comments=True)
+CSHARP = CStyleMinifier(extra_strings=[r'@"(?:[^"]|"")*"'])
+GO = CStyleMinifier(extra_strings=[r"`[^`]*`"])
+RUST = CStyleMinifier(
+    # Raw strings, r"..." and r#"..."# (b-prefixed too), not at the end of a name.
+    extra_strings=[
+        r'br(?<!\wbr)(?P<byte_hashes>#*)"[\s\S]*?"(?P=byte_hashes)',
+        r'r(?<!\wr)(?P<hashes>#*)"[\s\S]*?"(?P=hashes)',
+    ],
+    nested_comments=True,
+)
+JAVASCRIPT = CStyleMinifier(
+    single_quote_strings=True,
+    regex_literals=True,
+    template_literals=True,
+)
+CSS = CStyleMinifier(line_comments=False, single_quote_strings=True)
+SHELL = ShellMinifier()
+
+# JSX/TSX are left out: their markup text isn't lexed, and a "//" in it
+# would be taken for a comment.
+MINIFIERS: dict[str, IContentMinifier] = {
+    **dict.fromkeys((".py", ".pyi", ".pyw"), PYTHON),
+    **dict.fromkeys((".c", ".h"), C),
+    **dict.fromkeys((".cc", ".cpp", ".cxx", ".hh", ".hpp", ".hxx"), CPP),
+    ".java": C,
+    **dict.fromkeys((".kt", ".kts", ".scala", ".swift"), NESTING_COMMENTS),
+    ".cs": CSHARP,
+    ".go": GO,
+    ".rs": RUST,
+    **dict.fromkeys((".js", ".mjs", ".cjs", ".ts", ".mts", ".cts"), JAVASCRIPT),
+    ".css": CSS,
+    **dict.fromkeys((".sh", ".bash", ".zsh"), SHELL),
+}
+
+_SHEBANG = re.compile(r"#![^\n]*?\b(?:(?P<python>python[\d.]*)|(?P<shell>(?:ba|z|da)?sh))\b")
+
+
+def minifier_for(name: str, content: str) -> IContentMinifier | None:
+    """The minifier for a file: by suffix, or for a script without one,
+    by the interpreter its "#!" line names."""
+    minifier = MINIFIERS.get(os.path.splitext(name)[1].lower())
+    if minifier is not None or not content.startswith("#!"):
+        return minifier
+    shebang = _SHEBANG.match(content)
+    if shebang is None:
+        return None
+    return PYTHON if shebang.group("python") else SHELL
+
+
+class ContentMinifier:
+    """Scan event filter that strips comments and collapses whitespace in
+    the content of every file a minifier is known for (see `MINIFIERS`),
+    so fewer tokens go to the model for the same code. Other files pass
+    through untouched, as do files whose text the lexer can't make sense
+    of.
+
+    Counts the files it changed, the UTF-8 bytes of content it looked at
+    and the bytes saved, and the time spent minifying."""
+
+    def __init__(self):
+        self.files = 0
+        self.input_bytes = 0
+        self.saved_bytes = 0
+        self.elapsed = 0.0
+
+    def filter(self, events: Iterable[ScanEvent]) -> Iterator[ScanEvent]:
+        for event in events:
+            if isinstance(event, FileEvent) and event.file.content:
+                event = self._minify(event)
+            yield event
+
+    def _minify(self, event: FileEvent) -> FileEvent:
+        file = event.file
+        minifier = minifier_for(file.name, file.content)
+        if minifier is None:
+            return event
+
+        start = perf_counter()
+        content = minifier.minify(file.content)
+        size = _utf8_size(file.content)
+        self.input_bytes += size
+        if content != file.content:
+            self.files += 1
+            self.saved_bytes += size - _utf8_size(content)
+        self.elapsed += perf_counter() - start
+        if content is file.content:
+            return event
+        return FileEvent(file=FileNode(name=file.name, content=content, size=file.size))
+
+
+def _utf8_size(text: str) -> int:
+    return len(text.encode("utf-8", "surrogatepass"))
@@ -0,0 +1,98 @@
+from collections import deque
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Iterator
+
+from models import FileEvent, ScanEvent
+
+from .file_reader import IFileReader
+from .rule_profiler import RuleProfiler
+from .scanner import BaseScanner, PendingRead
+from .token_budget import TokenBudget
+
+DEFAULT_MAX_IN_FLIGHT_BYTES = 64 * 1024 * 1024
+READS_PER_JOB = 16
+MAX_BUFFERED_EVENTS = 4096
+
+
+class ParallelScanner(BaseScanner):
+    """BaseScanner whose file reads run on a bounded thread pool.
+
+    The walk itself stays on the calling thread, so directory order and
+    rule evaluation are exactly the sequential ones. Every file the walk
+    wants read is submitted to the pool as soon as the walk reaches it,
+    and events are handed out strictly in walk order, each one only after
+    everything before it — so file order is deterministic no matter which
+    read finishes first, and the walk runs ahead of the consumer only as
+    far as the limits below allow.
+
+    The sizes of files read but not yet handed out are capped by
+    `max_in_flight_bytes` (and their number by READS_PER_JOB per thread):
+    when starting another read would exceed the cap, the walk stops and
+    waits for the oldest read instead. Directory events queued up behind
+    a slow read are likewise capped at MAX_BUFFERED_EVENTS. A single file
+    larger than the cap is still read — on its own."""
+
+    def __init__(
+        self,
+        file_reader: IFileReader | None = None,
+        jobs: int = 4,
+        max_in_flight_bytes: int = DEFAULT_MAX_IN_FLIGHT_BYTES,
+        rule_profiler: RuleProfiler | None = None,
+        token_budget: TokenBudget | None = None,
+    ):
+        if jobs < 1:
+            raise ValueError(f"jobs must be at least 1, got {jobs}")
+        super().__init__(file_reader, rule_profiler, token_budget)
+        self._jobs = jobs
+        self._max_in_flight_bytes = max_in_flight_bytes
+        self._max_in_flight_reads = jobs * READS_PER_JOB
+
+    def _resolve(self, items: Iterator[ScanEvent | PendingRead]) -> Iterator[ScanEvent]:
+        buffered: deque[ScanEvent | tuple[Future, int]] = deque()
+        in_flight_bytes = 0
+        in_flight_reads = 0
+
+        def pop() -> ScanEvent:
+            nonlocal in_flight_bytes, in_flight_reads
+            head = buffered.popleft()
+            if isinstance(head, tuple):
+                future, size = head
+                in_flight_bytes -= size
+                in_flight_reads -= 1
+                return FileEvent(file=future.result())
+            return head
+
+        with ThreadPoolExecutor(
+            max_workers=self._jobs, thread_name_prefix="treesnake-read"
+        ) as pool:
+            try:
+                for item in items:
+                    if isinstance(item, PendingRead):
+                        size = item.stat.st_size
+                        while in_flight_reads and (
+                            in_flight_bytes + size > self._max_in_flight_bytes
+                            or in_flight_reads >= self._max_in_flight_reads
+                        ):
+                            yield pop()
+                        future = pool.submit(self._read, item)
+                        buffered.append((future, size))
+                        in_flight_bytes += size
+                        in_flight_reads += 1
+                    else:
+                        buffered.append(item)
+
+                    while buffered and (
+                        len(buffered) > MAX_BUFFERED_EVENTS or self._is_ready(buffered[0])
+                    ):
+                        yield pop()
+
+                while buffered:
+                    yield pop()
+            finally:
+                for head in buffered:
+                    if isinstance(head, tuple):
+                        head[0].cancel()
+
+    @staticmethod
+    def _is_ready(head: ScanEvent | tuple[Future, int]) -> bool:
+        return not isinstance(head, tuple) or head[0].done()
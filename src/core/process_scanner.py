@@ -0,0 +1,158 @@
+import os
+from collections import deque
+from concurrent.futures import Future, ProcessPoolExecutor
+from typing import Iterator, NamedTuple
+
+from models import DirNode, ScanConfig, ScanEvent
+from models.scan_config import CompiledRules
+
+from .events import collect_directory, directory_events
+from .file_reader import IFileReader
+from .scanner import BaseScanner, DirScope, PendingRead
+
+DEFAULT_MIN_ENTRIES = 20_000
+
+
+class _PendingSubtree(NamedTuple):
+    future: Future
+
+
+def _scan_subtree(
+    file_reader: IFileReader,
+    path: str,
+    name: str,
+    rules: CompiledRules,
+    depth: int,
+    scope: DirScope,
+) -> tuple[DirNode, int]:
+    """Worker-process entry point: module-level so it pickles by reference."""
+    scanner = BaseScanner(file_reader)
+    try:
+        directory = collect_directory(
+            scanner._resolve(scanner._walk(path, name, rules, depth, scope))
+        )
+    finally:
+        file_reader.close()
+    return directory, scanner._stat_calls
+
+
+class ProcessScanner(BaseScanner):
+    """BaseScanner that fans whole subtrees out to worker processes.
+
+    The first `split_depth` levels are walked in this process as usual;
+    every directory that would be descended into at that depth is instead
+    scanned by a worker with the same CompiledRules (depth and the
+    inherited ignore stack are passed along, so max_depth still counts
+    from the real root and parent .gitignores still apply). The top levels
+    are walked to the end first so every worker is busy early; each
+    worker then sends back a finished DirNode which is replayed as
+    events at its place in the stream, so output order is the sequential
+    one.
+
+    Spawning processes and pickling subtrees back costs far more than a
+    small scan, so before forking a bounded breadth-first probe counts
+    directory entries (honouring the directory rules and ignore
+    patterns) until `min_entries` is reached, then the subtrees at
+    `split_depth`. Below that, or when there are fewer than two
+    subtrees to hand out, the scan simply runs in-process."""
+
+    def __init__(
+        self,
+        file_reader: IFileReader | None = None,
+        processes: int | None = None,
+        split_depth: int = 1,
+        min_entries: int = DEFAULT_MIN_ENTRIES,
+    ):
+        if processes is not None and processes < 1:
+            raise ValueError(f"processes must be at least 1, got {processes}")
+        if split_depth < 1:
+            raise ValueError(f"split_depth must be at least 1, got {split_depth}")
+        super().__init__(file_reader)
+        self._processes = processes or os.cpu_count() or 1
+        self._split_depth = split_depth
+        self._min_entries = min_entries
+        self._pool: ProcessPoolExecutor | None = None
+
+    def iter_scan(self, path: str, config: ScanConfig) -> Iterator[ScanEvent]:
+        rules = config.compile()
+        if self._processes < 2 or not self._worth_forking(os.path.normpath(path), rules):
+            yield from self._iter_compiled(path, rules)
+            return
+
+        with ProcessPoolExecutor(max_workers=self._processes) as pool:
+            self._pool = pool
+            try:
+                yield from self._iter_compiled(path, rules)
+            finally:
+                self._pool = None
+
+    def _descend(
+        self,
+        entry: os.DirEntry,
+        rules: CompiledRules,
+        depth: int,
+        scope: DirScope,
+    ) -> Iterator[ScanEvent | PendingRead | _PendingSubtree]:
+        if self._pool is None or depth != self._split_depth:
+            return super()._descend(entry, rules, depth, scope)
+        future = self._pool.submit(
+            _scan_subtree,
+            self._file_reader,
+            entry.path,
+            entry.name,
+            rules,
+            depth,
+            scope,
+        )
+        return iter([_PendingSubtree(future)])
+
+    def _resolve(
+        self, items: Iterator[ScanEvent | PendingRead | _PendingSubtree]
+    ) -> Iterator[ScanEvent]:
+        if self._pool is None:
+            yield from super()._resolve(items)
+            return
+
+        # Walking the shallow levels submits every subtree; only then
+        # start waiting on the first one.
+        buffered = deque(items)
+        try:
+            while buffered:
+                item = buffered.popleft()
+                if isinstance(item, _PendingSubtree):
+                    subtree, stat_calls = item.future.result()
+                    self._stat_calls += stat_calls
+                    yield from directory_events(subtree)
+                else:
+                    yield from super()._resolve(iter([item]))
+        finally:
+            for item in buffered:
+                if isinstance(item, _PendingSubtree):
+                    item.future.cancel()
+
+    def _worth_forking(self, path: str, rules: CompiledRules) -> bool:
+        """Whether the tree has `min_entries` entries and at least two
+        directories at `split_depth` to hand out. Once enough entries are
+        seen, only the levels above the split are still listed, to count
+        those directories."""
+        entries = 0
+        subtrees = 0
+        queue: deque[tuple[str, DirScope, int]] = deque([(path, DirScope.root(rules), 0)])
+        while queue:
+            directory, scope, depth = queue.popleft()
+            if entries >= self._min_entries and depth >= self._split_depth:
+                continue
+            try:
+                with os.scandir(directory) as it:
+                    listed = list(it)
+                dirs = [entry for entry in listed if entry.is_dir()]
+            except OSError:
+                continue
+            entries += len(listed)
+            for entry in self._filter_dirs(dirs, rules, scope):
+                if depth + 1 == self._split_depth:
+                    subtrees += 1
+                queue.append((entry.path, scope.child(entry.name, rules), depth + 1))
+            if entries >= self._min_entries and subtrees >= 2:
+                return True
+        return False
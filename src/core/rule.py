@@ -1,13 +1,22 @@
 import fnmatch
+import os
 import re
 from abc import ABC, abstractmethod
 
+# fnmatch.fnmatch compares os.path.normcase'd names; skip the call where
+# that's a no-op (POSIX).
+_NORMCASE_IS_IDENTITY = os.path.normcase("Aa/") == "Aa/"
+
 
 class IRule(ABC):
     @abstractmethod
     def matches(self, name: str) -> bool:
         raise NotImplementedError
 
+    def describe(self) -> str:
+        """The rule as it would be written in a config, for reports."""
+        return repr(self)
+
 
 class ExactRule(IRule):
     """Точное совпадение по имени: .git, node_modules"""
@@ -18,6 +27,9 @@ class ExactRule(IRule):
     def matches(self, name: str) -> bool:
         return self.name == name
 
+    def describe(self) -> str:
+        return self.name
+
 
 class GlobRule(IRule):
     """Шаблон: *.txt, *.exe"""
@@ -28,6 +40,9 @@ class GlobRule(IRule):
     def matches(self, name: str) -> bool:
         return fnmatch.fnmatch(name, self.pattern)
 
+    def describe(self) -> str:
+        return self.pattern
+
 
 class RegexRule(IRule):
     """Регулярное выражение: ^test_.*, .*_temp$"""
@@ -38,13 +53,97 @@ class RegexRule(IRule):
     def matches(self, name: str) -> bool:
         return bool(self.pattern.search(name))
 
+    def describe(self) -> str:
+        return f"re:{self.pattern.pattern}"
+
 
 class RuleSet:
+    """Matches a name against any of its rules without looping over them.
+
+    On construction the rules are compiled by kind: ExactRule names go
+    into a frozenset; the common "*suffix" / "prefix*" globs become tuples
+    for str.endswith/startswith; every other GlobRule (via
+    fnmatch.translate) is merged into one anchored alternation and every
+    RegexRule into one searched alternation. `matches` is therefore a few
+    C-level calls no matter how many patterns there are. A regex that
+    can't be safely embedded in an alternation — one with inline global
+    flags, or with groups whose numbering would shift — and any other
+    IRule implementation are kept aside and checked one by one."""
+
     def __init__(self, rules: list[IRule]):
         self.rules = rules
+        self._exact: frozenset[str] = frozenset()
+        self._suffixes: tuple[str, ...] = ()
+        self._prefixes: tuple[str, ...] = ()
+        self._glob_pattern: re.Pattern | None = None
+        self._regex_pattern: re.Pattern | None = None
+        self._fallback: list[IRule] = []
+        self._compile()
+
+    def _compile(self) -> None:
+        exact: set[str] = set()
+        suffixes: list[str] = []
+        prefixes: list[str] = []
+        globs: list[str] = []
+        regexes: list[str] = []
+        for rule in self.rules:
+            if isinstance(rule, ExactRule):
+                exact.add(rule.name)
+            elif isinstance(rule, GlobRule):
+                pattern = os.path.normcase(rule.pattern)
+                if pattern.startswith("*") and not RuleSet._is_glob(pattern[1:]):
+                    suffixes.append(pattern[1:])
+                elif pattern.endswith("*") and not RuleSet._is_glob(pattern[:-1]):
+                    prefixes.append(pattern[:-1])
+                else:
+                    globs.append(fnmatch.translate(pattern))
+            elif isinstance(rule, RegexRule) and self._is_embeddable(rule.pattern):
+                regexes.append(rule.pattern.pattern)
+            else:
+                self._fallback.append(rule)
+
+        self._exact = frozenset(exact)
+        self._suffixes = tuple(suffixes)
+        self._prefixes = tuple(prefixes)
+        self._glob_pattern = self._alternation(globs)
+        self._regex_pattern = self._alternation(regexes)
+
+    @staticmethod
+    def _is_embeddable(pattern: re.Pattern) -> bool:
+        if pattern.groups or pattern.flags & ~re.UNICODE:
+            return False
+        try:
+            re.compile(f"(?:{pattern.pattern})|")
+        except re.error:
+            return False
+        return True
+
+    @staticmethod
+    def _alternation(parts: list[str]) -> re.Pattern | None:
+        if not parts:
+            return None
+        return re.compile("|".join(f"(?:{part})" for part in parts))
 
     def matches(self, name: str) -> bool:
-        return any(rule.matches(name) for rule in self.rules)
+        if name in self._exact:
+            return True
+        if self._suffixes or self._prefixes or self._glob_pattern is not None:
+            glob_name = name if _NORMCASE_IS_IDENTITY else os.path.normcase(name)
+            if glob_name.endswith(self._suffixes) or glob_name.startswith(self._prefixes):
+                return True
+            if self._glob_pattern is not None and self._glob_pattern.match(glob_name):
+                return True
+        if self._regex_pattern is not None and self._regex_pattern.search(name):
+            return True
+        return any(rule.matches(name) for rule in self._fallback)
+
+    def explain(self, name: str) -> IRule | None:
+        """The first rule, in the order given, that matches `name`. Goes
+        through the rules one by one — meant for diagnostics, not the
+        walk."""
+        if not self.matches(name):
+            return None
+        return next((rule for rule in self.rules if rule.matches(name)), None)
 
     @staticmethod
     def _is_glob(pattern: str) -> bool:
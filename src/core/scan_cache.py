@@ -0,0 +1,188 @@
+import os
+import sqlite3
+import threading
+import time
+from pathlib import Path
+
+from models import FileNode
+
+from .file_reader import FileReader, IFileReader
+
+CACHE_DIR_NAME = ".treesnake"
+CACHE_FILE_NAME = "scan_cache.sqlite3"
+DEFAULT_MAX_BYTES = 256 * 1024 * 1024
+PUTS_PER_COMMIT = 256
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS entries (
+    path TEXT PRIMARY KEY,
+    size INTEGER NOT NULL,
+    mtime_ns INTEGER NOT NULL,
+    inode INTEGER NOT NULL,
+    content TEXT NOT NULL,
+    nbytes INTEGER NOT NULL,
+    last_used INTEGER NOT NULL
+)
+"""
+
+
+class ScanCache:
+    """On-disk store of file contents from previous scans, one sqlite
+    file under the project's `.treesnake/` directory (which `init`
+    already adds to .gitignore).
+
+    An entry is only a hit while the file's (size, mtime_ns, inode) are
+    the ones it was stored with, so any rewrite, truncation or
+    replace-by-rename makes it a miss. Entries carry a last-used stamp
+    and `close` evicts the least recently used ones until the stored
+    content fits in `max_bytes`.
+
+    Safe to share between reader threads. Pickling (for worker
+    processes) drops the connection; each process reopens the same file
+    lazily, and writes are committed in small batches so concurrent
+    writers only wait on each other briefly. The cache is strictly an
+    optimization: a locked or broken database turns lookups into misses
+    and stores into no-ops rather than failing the scan."""
+
+    def __init__(self, path: Path, max_bytes: int = DEFAULT_MAX_BYTES):
+        self._path = path
+        self._max_bytes = max_bytes
+        self._stamp = time.time_ns()
+        self._lock = threading.Lock()
+        self._conn: sqlite3.Connection | None = None
+        self._hits: list[str] = []
+        self._uncommitted = 0
+
+    @classmethod
+    def for_project(cls, project_root: Path, max_bytes: int = DEFAULT_MAX_BYTES) -> "ScanCache":
+        return cls(project_root / CACHE_DIR_NAME / CACHE_FILE_NAME, max_bytes)
+
+    def __getstate__(self) -> dict:
+        state = self.__dict__.copy()
+        state["_lock"] = None
+        state["_conn"] = None
+        state["_hits"] = []
+        state["_uncommitted"] = 0
+        return state
+
+    def __setstate__(self, state: dict) -> None:
+        self.__dict__.update(state)
+        self._lock = threading.Lock()
+
+    def _connect(self) -> sqlite3.Connection:
+        if self._conn is None:
+            self._path.parent.mkdir(parents=True, exist_ok=True)
+            self._conn = sqlite3.connect(self._path, timeout=10, check_same_thread=False)
+            self._conn.execute("PRAGMA journal_mode=WAL")
+            self._conn.execute(_SCHEMA)
+        return self._conn
+
+    def get(self, path: str, stat: os.stat_result) -> str | None:
+        with self._lock:
+            try:
+                row = self._connect().execute(
+                    "SELECT content FROM entries "
+                    "WHERE path = ? AND size = ? AND mtime_ns = ? AND inode = ?",
+                    (path, stat.st_size, stat.st_mtime_ns, stat.st_ino),
+                ).fetchone()
+            except (sqlite3.Error, OSError):
+                return None
+            if row is None:
+                return None
+            self._hits.append(path)
+            return row[0]
+
+    def put(self, path: str, stat: os.stat_result, content: str) -> None:
+        with self._lock:
+            try:
+                conn = self._connect()
+                conn.execute(
+                    "INSERT OR REPLACE INTO entries VALUES (?, ?, ?, ?, ?, ?, ?)",
+                    (
+                        path,
+                        stat.st_size,
+                        stat.st_mtime_ns,
+                        stat.st_ino,
+                        content,
+                        len(content),
+                        self._stamp,
+                    ),
+                )
+                self._uncommitted += 1
+                if self._uncommitted >= PUTS_PER_COMMIT:
+                    conn.commit()
+                    self._uncommitted = 0
+            except (sqlite3.Error, OSError):
+                return
+
+    def close(self) -> None:
+        """Records this run's hits as recently used, evicts down to
+        `max_bytes` and commits."""
+        with self._lock:
+            if self._conn is None:
+                return
+            conn = self._conn
+            try:
+                conn.executemany(
+                    "UPDATE entries SET last_used = ? WHERE path = ?",
+                    ((self._stamp, path) for path in self._hits),
+                )
+                self._evict(conn)
+                conn.commit()
+            except sqlite3.Error:
+                pass
+            finally:
+                conn.close()
+                self._conn = None
+                self._hits.clear()
+                self._uncommitted = 0
+
+    def _evict(self, conn: sqlite3.Connection) -> None:
+        (total,) = conn.execute("SELECT COALESCE(SUM(nbytes), 0) FROM entries").fetchone()
+        if total <= self._max_bytes:
+            return
+        evicted = []
+        for path, nbytes in conn.execute(
+            "SELECT path, nbytes FROM entries ORDER BY last_used, nbytes DESC"
+        ):
+            if total <= self._max_bytes:
+                break
+            evicted.append((path,))
+            total -= nbytes
+        conn.executemany("DELETE FROM entries WHERE path = ?", evicted)
+
+
+class CachedFileReader(IFileReader):
+    """Serves unchanged files from a ScanCache and only opens the ones
+    whose key changed, storing what the wrapped reader returns for them.
+    Unreadable results aren't stored: a permission fix doesn't touch
+    mtime, so it would otherwise never be noticed."""
+
+    def __init__(self, cache: ScanCache, file_reader: IFileReader | None = None):
+        self._cache = cache
+        self._file_reader = file_reader or FileReader()
+
+    def read(self, path: str, stat: os.stat_result | None = None) -> FileNode:
+        key = os.path.abspath(path)
+        if stat is None:
+            stat = os.stat(path)
+
+        content = self._cache.get(key, stat)
+        if content is not None:
+            return FileNode(name=os.path.basename(path), content=content, size=stat.st_size)
+
+        file = self._file_reader.read(path, stat)
+        if file.content != FileReader.CONTENT_UNREADABLE:
+            self._cache.put(key, stat, file.content)
+        return file
+
+    def read_truncated(
+        self, path: str, stat: os.stat_result | None, head_lines: int, tail_lines: int
+    ) -> FileNode:
+        # Cached entries are always whole files; truncated reads are cheap
+        # by construction and go straight to the wrapped reader.
+        return self._file_reader.read_truncated(path, stat, head_lines, tail_lines)
+
+    def close(self) -> None:
+        self._file_reader.close()
+        self._cache.close()
@@ -1,10 +1,30 @@
 import os
 from abc import ABC, abstractmethod
+from time import perf_counter
+from typing import TYPE_CHECKING, Iterator, NamedTuple
 
-from models import Directory, File, ScanConfig, ScanResult, ScanTimer
+from models import (
+    DirNode,
+    EnterDirEvent,
+    ExitDirEvent,
+    FileEvent,
+    FileNode,
+    ScanConfig,
+    ScanEvent,
+    ScanResult,
+    ScanStats,
+    ScanTimer,
+)
 from models.scan_config import CompiledRules
 
+from .events import collect_directory
 from .file_reader import FileReader, IFileReader
+from .ignore_spec import GitignoreSpec, IgnoreStack
+from .include_paths import IncludeState
+from .rule_profiler import RuleProfiler
+
+if TYPE_CHECKING:
+    from .token_budget import TokenBudget
 
 CONTENT_EXCLUDED = ""
 
@@ -13,94 +33,327 @@ def _too_large_placeholder(size: int) -> str:
     return f"[File too large: {size} bytes]"
 
 
+class ScanError(Exception):
+    """Raised by `track_scan` in place of whatever the scanner raised, so
+    code that streams events into a formatter can tell a failed scan
+    from a failed format or write. The original is the `__cause__`."""
+
+
+def track_scan(events: Iterator[ScanEvent], stats: ScanStats) -> Iterator[ScanEvent]:
+    """Passes a scan's events through, counting files and directories
+    (the root excluded, as in ScanResult) and adding the time spent
+    producing them — the scan's share of a streamed run — to
+    `stats.elapsed`."""
+    depth = 0
+    while True:
+        start = perf_counter()
+        try:
+            event = next(events)
+        except StopIteration:
+            stats.elapsed += perf_counter() - start
+            return
+        except Exception as exc:
+            raise ScanError(exc) from exc
+        stats.elapsed += perf_counter() - start
+
+        if isinstance(event, FileEvent):
+            stats.file_count += 1
+        elif isinstance(event, EnterDirEvent):
+            if depth:
+                stats.dir_count += 1
+            depth += 1
+        else:
+            depth -= 1
+        yield event
+
+
+class DirScope(NamedTuple):
+    """What a directory inherits from the ones above it during the walk:
+    its path relative to the scan root ("/"-separated, "" for the root),
+    the ignore specs in effect, and the include_paths state (None when
+    there are no include paths)."""
+
+    rel: str = ""
+    ignores: IgnoreStack = IgnoreStack()
+    includes: IncludeState | None = None
+
+    @classmethod
+    def root(cls, rules: CompiledRules) -> "DirScope":
+        return cls(
+            ignores=IgnoreStack().push(rules.ignore),
+            includes=rules.include_paths.root if rules.include_paths else None,
+        )
+
+    def path_of(self, name: str) -> str:
+        return f"{self.rel}/{name}" if self.rel else name
+
+    def child(self, name: str, rules: CompiledRules) -> "DirScope":
+        includes = self.includes
+        if includes is not None:
+            includes = rules.include_paths.step(includes, name)
+        return DirScope(self.path_of(name), self.ignores, includes)
+
+
+class PendingRead(NamedTuple):
+    """A file the walk decided to read, yielded in place of its FileEvent.
+    Scanners turn it into the real event in `_resolve` — which is where
+    subclasses hook in to read ahead or elsewhere. `truncate_lines` is
+    the (head, tail) to keep of a file over max_file_size."""
+
+    path: str
+    stat: os.stat_result
+    truncate_lines: tuple[int, int] | None = None
+
+
 class IScanner(ABC):
+    @abstractmethod
+    def iter_scan(self, path: str, config: ScanConfig) -> Iterator[ScanEvent]:
+        """Yields the tree as EnterDir/File/ExitDir events in output order
+        (a directory's files, then its subdirectories), reading each file
+        only when its event is due."""
+        raise NotImplementedError
+
     @abstractmethod
     def scan(self, path: str, config: ScanConfig) -> ScanResult:
         raise NotImplementedError
 
 
 class BaseScanner(IScanner):
-    def __init__(self, file_reader: IFileReader | None = None):
+    """Recursive walker built on `os.scandir`.
+
+    Entries are told apart by their `DirEntry` d_type, without a stat.
+    `ScanResult.stat_calls` counts the stats made: one per kept file,
+    cached on the entry and handed on to the reader for the size, plus
+    one per symlink.
+
+    `iter_scan` is the primitive; `scan` only collects its events into a
+    Directory tree. With a RuleProfiler, every scan's rules are
+    instrumented by it; with a TokenBudget, only the files it selects
+    are read."""
+
+    def __init__(
+        self,
+        file_reader: IFileReader | None = None,
+        rule_profiler: RuleProfiler | None = None,
+        token_budget: "TokenBudget | None" = None,
+    ):
         self._file_reader = file_reader or FileReader()
+        self._rule_profiler = rule_profiler
+        self._token_budget = token_budget
+        self._stat_calls = 0
+
+    @property
+    def stat_calls(self) -> int:
+        """Stat calls made by the most recent scan."""
+        return self._stat_calls
 
     def scan(self, path: str, config: ScanConfig) -> ScanResult:
         timer = ScanTimer()
-        rules = config.compile()
-        directory = self._scan_recursive(os.path.normpath(path), rules)
+        root = collect_directory(self.iter_scan(path, config))
+        directory = root.to_model()
         elapsed = timer.stop()
-        file_count, dir_count = self._count(directory)
+        file_count, dir_count = self._count(root)
         return ScanResult(
             directory=directory,
             elapsed=elapsed,
             file_count=file_count,
             dir_count=dir_count,
+            stat_calls=self._stat_calls,
         )
 
-    def _scan_recursive(self, path: str, rules: CompiledRules, depth: int = 0) -> Directory:
-        name = os.path.basename(path)
+    def iter_scan(self, path: str, config: ScanConfig) -> Iterator[ScanEvent]:
+        yield from self._iter_compiled(path, config.compile())
+
+    def _iter_compiled(self, path: str, rules: CompiledRules) -> Iterator[ScanEvent]:
+        """`iter_scan` with the config already compiled."""
+        if self._rule_profiler is not None:
+            rules = self._rule_profiler.instrument(rules)
+        self._stat_calls = 0
+        path = os.path.normpath(path)
+        items = self._walk(path, os.path.basename(path), rules)
+        if self._token_budget is None:
+            yield from self._resolve(items)
+            return
+        events = self._resolve(self._token_budget.select(items))
+        yield from self._token_budget.enforce(events)
+
+    def _resolve(self, items: Iterator[ScanEvent | PendingRead]) -> Iterator[ScanEvent]:
+        for item in items:
+            if isinstance(item, PendingRead):
+                yield FileEvent(file=self._read(item))
+            else:
+                yield item
 
+    def _read(self, item: PendingRead) -> FileNode:
+        if item.truncate_lines is None:
+            return self._file_reader.read(item.path, item.stat)
+        head_lines, tail_lines = item.truncate_lines
+        return self._file_reader.read_truncated(item.path, item.stat, head_lines, tail_lines)
+
+    def _walk(
+        self,
+        path: str,
+        name: str,
+        rules: CompiledRules,
+        depth: int = 0,
+        scope: DirScope | None = None,
+    ) -> Iterator[ScanEvent | PendingRead]:
+        if scope is None:
+            scope = DirScope.root(rules)
         if rules.max_depth is not None and depth > rules.max_depth:
-            return Directory(name=name, files=[], subdirectories=[])
+            yield from self._empty_dir(name)
+            return
 
         try:
-            items = os.listdir(path)
+            entries = self._list_dir(path, scope.rel)
         except PermissionError:
-            return Directory(name=name, files=[], subdirectories=[])
+            yield from self._empty_dir(name)
+            return
+
+        file_entries, dir_entries = self._classify(entries)
+        if rules.ignore_files:
+            scope = self._push_ignore_files(scope, file_entries, rules)
+        file_entries = self._filter_files(file_entries, rules, scope)
+        dir_entries = self._filter_dirs(dir_entries, rules, scope)
 
-        return Directory(
-            name=name,
-            files=self._collect_files(path, items, rules),
-            subdirectories=self._collect_dirs(path, items, rules, depth),
+        yield EnterDirEvent(
+            name=name, file_count=len(file_entries), dir_count=len(dir_entries)
         )
+        for entry in file_entries:
+            yield self._file_item(entry, rules)
+        for entry in dir_entries:
+            if rules.exclude_content_dirs.matches(entry.name):
+                yield from self._empty_dir(entry.name)
+            else:
+                yield from self._descend(
+                    entry, rules, depth + 1, scope.child(entry.name, rules)
+                )
+        yield ExitDirEvent(name=name)
 
-    def _collect_files(
-        self, path: str, items: list[str], rules: CompiledRules
-    ) -> list[File]:
-        files = []
-        for item in items:
-            item_path = os.path.join(path, item)
-            if not os.path.isfile(item_path):
-                continue
-            if rules.exclude_files.matches(item):
-                continue
-            if rules.include_files.rules and not rules.include_files.matches(item):
+    def _descend(
+        self, entry: os.DirEntry, rules: CompiledRules, depth: int, scope: DirScope
+    ) -> Iterator[ScanEvent | PendingRead]:
+        return self._walk(entry.path, entry.name, rules, depth, scope)
+
+    def _list_dir(self, path: str, rel: str) -> list[os.DirEntry]:
+        with os.scandir(path) as it:
+            return list(it)
+
+    @staticmethod
+    def _push_ignore_files(
+        scope: DirScope, file_entries: list[os.DirEntry], rules: CompiledRules
+    ) -> DirScope:
+        # Found among the entries already listed, so a directory without
+        # ignore files costs no extra syscall.
+        by_name = {entry.name: entry for entry in file_entries}
+        ignores = scope.ignores
+        for ignore_file in rules.ignore_files:
+            entry = by_name.get(ignore_file)
+            if entry is not None:
+                ignores = ignores.push(GitignoreSpec.from_file(entry.path, base=scope.rel))
+        return scope._replace(ignores=ignores)
+
+    @staticmethod
+    def _empty_dir(name: str) -> Iterator[ScanEvent]:
+        yield EnterDirEvent(name=name, file_count=0, dir_count=0)
+        yield ExitDirEvent(name=name)
+
+    def _classify(
+        self, entries: list[os.DirEntry]
+    ) -> tuple[list[os.DirEntry], list[os.DirEntry]]:
+        files: list[os.DirEntry] = []
+        dirs: list[os.DirEntry] = []
+        for entry in entries:
+            if entry.is_symlink():
+                self._stat_calls += 1
+            try:
+                if entry.is_file():
+                    files.append(entry)
+                elif entry.is_dir():
+                    dirs.append(entry)
+            except OSError:
                 continue
+        return files, dirs
 
-            size = os.path.getsize(item_path)
+    def _stat(self, entry: os.DirEntry) -> os.stat_result:
+        # Symlinks were already stat'ed (and cached on the entry) while
+        # classifying, so only plain files cost a call here.
+        if not entry.is_symlink():
+            self._stat_calls += 1
+        return entry.stat()
 
-            if rules.exclude_content_files.matches(item):
-                files.append(File(name=item, content=CONTENT_EXCLUDED, size=size))
-            elif rules.max_file_size is not None and size > rules.max_file_size:
-                files.append(
-                    File(name=item, content=_too_large_placeholder(size), size=size)
-                )
-            else:
-                files.append(self._file_reader.read(item_path))
-        return files
+    def _filter_files(
+        self,
+        entries: list[os.DirEntry],
+        rules: CompiledRules,
+        scope: DirScope | None = None,
+    ) -> list[os.DirEntry]:
+        scope = scope or DirScope()
+        kept = []
+        for entry in entries:
+            if rules.exclude_files.matches(entry.name):
+                continue
+            if scope.ignores and scope.ignores.ignores(scope.path_of(entry.name), False):
+                continue
+            if rules.include_files.rules and not rules.include_files.matches(entry.name):
+                continue
+            if scope.includes is not None and not rules.include_paths.accepts(
+                rules.include_paths.step(scope.includes, entry.name)
+            ):
+                continue
+            kept.append(entry)
+        return kept
 
-    def _collect_dirs(
-        self, path: str, items: list[str], rules: CompiledRules, depth: int
-    ) -> list[Directory]:
-        subdirectories = []
-        for item in items:
-            item_path = os.path.join(path, item)
-            if not os.path.isdir(item_path):
+    def _filter_dirs(
+        self,
+        entries: list[os.DirEntry],
+        rules: CompiledRules,
+        scope: DirScope | None = None,
+    ) -> list[os.DirEntry]:
+        # An ignored directory, or one no include path can lead into, is
+        # dropped here, before it's ever listed: nothing below it can be
+        # re-included (see GitignoreSpec, PathIncludes).
+        scope = scope or DirScope()
+        kept = []
+        for entry in entries:
+            if rules.exclude_dirs.matches(entry.name):
                 continue
-            if rules.exclude_dirs.matches(item):
+            if scope.ignores and scope.ignores.ignores(scope.path_of(entry.name), True):
                 continue
-            if rules.include_dirs.rules and not rules.include_dirs.matches(item):
+            if rules.include_dirs.rules and not rules.include_dirs.matches(entry.name):
                 continue
-            if rules.exclude_content_dirs.matches(item):
-                subdirectories.append(Directory(name=item, files=[], subdirectories=[]))
-            else:
-                subdirectories.append(self._scan_recursive(item_path, rules, depth + 1))
-        return subdirectories
+            if scope.includes is not None and not rules.include_paths.step(
+                scope.includes, entry.name
+            ):
+                continue
+            kept.append(entry)
+        return kept
+
+    def _file_item(self, entry: os.DirEntry, rules: CompiledRules) -> FileEvent | PendingRead:
+        stat = self._stat(entry)
+        size = stat.st_size
+
+        if rules.exclude_content_files.matches(entry.name):
+            return FileEvent(
+                file=FileNode(name=entry.name, content=CONTENT_EXCLUDED, size=size)
+            )
+        if rules.max_file_size is not None and size > rules.max_file_size:
+            if rules.truncate_lines is not None:
+                return PendingRead(
+                    path=entry.path, stat=stat, truncate_lines=rules.truncate_lines
+                )
+            return FileEvent(
+                file=FileNode(
+                    name=entry.name, content=_too_large_placeholder(size), size=size
+                )
+            )
+        return PendingRead(path=entry.path, stat=stat)
 
-    def _count(self, directory: Directory) -> tuple[int, int]:
+    def _count(self, directory: DirNode) -> tuple[int, int]:
         file_count = len(directory.files)
         dir_count = len(directory.subdirectories)
         for subdir in directory.subdirectories:
             f, d = self._count(subdir)
             file_count += f
             dir_count += d
-        return file_count, dir_count
\ No newline at end of file
+        return file_count, dir_count
@@ -0,0 +1,237 @@
+import math
+import os
+from abc import ABC, abstractmethod
+from collections import deque
+from typing import Iterable, Iterator, NamedTuple
+
+from models import EnterDirEvent, ExitDirEvent, FileEvent, FileNode, ScanEvent
+
+from .include_paths import PathIncludes
+from .scanner import PendingRead
+
+# Separators and tree indentation each entry costs in the output, on top
+# of its path.
+STRUCTURE_TOKENS_PER_ENTRY = 4
+
+
+def _omitted_placeholder(size: int) -> str:
+    return f"[Omitted: over token budget, {size} bytes]"
+
+
+class ITokenEstimator(ABC):
+    """Counts tokens offline. `estimate_size` bounds the count for a file
+    of `size` bytes before it's read, so files can be picked without
+    reading them; it should not undercount, or picked files get cut
+    after being read."""
+
+    @abstractmethod
+    def count(self, text: str) -> int:
+        raise NotImplementedError
+
+    @abstractmethod
+    def estimate_size(self, size: int) -> int:
+        raise NotImplementedError
+
+
+class CharRatioEstimator(ITokenEstimator):
+    """Characters / `chars_per_token`, rounded up — about 4 for English
+    text and code with common BPE tokenizers. Decoded UTF-8 never has
+    more characters than the file has bytes, so the size estimate is an
+    upper bound of the count."""
+
+    def __init__(self, chars_per_token: float = 4.0):
+        if chars_per_token <= 0:
+            raise ValueError(f"chars_per_token must be positive, got {chars_per_token}")
+        self._chars_per_token = chars_per_token
+
+    def count(self, text: str) -> int:
+        return math.ceil(len(text) / self._chars_per_token)
+
+    def estimate_size(self, size: int) -> int:
+        return math.ceil(size / self._chars_per_token)
+
+
+class BudgetCandidate(NamedTuple):
+    """A file the walk wants read, as the priority sees it: `path` is
+    relative to the scan root ("/"-separated), `order` its position in
+    the walk."""
+
+    path: str
+    size: int
+    depth: int
+    order: int
+
+
+class IBudgetPriority(ABC):
+    @abstractmethod
+    def key(self, candidate: BudgetCandidate) -> tuple:
+        """Sort key: files with smaller keys get content first."""
+        raise NotImplementedError
+
+
+class WalkOrderPriority(IBudgetPriority):
+    def key(self, candidate: BudgetCandidate) -> tuple:
+        return (candidate.order,)
+
+
+class SmallestFirstPriority(IBudgetPriority):
+    """Fits the most files into the budget."""
+
+    def key(self, candidate: BudgetCandidate) -> tuple:
+        return candidate.size, candidate.order
+
+
+class DepthPriority(IBudgetPriority):
+    """Top-level files (README, configs, entry points) before nested ones."""
+
+    def key(self, candidate: BudgetCandidate) -> tuple:
+        return candidate.depth, candidate.order
+
+
+class PathPatternPriority(IBudgetPriority):
+    """Files matching the first pattern, then the second, ..., then the
+    rest; each group in walk order. Patterns are path globs as for
+    include_paths ("src/core/**", "**/*.md")."""
+
+    def __init__(self, patterns: list[str]):
+        self._matchers = [PathIncludes([pattern]) for pattern in patterns]
+
+    def key(self, candidate: BudgetCandidate) -> tuple:
+        for rank, matcher in enumerate(self._matchers):
+            state = matcher.root
+            for name in candidate.path.split("/"):
+                state = matcher.step(state, name)
+                if not state:
+                    break
+            if state and matcher.accepts(state):
+                return rank, candidate.order
+        return len(self._matchers), candidate.order
+
+
+class TokenBudget:
+    """Caps a scan's output at about `max_tokens` while still emitting the
+    whole tree: files that don't fit keep their entry, with a placeholder
+    instead of their content, and are never read.
+
+    `select` sits between the walk and the reads. It holds back the
+    walk's items — directory events and not-yet-read files, so nothing
+    big — until the walk is done, reserves the structure's share of the
+    budget (every path plus STRUCTURE_TOKENS_PER_ENTRY, and a placeholder
+    for every file), and then hands out the rest to files in `priority`
+    order by their size estimate.
+    Files that don't fit are skipped rather than ending the selection,
+    so a smaller one further down the order can still take the space.
+    `enforce` then counts the content actually read and cuts any file
+    that would push the total over the budget — which only happens with
+    an estimator whose size estimate can undercount."""
+
+    def __init__(
+        self,
+        max_tokens: int,
+        estimator: ITokenEstimator | None = None,
+        priority: IBudgetPriority | None = None,
+    ):
+        if max_tokens < 0:
+            raise ValueError(f"max_tokens must not be negative, got {max_tokens}")
+        self.max_tokens = max_tokens
+        self._estimator = estimator or CharRatioEstimator()
+        self._priority = priority or SmallestFirstPriority()
+        self._content_budget = 0
+        # One flag per file, in walk order: whether its content was read
+        # (and so still has to be counted by `enforce`).
+        self._read_flags: deque[bool] = deque()
+        self.used_tokens = 0
+        self.omitted = 0
+
+    def select(
+        self, items: Iterable[ScanEvent | PendingRead]
+    ) -> Iterator[ScanEvent | PendingRead]:
+        self.omitted = 0
+        self._read_flags.clear()
+        buffered: list[ScanEvent | PendingRead] = []
+        candidates: list[BudgetCandidate] = []
+        names: list[str] = []
+        structure = 0
+        for item in items:
+            buffered.append(item)
+            if isinstance(item, EnterDirEvent):
+                names.append(item.name)
+                structure += self._entry_tokens("/".join(names))
+            elif isinstance(item, ExitDirEvent):
+                names.pop()
+            elif isinstance(item, PendingRead):
+                path = "/".join([*names[1:], os.path.basename(item.path)])
+                size = item.stat.st_size
+                structure += self._entry_tokens(path) + self._placeholder_tokens(size)
+                candidates.append(
+                    BudgetCandidate(
+                        path=path, size=size, depth=len(names) - 1, order=len(candidates)
+                    )
+                )
+            elif isinstance(item, FileEvent):
+                structure += self._entry_tokens("/".join([*names[1:], item.file.name]))
+                structure += self._estimator.count(item.file.content)
+
+        # Reading a file swaps its (already reserved) placeholder for its
+        # content, so only the difference is spent.
+        self._content_budget = max(self.max_tokens - structure, 0)
+        remaining = self._content_budget
+        selected: set[int] = set()
+        for candidate in sorted(candidates, key=self._priority.key):
+            cost = self._estimator.estimate_size(candidate.size)
+            cost -= self._placeholder_tokens(candidate.size)
+            if cost <= remaining:
+                remaining -= max(cost, 0)
+                selected.add(candidate.order)
+
+        self.used_tokens = structure
+        order = 0
+        for item in buffered:
+            if isinstance(item, PendingRead):
+                read = order in selected
+                if not read:
+                    item = self._omit(item)
+                self._read_flags.append(read)
+                order += 1
+            elif isinstance(item, FileEvent):
+                self._read_flags.append(False)
+            yield item
+
+    def enforce(self, events: Iterable[ScanEvent]) -> Iterator[ScanEvent]:
+        # `select` runs lazily, inside the first pull on `events`, so
+        # `_content_budget` is only known once events arrive.
+        for event in events:
+            if isinstance(event, FileEvent) and self._read_flags.popleft():
+                size = event.file.size
+                tokens = self._estimator.count(event.file.content)
+                tokens -= self._placeholder_tokens(size)
+                if tokens > self._content_budget:
+                    self.omitted += 1
+                    event = FileEvent(
+                        file=FileNode(
+                            name=event.file.name,
+                            content=_omitted_placeholder(size),
+                            size=size,
+                        )
+                    )
+                else:
+                    self._content_budget -= max(tokens, 0)
+                    self.used_tokens += tokens
+            yield event
+
+    def _omit(self, item: PendingRead) -> FileEvent:
+        self.omitted += 1
+        size = item.stat.st_size
+        return FileEvent(
+            file=FileNode(
+                name=os.path.basename(item.path),
+                content=_omitted_placeholder(size),
+                size=size,
+            )
+        )
+
+    def _entry_tokens(self, path: str) -> int:
+        return self._estimator.count(path) + STRUCTURE_TOKENS_PER_ENTRY
+
+    def _placeholder_tokens(self, size: int) -> int:
+        return self._estimator.count(_omitted_placeholder(size))
@@ -1,4 +1,9 @@
+from multiprocessing import freeze_support
+
 from cli.app import app
 
 if __name__ == "__main__":
+    # Needed by the PyInstaller binary for `scan --processes`: spawned
+    # workers re-run this entry point and must not start the CLI again.
+    freeze_support()
     app()
@@ -1,7 +1,23 @@
 from .directory import Directory
 from .file import File
+from .node import DirNode, FileNode
 from .scan_config import ScanConfig
-from .scan_result import ScanResult, ScanTimer
+from .scan_event import EnterDirEvent, ExitDirEvent, FileEvent, ScanEvent
+from .scan_result import ScanResult, ScanStats, ScanTimer
 from .scan_template import ScanTemplate
 
-__all__ = ["File", "ScanConfig", "Directory", "ScanTemplate", "ScanResult", "ScanTimer"]
+__all__ = [
+    "File",
+    "ScanConfig",
+    "Directory",
+    "ScanTemplate",
+    "ScanResult",
+    "ScanStats",
+    "ScanTimer",
+    "ScanEvent",
+    "EnterDirEvent",
+    "FileEvent",
+    "ExitDirEvent",
+    "FileNode",
+    "DirNode",
+]
@@ -0,0 +1,36 @@
+from dataclasses import dataclass, field
+
+from .directory import Directory
+from .file import File
+
+
+@dataclass(slots=True)
+class FileNode:
+    """Internal counterpart of File: same fields, no validation and no
+    per-instance __dict__. Scanners, readers and formatters pass these
+    around; File only appears where a tree leaves the package."""
+
+    name: str
+    content: str
+    size: int
+
+    def to_model(self) -> File:
+        return File.model_construct(name=self.name, content=self.content, size=self.size)
+
+
+@dataclass(slots=True)
+class DirNode:
+    """Internal counterpart of Directory, see FileNode."""
+
+    name: str
+    files: list[FileNode] = field(default_factory=list)
+    subdirectories: list["DirNode"] = field(default_factory=list)
+
+    def to_model(self) -> Directory:
+        # Every field was produced by the scanner with the right type
+        # already, so model_construct skips re-validating the whole tree.
+        return Directory.model_construct(
+            name=self.name,
+            files=[f.to_model() for f in self.files],
+            subdirectories=[d.to_model() for d in self.subdirectories],
+        )
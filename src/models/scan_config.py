@@ -1,6 +1,8 @@
-from typing import List, NamedTuple, Optional
-from pydantic import BaseModel, ConfigDict
+from typing import List, NamedTuple, Optional, Tuple
+from pydantic import BaseModel, ConfigDict, PrivateAttr
 
+from core.ignore_spec import GitignoreSpec
+from core.include_paths import PathIncludes
 from core.rule import RuleSet
 
 
@@ -11,8 +13,12 @@ class CompiledRules(NamedTuple):
     exclude_content_files: "RuleSet"
     include_dirs: "RuleSet"
     include_files: "RuleSet"
+    include_paths: Optional["PathIncludes"]
     max_depth: Optional[int]
     max_file_size: Optional[int]
+    truncate_lines: Optional[Tuple[int, int]]
+    ignore: Optional["GitignoreSpec"]
+    ignore_files: Tuple[str, ...]
 
 
 class ScanConfig(BaseModel):
@@ -22,11 +28,35 @@ class ScanConfig(BaseModel):
     exclude_content_files: List[str] = []
     include_dirs: List[str] = []
     include_files: List[str] = []
+    # Path globs relative to the scan root ("src/core/**"); directories
+    # that can't lead to a match are never entered.
+    include_paths: List[str] = []
     max_depth: Optional[int] = None
     max_file_size: Optional[int] = None
+    head_lines: Optional[int] = None
+    tail_lines: Optional[int] = None
+    # gitignore-syntax lines, matched against paths relative to the scan
+    # root (see GitignoreSpec) — unlike the name-only patterns above.
+    ignore_patterns: List[str] = []
+    # Names of gitignore-syntax files (".gitignore", ...) picked up in
+    # every directory of the walk and applied to everything below it.
+    ignore_files: List[str] = []
 
     model_config = ConfigDict(from_attributes=True)
 
+    # The scan root's path relative to the directory ignore_patterns are
+    # anchored at, when that is above it (see with_ignore_patterns_root).
+    # Private, so it is never read from or written to a config file.
+    _ignore_patterns_root: str = PrivateAttr(default="")
+
+    def with_ignore_patterns_root(self, root: str) -> "ScanConfig":
+        """A copy whose ignore_patterns are anchored above the scan root,
+        `root` being the scan root's path from there ("app" for a
+        .treesnakeignore found in its parent)."""
+        config = self.model_copy()
+        config._ignore_patterns_root = root
+        return config
+
     def compile(self) -> "CompiledRules":
         
         return CompiledRules(
@@ -36,6 +66,26 @@ class ScanConfig(BaseModel):
             exclude_content_files=RuleSet.from_patterns(self.exclude_content_files),
             include_dirs=RuleSet.from_patterns(self.include_dirs),
             include_files=RuleSet.from_patterns(self.include_files),
+            include_paths=PathIncludes(self.include_paths) if self.include_paths else None,
             max_depth=self.max_depth,
             max_file_size=self.max_file_size,
-        )
\ No newline at end of file
+            truncate_lines=self._truncate_lines(),
+            ignore=self._ignore_spec(),
+            ignore_files=tuple(self.ignore_files),
+        )
+
+    def _ignore_spec(self) -> Optional[GitignoreSpec]:
+        if not self.ignore_patterns:
+            return None
+        return GitignoreSpec(
+            self.ignore_patterns,
+            source="ignore_patterns",
+            root=self._ignore_patterns_root,
+        )
+
+    def _truncate_lines(self) -> Optional[Tuple[int, int]]:
+        """(head, tail) line counts kept of files over max_file_size, or
+        None when neither is set and those files get a placeholder."""
+        if self.head_lines is None and self.tail_lines is None:
+            return None
+        return self.head_lines or 0, self.tail_lines or 0
\ No newline at end of file
@@ -0,0 +1,27 @@
+from dataclasses import dataclass
+
+from .node import FileNode
+
+
+@dataclass(slots=True)
+class EnterDirEvent:
+    """A directory starts. The counts are how many FileEvents and nested
+    directories follow before the matching ExitDirEvent, so consumers
+    can tell which child is the last one without buffering."""
+
+    name: str
+    file_count: int
+    dir_count: int
+
+
+@dataclass(slots=True)
+class FileEvent:
+    file: FileNode
+
+
+@dataclass(slots=True)
+class ExitDirEvent:
+    name: str
+
+
+ScanEvent = EnterDirEvent | FileEvent | ExitDirEvent
@@ -10,6 +10,17 @@ class ScanResult:
     elapsed: float
     file_count: int
     dir_count: int
+    stat_calls: int = 0
+
+
+@dataclass
+class ScanStats:
+    """Counters for a streamed scan, where no ScanResult is built."""
+
+    elapsed: float = 0.0
+    file_count: int = 0
+    dir_count: int = 0
+    stat_calls: int = 0
 
 
 @dataclass
@@ -1,13 +1,55 @@
-from typing import Literal
+from typing import Literal, NamedTuple, get_args
 
-from pydantic import BaseModel
+from pydantic import BaseModel, field_validator
 
 from .scan_config import ScanConfig
 
+Mode = Literal["default", "llm", "json", "ndjson"]
+Output = Literal["stdout", "clipboard", "file"]
+
+
+class OutputSpec(NamedTuple):
+    mode: str
+    output: str
+    out_file: str | None = None
+
+    @classmethod
+    def parse(cls, spec: str) -> "OutputSpec":
+        """"llm:clipboard", "json:file:scan.json" — MODE:OUTPUT[:OUT_FILE].
+        The file path may itself contain ":"."""
+        parts = spec.split(":", 2)
+        if len(parts) < 2:
+            raise ValueError(f"output {spec!r} is not MODE:OUTPUT[:OUT_FILE]")
+        mode, output = parts[0].strip(), parts[1].strip()
+        out_file = parts[2].strip() if len(parts) == 3 else None
+        if mode not in get_args(Mode):
+            raise ValueError(f"output {spec!r}: unknown mode {mode!r}")
+        if output not in get_args(Output):
+            raise ValueError(f"output {spec!r}: unknown output {output!r}")
+        if output == "file" and not out_file:
+            raise ValueError(f"output {spec!r}: file output needs a path")
+        return cls(mode, output, out_file or None)
+
 
 class ScanTemplate(BaseModel):
     config: ScanConfig
-    mode: Literal["default", "llm", "json"] = "default"
-    output: Literal["stdout", "clipboard", "file"] = "stdout"
+    mode: Mode = "default"
+    output: Output = "stdout"
     out_file: str | None = None
-    use_gitignore: bool = True
\ No newline at end of file
+    # Several MODE:OUTPUT[:OUT_FILE] targets written from one scan; when
+    # set, mode/output/out_file are not used.
+    outputs: list[str] = []
+    use_gitignore: bool = True
+    use_cache: bool = False
+
+    @field_validator("outputs")
+    @classmethod
+    def _check_outputs(cls, outputs: list[str]) -> list[str]:
+        for spec in outputs:
+            OutputSpec.parse(spec)
+        return outputs
+
+    def output_specs(self) -> list[OutputSpec]:
+        if self.outputs:
+            return [OutputSpec.parse(spec) for spec in self.outputs]
+        return [OutputSpec(self.mode, self.output, self.out_file)]
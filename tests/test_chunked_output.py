@@ -0,0 +1,143 @@
+import pytest
+
+from core.chunked_output import ChunkedOutput, _part_header, part_path
+from core.events import directory_events
+from core.formatter import LLMFormatter
+from core.token_budget import CharRatioEstimator
+from models import Directory, File
+
+HEADER_SIZE = len(_part_header(1))
+
+
+def _directory(*sizes):
+    return Directory(
+        name="root",
+        files=[
+            File(name=f"f{i}.txt", content="x" * size, size=size)
+            for i, size in enumerate(sizes)
+        ],
+        subdirectories=[],
+    )
+
+
+def _read(paths):
+    return [open(path, encoding="utf-8").read() for path in paths]
+
+
+def _body(part):
+    return part.split("\n", 1)[1]
+
+
+class TestPartPath:
+    def test_inserts_part_number_before_suffix(self):
+        assert part_path("out/scan.txt", 3) == "out/scan.part3.txt"
+        assert part_path("scan", 1) == "scan.part1"
+
+
+class TestChunkedOutput:
+    def test_parts_concatenate_to_the_full_output(self, tmp_path):
+        directory = _directory(50, 50, 50, 50)
+        out = tmp_path / "scan.txt"
+
+        paths = ChunkedOutput(LLMFormatter(), str(out), 150).write(
+            directory_events(directory)
+        )
+
+        parts = _read(paths)
+        assert len(parts) > 1
+        assert "".join(_body(part) for part in parts) == LLMFormatter().format(directory)
+
+    def test_parts_stay_within_the_limit_and_keep_files_whole(self, tmp_path):
+        paths = ChunkedOutput(LLMFormatter(), str(tmp_path / "scan.txt"), 150).write(
+            directory_events(_directory(50, 50, 50, 50))
+        )
+
+        for part in _read(paths):
+            assert len(part.encode("utf-8")) <= 150
+            body = _body(part)
+            assert body.startswith("# root/")
+            assert body.endswith("---\n")
+
+    def test_headers_carry_the_part_count(self, tmp_path):
+        paths = ChunkedOutput(LLMFormatter(), str(tmp_path / "scan.txt"), 150).write(
+            directory_events(_directory(50, 50, 50))
+        )
+
+        headers = [part.split("\n", 1)[0].rstrip() for part in _read(paths)]
+        assert headers == ["# part 1/3", "# part 2/3", "# part 3/3"]
+        assert [p.rsplit("/", 1)[-1] for p in paths] == [
+            "scan.part1.txt",
+            "scan.part2.txt",
+            "scan.part3.txt",
+        ]
+
+    def test_oversized_file_is_split_across_parts(self, tmp_path):
+        directory = Directory(
+            name="root",
+            files=[File(name="big.txt", content="line\n" * 60, size=300)],
+            subdirectories=[],
+        )
+
+        paths = ChunkedOutput(LLMFormatter(), str(tmp_path / "scan.txt"), 100).write(
+            directory_events(directory)
+        )
+
+        parts = _read(paths)
+        assert len(parts) > 2
+        assert all(len(part.encode("utf-8")) <= 100 for part in parts)
+        assert "".join(_body(part) for part in parts) == LLMFormatter().format(directory)
+
+    def test_long_line_is_cut_mid_line(self, tmp_path):
+        directory = Directory(
+            name="root",
+            files=[File(name="min.js", content="é" * 200, size=400)],
+            subdirectories=[],
+        )
+
+        paths = ChunkedOutput(LLMFormatter(), str(tmp_path / "scan.txt"), 80).write(
+            directory_events(directory)
+        )
+
+        parts = _read(paths)
+        assert all(len(part.encode("utf-8")) <= 80 for part in parts)
+        assert "".join(_body(part) for part in parts) == LLMFormatter().format(directory)
+
+    def test_token_limit(self, tmp_path):
+        estimator = CharRatioEstimator()
+
+        paths = ChunkedOutput(
+            LLMFormatter(), str(tmp_path / "scan.txt"), 40, estimator
+        ).write(directory_events(_directory(60, 60, 60)))
+
+        assert len(paths) == 3
+        assert all(estimator.count(part) <= 40 for part in _read(paths))
+
+    def test_limit_smaller_than_header_is_rejected(self, tmp_path):
+        with pytest.raises(ValueError):
+            ChunkedOutput(LLMFormatter(), str(tmp_path / "scan.txt"), HEADER_SIZE)
+
+    def test_parts_left_from_a_longer_run_are_removed(self, tmp_path):
+        out = str(tmp_path / "scan.txt")
+        ChunkedOutput(LLMFormatter(), out, 150).write(directory_events(_directory(50, 50, 50)))
+
+        paths = ChunkedOutput(LLMFormatter(), out, 150).write(
+            directory_events(_directory(50))
+        )
+
+        assert len(paths) == 1
+        assert sorted(p.name for p in tmp_path.iterdir()) == ["scan.part1.txt"]
+        assert _read(paths)[0].startswith("# part 1/1")
+
+    def test_failed_run_leaves_previous_parts_unchanged(self, tmp_path):
+        out = str(tmp_path / "scan.txt")
+        ChunkedOutput(LLMFormatter(), out, 150).write(directory_events(_directory(50, 50)))
+        before = {p.name: p.read_bytes() for p in tmp_path.iterdir()}
+
+        def failing_events():
+            yield from list(directory_events(_directory(50, 50, 50)))[:3]
+            raise OSError("scan failed")
+
+        with pytest.raises(OSError):
+            ChunkedOutput(LLMFormatter(), out, 150).write(failing_events())
+
+        assert {p.name: p.read_bytes() for p in tmp_path.iterdir()} == before
@@ -1,15 +1,47 @@
+import io
+import sys
 from unittest.mock import MagicMock, call, patch
 
 import pytest
 
 from core.clipboard import (
     Clipboard,
+    ClipboardError,
+    IClipboard,
     LinuxClipboard,
     MacOSClipboard,
     WindowsClipboard,
+    _pipe_to,
 )
 
 
+class _Stdin(io.BytesIO):
+    """A child's stdin that remembers every write and what it got in
+    total once closed."""
+
+    def __init__(self):
+        super().__init__()
+        self.writes: list[bytes] = []
+        self.received = None
+
+    def write(self, data):
+        self.writes.append(bytes(data))
+        return super().write(data)
+
+    def close(self):
+        if not self.closed:
+            self.received = self.getvalue()
+        super().close()
+
+
+def _fake_process(returncode=0):
+    proc = MagicMock()
+    proc.stdin = _Stdin()
+    proc.wait.return_value = returncode
+    proc.returncode = returncode
+    return proc
+
+
 class TestWindowsClipboard:
     @pytest.fixture
     def win_mocks(self):
@@ -160,6 +192,21 @@ class TestMacOSClipboard:
             with pytest.raises(RuntimeError, match="pbcopy failed"):
                 MacOSClipboard().copy("hello")
 
+    def test_open_pipes_into_pbcopy(self):
+        proc = _fake_process()
+        with patch("subprocess.Popen", return_value=proc) as mock_popen:
+            with MacOSClipboard().open() as stream:
+                stream.write("Привет ")
+                stream.write("мир")
+        assert mock_popen.call_args.args[0] == ["pbcopy"]
+        assert proc.stdin.received == "Привет мир".encode("utf-8")
+
+    def test_open_raises_when_pbcopy_not_found(self):
+        with patch("subprocess.Popen", side_effect=FileNotFoundError):
+            with pytest.raises(ClipboardError, match="pbcopy not found"):
+                with MacOSClipboard().open():
+                    pass
+
 
 class TestLinuxClipboard:
     def test_copy_uses_xclip_when_available(self):
@@ -208,6 +255,100 @@ class TestLinuxClipboard:
                 check=True,
             )
 
+    def test_open_uses_xclip_when_on_path(self):
+        proc = _fake_process()
+        with (
+            patch("shutil.which", return_value="/usr/bin/xclip"),
+            patch("subprocess.Popen", return_value=proc) as mock_popen,
+        ):
+            with LinuxClipboard().open() as stream:
+                stream.write("hello")
+        assert mock_popen.call_args.args[0] == ["xclip", "-selection", "clipboard"]
+        assert proc.stdin.received == b"hello"
+
+    def test_open_falls_back_to_xsel_when_xclip_not_on_path(self):
+        with (
+            patch("shutil.which", side_effect=lambda name: name == "xsel" or None),
+            patch("subprocess.Popen", return_value=_fake_process()) as mock_popen,
+        ):
+            with LinuxClipboard().open() as stream:
+                stream.write("hello")
+        assert mock_popen.call_args.args[0] == ["xsel", "--clipboard", "--input"]
+
+    def test_open_raises_before_writing_when_neither_is_on_path(self):
+        with (
+            patch("shutil.which", return_value=None),
+            patch("subprocess.Popen") as mock_popen,
+        ):
+            with pytest.raises(ClipboardError, match="xclip or xsel"):
+                LinuxClipboard().open()
+        mock_popen.assert_not_called()
+
+
+class TestPipeTo:
+    def test_writes_reach_the_child_before_the_block_ends(self):
+        proc = _fake_process()
+        with patch("subprocess.Popen", return_value=proc):
+            with _pipe_to(["tool"]) as stream:
+                stream.write("x" * 100_000)
+                assert sum(map(len, proc.stdin.writes)) > 0
+                assert proc.stdin.received is None
+                stream.write("y")
+        assert proc.stdin.received == b"x" * 100_000 + b"y"
+
+    def test_raises_on_nonzero_exit(self):
+        with patch("subprocess.Popen", return_value=_fake_process(returncode=1)):
+            with pytest.raises(ClipboardError, match="tool failed with code 1"):
+                with _pipe_to(["tool"]) as stream:
+                    stream.write("hello")
+
+    def test_raises_when_child_exits_early(self):
+        proc = _fake_process(returncode=2)
+        proc.stdin.write = MagicMock(side_effect=BrokenPipeError)
+        with patch("subprocess.Popen", return_value=proc):
+            with pytest.raises(ClipboardError, match="exited early with code 2"):
+                with _pipe_to(["tool"]) as stream:
+                    stream.write("hello")
+                    stream.flush()
+
+    def test_kills_child_without_eof_when_the_block_raises(self):
+        proc = _fake_process()
+        stdin_closed_at_kill = []
+        proc.kill.side_effect = lambda: stdin_closed_at_kill.append(proc.stdin.closed)
+        with patch("subprocess.Popen", return_value=proc):
+            with pytest.raises(ValueError):
+                with _pipe_to(["tool"]) as stream:
+                    stream.write("partial")
+                    raise ValueError("scan failed")
+        assert stdin_closed_at_kill == [False]
+
+    def test_real_child_process(self, tmp_path):
+        out = tmp_path / "copied.txt"
+        script = (
+            "import shutil, sys; "
+            f"shutil.copyfileobj(sys.stdin.buffer, open({str(out)!r}, 'wb'))"
+        )
+        text = "line ü\n" * 50_000
+        with _pipe_to([sys.executable, "-c", script]) as stream:
+            stream.write(text)
+        assert out.read_bytes() == text.encode("utf-8")
+
+
+class TestDefaultOpen:
+    def test_copies_the_collected_text_on_exit(self):
+        class Recording(IClipboard):
+            copied = None
+
+            def copy(self, text):
+                self.copied = text
+
+        clipboard = Recording()
+        with clipboard.open() as stream:
+            stream.write("a")
+            stream.write("b")
+            assert clipboard.copied is None
+        assert clipboard.copied == "ab"
+
 
 class TestClipboard:
     def test_resolves_windows(self):
@@ -237,3 +378,10 @@ class TestClipboard:
         cb._impl = MagicMock()
         cb.copy("test")
         cb._impl.copy.assert_called_once_with("test")
+
+    def test_open_delegates_to_impl(self):
+        with patch("platform.system", return_value="Windows"):
+            cb = Clipboard()
+
+        cb._impl = MagicMock()
+        assert cb.open() is cb._impl.open.return_value
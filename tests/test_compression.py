@@ -0,0 +1,60 @@
+import bz2
+import gzip
+import io
+import lzma
+
+import pytest
+
+from core.compression import CODECS, codec_for_path, compressed_text
+
+DECOMPRESS = {"gzip": gzip.decompress, "xz": lzma.decompress, "bz2": bz2.decompress}
+
+
+class TestCodecForPath:
+    @pytest.mark.parametrize(
+        "path, codec",
+        [
+            ("scan.txt.gz", "gzip"),
+            ("out/scan.json.xz", "xz"),
+            ("scan.BZ2", "bz2"),
+            ("scan.txt", None),
+            ("scan", None),
+        ],
+    )
+    def test_detects_suffix(self, path, codec):
+        assert codec_for_path(path) == codec
+
+
+class TestCompressedText:
+    @pytest.mark.parametrize("codec", CODECS)
+    def test_round_trip(self, codec):
+        buffer = io.BytesIO()
+
+        with compressed_text(buffer, codec) as text:
+            for i in range(1000):
+                text.write(f"line {i} — ü\n")
+
+        expected = "".join(f"line {i} — ü\n" for i in range(1000))
+        assert DECOMPRESS[codec](buffer.getvalue()).decode("utf-8") == expected
+
+    def test_leaves_stream_open(self):
+        buffer = io.BytesIO()
+
+        with compressed_text(buffer, "gzip") as text:
+            text.write("x")
+
+        assert not buffer.closed
+
+    def test_compresses_while_writing(self):
+        buffer = io.BytesIO()
+
+        with compressed_text(buffer, "gzip") as text:
+            for i in range(20000):
+                text.write(f"{i:08x}\n")
+            text.flush()
+            assert buffer.tell() > 0
+
+    def test_unknown_codec(self):
+        with pytest.raises(ValueError):
+            with compressed_text(io.BytesIO(), "zip"):
+                pass
@@ -11,6 +11,8 @@ from core.config_reader import (
     TreesnakeIgnoreConfigReader,
     YamlConfigReader,
 )
+from models import ScanConfig, ScanTemplate
+from models.scan_template import OutputSpec
 
 
 @pytest.fixture
@@ -113,6 +115,33 @@ class TestTomlConfigReader:
         assert result.config.exclude_dirs == []
 
 
+class TestOutputs:
+    def test_env_outputs_list(self, tmp_path):
+        file = tmp_path / ".env"
+        file.write_text(
+            "OUTPUTS=[llm:clipboard, json:file:out/scan.json]\n", encoding="utf-8"
+        )
+
+        result = EnvConfigReader().read(str(file))
+
+        assert result.output_specs() == [
+            OutputSpec("llm", "clipboard"),
+            OutputSpec("json", "file", "out/scan.json"),
+        ]
+
+    def test_without_outputs_uses_mode_and_output(self):
+        template = ScanTemplate(config=ScanConfig(), mode="llm", output="file", out_file="a.txt")
+        assert template.output_specs() == [OutputSpec("llm", "file", "a.txt")]
+
+    def test_path_may_contain_colons(self):
+        assert OutputSpec.parse("json:file:C:\\scan.json").out_file == "C:\\scan.json"
+
+    @pytest.mark.parametrize("spec", ["llm", "xml:stdout", "llm:printer", "json:file"])
+    def test_invalid_specs_are_rejected(self, spec):
+        with pytest.raises(ValueError):
+            ScanTemplate(config=ScanConfig(), outputs=[spec])
+
+
 class TestConfigReader:
     @pytest.mark.parametrize(
         "filename, content",
@@ -161,23 +190,32 @@ class TestConfigReader:
 
         result = ConfigReader().read(str(file))
 
-        assert "*.pyc" in result.config.exclude_files
-        assert "dist" in result.config.exclude_dirs
-        assert "dist" not in result.config.exclude_files
+        assert result.config.ignore_patterns == ["*.pyc", "dist/"]
+        assert result.config.exclude_dirs == []
 
 
 class TestTreesnakeIgnoreConfigReader:
-    def test_read_returns_gitignore_style_patterns(self, tmp_path):
+    def test_read_returns_gitignore_lines_as_ignore_patterns(self, tmp_path):
         file = tmp_path / ".treesnakeignore"
-        file.write_text("*.pyc\n__pycache__\ndist/\n*.log\n", encoding="utf-8")
+        file.write_text("*.log\n!keep.log\n/build/\n", encoding="utf-8")
 
-        result = TreesnakeIgnoreConfigReader().read(str(file))
+        result = TreesnakeIgnoreConfigReader(root=str(tmp_path)).read(str(file))
+
+        assert result.config.ignore_patterns == ["*.log", "!keep.log", "/build/"]
+        assert result.config.compile().ignore.ignores("build", is_dir=True)
+        assert result.config.exclude_dirs == []
+        assert result.config.exclude_files == []
+
+    def test_root_below_the_file_anchors_patterns_at_the_file(self, tmp_path):
+        file = tmp_path / ".treesnakeignore"
+        file.write_text("/app/build/\n", encoding="utf-8")
+        (tmp_path / "app").mkdir()
 
-        assert "*.pyc" in result.config.exclude_files
-        assert "__pycache__" in result.config.exclude_dirs
-        assert "__pycache__" in result.config.exclude_files
-        assert "dist" in result.config.exclude_dirs
-        assert "dist" not in result.config.exclude_files
+        result = TreesnakeIgnoreConfigReader(root=str(tmp_path / "app")).read(str(file))
+        rules = result.config.compile()
+
+        assert rules.ignore.ignores("build", is_dir=True)
+        assert not rules.ignore.ignores("src/build", is_dir=True)
 
     def test_read_defaults_mode_and_output(self, tmp_path):
         file = tmp_path / ".treesnakeignore"
@@ -194,5 +232,4 @@ class TestTreesnakeIgnoreConfigReader:
 
         result = TreesnakeIgnoreConfigReader().read(str(file))
 
-        assert result.config.exclude_dirs == []
-        assert result.config.exclude_files == []
\ No newline at end of file
+        assert result.config.ignore_patterns == []
\ No newline at end of file
@@ -0,0 +1,59 @@
+from core.dedupe import MIN_DEDUPE_CHARS, Deduplicator
+from core.events import collect_directory, directory_events
+from models import DirNode, FileNode
+
+BODY = "x = 1\n" * MIN_DEDUPE_CHARS
+
+
+def _file(name, content):
+    return FileNode(name=name, content=content, size=len(content))
+
+
+def _tree():
+    return DirNode(
+        name="root",
+        files=[_file("a.py", BODY), _file("short.py", "pass")],
+        subdirectories=[
+            DirNode(
+                name="vendor",
+                files=[_file("a_copy.py", BODY), _file("short_copy.py", "pass")],
+                subdirectories=[],
+            )
+        ],
+    )
+
+
+class TestDeduplicator:
+    def test_later_copies_reference_first(self):
+        deduplicator = Deduplicator()
+
+        result = collect_directory(deduplicator.filter(directory_events(_tree())))
+
+        assert result.files[0].content == BODY
+        copy = result.subdirectories[0].files[0]
+        assert copy.content == "[Same as root/a.py]"
+        assert copy.size == len(BODY)
+
+    def test_short_contents_are_kept(self):
+        result = collect_directory(Deduplicator().filter(directory_events(_tree())))
+
+        assert result.subdirectories[0].files[1].content == "pass"
+
+    def test_reports_savings(self):
+        deduplicator = Deduplicator()
+
+        list(deduplicator.filter(directory_events(_tree())))
+
+        assert deduplicator.duplicates == 1
+        assert deduplicator.saved_chars == len(BODY)
+
+    def test_distinct_contents_untouched(self):
+        tree = DirNode(
+            name="root",
+            files=[_file("a.py", BODY), _file("b.py", BODY + "y")],
+            subdirectories=[],
+        )
+
+        result = collect_directory(Deduplicator().filter(directory_events(tree)))
+
+        assert result == tree
@@ -0,0 +1,53 @@
+import pytest
+
+from core.events import collect_directory, directory_events
+from models import DirNode, Directory, File, EnterDirEvent, ExitDirEvent, FileEvent, FileNode
+
+
+@pytest.fixture
+def nested_directory():
+    return DirNode(
+        name="root",
+        files=[FileNode(name="main.py", content="print('hello')", size=14)],
+        subdirectories=[
+            DirNode(
+                name="core",
+                files=[FileNode(name="scanner.py", content="import os", size=9)],
+                subdirectories=[DirNode(name="empty")],
+            )
+        ],
+    )
+
+
+class TestDirectoryEvents:
+    def test_files_before_subdirectories(self, nested_directory):
+        events = list(directory_events(nested_directory))
+
+        assert events[0] == EnterDirEvent(name="root", file_count=1, dir_count=1)
+        assert isinstance(events[1], FileEvent)
+        assert events[2] == EnterDirEvent(name="core", file_count=1, dir_count=1)
+        assert events[-1] == ExitDirEvent(name="root")
+
+    def test_round_trip(self, nested_directory):
+        assert collect_directory(directory_events(nested_directory)) == nested_directory
+
+
+class TestCollectDirectory:
+    def test_incomplete_stream_raises(self):
+        with pytest.raises(ValueError):
+            collect_directory([EnterDirEvent(name="root", file_count=0, dir_count=0)])
+
+    def test_empty_stream_raises(self):
+        with pytest.raises(ValueError):
+            collect_directory([])
+
+
+class TestDirNode:
+    def test_to_model(self, nested_directory):
+        model = nested_directory.to_model()
+
+        assert isinstance(model, Directory)
+        assert model.subdirectories[0].files[0] == File(
+            name="scanner.py", content="import os", size=9
+        )
+        assert model.subdirectories[0].subdirectories[0].name == "empty"
@@ -0,0 +1,86 @@
+import pytest
+
+from core.explain import CONTENT_EXCLUDED, EXCLUDED, INCLUDED, NOT_FOUND, PathExplainer
+from models import ScanConfig
+
+
+@pytest.fixture
+def tree(tmp_path):
+    (tmp_path / "node_modules" / "pkg").mkdir(parents=True)
+    (tmp_path / "node_modules" / "pkg" / "index.js").write_text("x")
+    (tmp_path / "src" / "gen").mkdir(parents=True)
+    (tmp_path / "src" / "main.py").write_text("print(1)")
+    (tmp_path / "src" / "gen" / "out.py").write_text("x")
+    (tmp_path / "src" / "data.bin").write_text("x" * 100)
+    (tmp_path / "debug.log").write_text("x")
+    (tmp_path / "src" / ".gitignore").write_text("# generated\n/gen/\n")
+    return tmp_path
+
+
+def _explain(root, path, **config):
+    return PathExplainer(str(root), ScanConfig(**config).compile()).explain(path)
+
+
+class TestPathExplainer:
+    def test_included_file(self, tree):
+        result = _explain(tree, "src/main.py")
+
+        assert result.decision == INCLUDED
+        assert str(result) == "src/main.py: included"
+
+    def test_excluded_ancestor_names_rule_and_directory(self, tree):
+        result = _explain(tree, "node_modules/pkg/index.js", exclude_dirs=["node_*"])
+
+        assert result.decision == EXCLUDED
+        assert result.reason == "exclude_dirs: node_* (on node_modules/)"
+
+    def test_excluded_file_names_first_matching_rule(self, tree):
+        result = _explain(tree, "debug.log", exclude_files=["re:^debug", "*.log"])
+
+        assert result == (
+            "debug.log",
+            EXCLUDED,
+            "exclude_files: re:^debug",
+        )
+
+    def test_nested_ignore_file_line(self, tree):
+        result = _explain(tree, "src/gen/out.py", ignore_files=[".gitignore"])
+
+        assert result.decision == EXCLUDED
+        assert result.reason == "src/.gitignore:2: /gen/ (on src/gen/)"
+
+    def test_negated_ignore_line_includes(self, tree):
+        result = _explain(tree, "debug.log", ignore_patterns=["*.log", "!debug.log"])
+
+        assert result.decision == INCLUDED
+
+    def test_include_files_miss(self, tree):
+        result = _explain(tree, "debug.log", include_files=["*.py"])
+
+        assert result.reason == "matches none of include_files"
+
+    def test_include_paths_prune(self, tree):
+        result = _explain(tree, "node_modules/pkg/index.js", include_paths=["src/**"])
+
+        assert result.decision == EXCLUDED
+        assert result.reason.startswith("no include_paths pattern leads into it")
+
+    def test_content_excluded_file(self, tree):
+        result = _explain(tree, "src/main.py", exclude_content_files=["*.py"])
+
+        assert result.decision == CONTENT_EXCLUDED
+
+    def test_file_over_max_file_size(self, tree):
+        result = _explain(tree, "src/data.bin", max_file_size=10)
+
+        assert result.decision == CONTENT_EXCLUDED
+        assert result.reason == "100 bytes > max_file_size=10"
+
+    def test_below_max_depth(self, tree):
+        result = _explain(tree, "src/gen/out.py", max_depth=1)
+
+        assert result.decision == EXCLUDED
+        assert "max_depth=1" in result.reason
+
+    def test_missing_path(self, tree):
+        assert _explain(tree, "nope.txt").decision == NOT_FOUND
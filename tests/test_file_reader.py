@@ -1,5 +1,5 @@
 from unittest.mock import patch
-from core.file_reader import FileReader
+from core.file_reader import MAX_PART_BYTES, SNIFF_BYTES, FileReader
 
 
 class TestFileReader:
@@ -13,14 +13,57 @@ class TestFileReader:
         assert result.content == "hello world"
         assert result.size == file.stat().st_size
 
-    def test_unreadable_file(self, tmp_path):
+    def test_invalid_utf8_prefix_is_binary(self, tmp_path):
         file = tmp_path / "binary.bin"
         file.write_bytes(b"\xff\xfe")
 
         result = FileReader().read(str(file))
 
+        assert result.content == FileReader.CONTENT_BINARY
+
+    def test_nul_byte_is_binary(self, tmp_path):
+        file = tmp_path / "data.txt"
+        file.write_bytes(b"text\x00more")
+
+        result = FileReader().read(str(file))
+
+        assert result.content == FileReader.CONTENT_BINARY
+        assert result.size == 9
+
+    def test_binary_extension_is_not_opened(self, tmp_path):
+        file = tmp_path / "image.PNG"
+        file.write_text("not really a png", encoding="utf-8")
+
+        with patch("builtins.open", side_effect=AssertionError("opened")):
+            result = FileReader().read(str(file))
+
+        assert result.content == FileReader.CONTENT_BINARY
+
+    def test_invalid_utf8_after_prefix_is_unreadable(self, tmp_path):
+        file = tmp_path / "late.txt"
+        file.write_bytes(b"a" * SNIFF_BYTES + b"\xff")
+
+        result = FileReader().read(str(file))
+
         assert result.content == FileReader.CONTENT_UNREADABLE
 
+    def test_multibyte_char_across_prefix_boundary(self, tmp_path):
+        file = tmp_path / "text.txt"
+        content = "a" * (SNIFF_BYTES - 1) + "ж" + "tail"
+        file.write_text(content, encoding="utf-8")
+
+        result = FileReader().read(str(file))
+
+        assert result.content == content
+
+    def test_newlines_are_translated(self, tmp_path):
+        file = tmp_path / "crlf.txt"
+        file.write_bytes(b"one\r\ntwo\rthree\n")
+
+        result = FileReader().read(str(file))
+
+        assert result.content == "one\ntwo\nthree\n"
+
     def test_permission_error(self, tmp_path):
         file = tmp_path / "locked.txt"
         file.write_text("secret", encoding="utf-8")
@@ -28,4 +71,97 @@ class TestFileReader:
         with patch("builtins.open", side_effect=PermissionError):
             result = FileReader().read(str(file))
 
-        assert result.content == FileReader.CONTENT_UNREADABLE
\ No newline at end of file
+        assert result.content == FileReader.CONTENT_UNREADABLE
+
+    def test_uses_given_stat_for_size(self, tmp_path):
+        file = tmp_path / "test.txt"
+        file.write_text("hello", encoding="utf-8")
+        stat = file.stat()
+
+        with patch("os.path.getsize", side_effect=AssertionError("stat again")):
+            result = FileReader().read(str(file), stat)
+
+        assert result.size == 5
+
+
+class TestReadTruncated:
+    def _write_lines(self, tmp_path, count):
+        file = tmp_path / "app.log"
+        file.write_text("".join(f"line {i}\n" for i in range(count)), encoding="utf-8")
+        return file
+
+    def test_keeps_head_and_tail_with_marker(self, tmp_path):
+        file = self._write_lines(tmp_path, 10)
+
+        result = FileReader().read_truncated(str(file), file.stat(), 2, 3)
+
+        omitted = sum(len(f"line {i}\n") for i in range(2, 7))
+        assert result.content == (
+            "line 0\nline 1\n"
+            f"[... {omitted} bytes omitted ...]\n"
+            "line 7\nline 8\nline 9\n"
+        )
+        assert result.size == file.stat().st_size
+
+    def test_short_file_is_returned_whole(self, tmp_path):
+        file = self._write_lines(tmp_path, 5)
+
+        result = FileReader().read_truncated(str(file), None, 2, 3)
+
+        assert result.content == file.read_text(encoding="utf-8")
+
+    def test_head_only(self, tmp_path):
+        file = self._write_lines(tmp_path, 10)
+
+        result = FileReader().read_truncated(str(file), None, 1, 0)
+
+        assert result.content.startswith("line 0\n[... ")
+        assert result.content.endswith(" bytes omitted ...]\n")
+
+    def test_tail_without_final_newline(self, tmp_path):
+        file = tmp_path / "data.txt"
+        file.write_text("a\nb\nc\nd", encoding="utf-8")
+
+        result = FileReader().read_truncated(str(file), None, 0, 2)
+
+        assert result.content == "[... 4 bytes omitted ...]\nc\nd"
+
+    def test_empty_file(self, tmp_path):
+        file = tmp_path / "empty.txt"
+        file.write_text("")
+
+        assert FileReader().read_truncated(str(file), None, 1, 1).content == ""
+
+    def test_binary_file_gets_placeholder(self, tmp_path):
+        file = tmp_path / "blob"
+        file.write_bytes(b"\x00" * 100)
+
+        result = FileReader().read_truncated(str(file), None, 1, 1)
+
+        assert result.content == FileReader.CONTENT_BINARY
+
+    def test_single_line_over_the_byte_cap_is_cut(self, tmp_path):
+        file = tmp_path / "bundle.min.js"
+        # "a" first, so the cut falls inside a two-byte character.
+        text = "a" + "é" * (2 * MAX_PART_BYTES)
+        file.write_text(text, encoding="utf-8")
+        size = file.stat().st_size
+
+        result = FileReader().read_truncated(str(file), None, 5, 5)
+
+        head, marker, tail = result.content.partition(" bytes omitted ...]\n")
+        head, _, omitted = head.partition("[... ")
+        assert marker
+        assert head == text[: MAX_PART_BYTES // 2]
+        assert len(tail.encode("utf-8")) == MAX_PART_BYTES
+        assert len(head.encode("utf-8")) + int(omitted) + MAX_PART_BYTES == size
+
+    def test_long_lines_are_cut_after_the_lines_that_fit(self, tmp_path):
+        file = tmp_path / "dump.json"
+        file.write_text("{\n" + "x" * (3 * MAX_PART_BYTES) + "\n}\n", encoding="utf-8")
+
+        result = FileReader().read_truncated(str(file), None, 2, 2)
+
+        head, _, tail = result.content.partition(" bytes omitted ...]\n")
+        assert head.startswith("{\n" + "x" * (MAX_PART_BYTES - 2) + "[... ")
+        assert tail == "x" * (MAX_PART_BYTES - 3) + "\n}\n"
@@ -1,12 +1,16 @@
+import io
 import json
 
 import pytest
 
+from core.events import directory_events
 from core.formatter import (
     DefaultFormatter,
     JsonFormatter,
     JsonStringFormatter,
     LLMFormatter,
+    NdjsonFormatter,
+    write_all,
 )
 from models import Directory, File
 
@@ -91,6 +95,39 @@ class TestDefaultFormatter:
         result = DefaultFormatter().format(nested_directory)
         assert "│" in result
 
+    def test_content_lines_drawn_under_the_file(self):
+        directory = Directory(
+            name="root",
+            files=[
+                File(name="a.py", content="one\ntwo\n\nfour\n", size=14),
+                File(name="b.py", content="x", size=1),
+            ],
+            subdirectories=[],
+        )
+        assert DefaultFormatter().format(directory) == (
+            "📁 root/\n"
+            "├── 📄 a.py (14 bytes)\n"
+            "│   │   one\n"
+            "│   │   two\n"
+            "│   │   \n"
+            "│   └── four\n"
+            "└── 📄 b.py (1 bytes)\n"
+            "    └── x\n"
+        )
+
+    @pytest.mark.parametrize(
+        "content",
+        ["a\r\nb", "a\rb\r", "\r\r\n\n", "a\x0bb\x0cc\x1cd", "é\x85ü\u2028x\u2029", "\n\n"],
+    )
+    def test_lines_split_like_splitlines(self, content):
+        directory = Directory(
+            name="root",
+            files=[File(name="a.txt", content=content, size=len(content))],
+            subdirectories=[],
+        )
+        lines = DefaultFormatter().format(directory).splitlines()[2:]
+        assert [line[8:] for line in lines] == content.splitlines()
+
 
 class TestLLMFormatter:
     def test_contains_file_path(self, simple_directory):
@@ -176,3 +213,119 @@ class TestJsonStringFormatter:
         result = JsonStringFormatter().format(nested_directory)
         parsed = json.loads(result)
         assert parsed["subdirectories"][0]["name"] == "core"
+
+    @pytest.mark.parametrize("indent", [None, 0, 2, 4])
+    def test_matches_json_dump_of_the_dict(self, nested_directory, indent):
+        nested_directory.files.append(
+            File(name='q"ü.txt', content='tab\t "quoted" \\ \x01 😀\n', size=20)
+        )
+        nested_directory.subdirectories.append(
+            Directory(name="empty", files=[], subdirectories=[])
+        )
+        expected = json.dumps(
+            JsonFormatter().format(nested_directory), indent=indent, ensure_ascii=False
+        )
+
+        assert JsonStringFormatter(indent=indent).format(nested_directory) == expected
+
+    def test_empty_stream_is_null(self):
+        buffer = io.StringIO()
+        JsonStringFormatter().write([], buffer)
+        assert buffer.getvalue() == "null"
+
+
+class TestNdjsonFormatter:
+    def test_one_record_per_line(self, nested_directory):
+        lines = NdjsonFormatter().format(nested_directory).splitlines()
+        records = [json.loads(line) for line in lines]
+        assert [record["type"] for record in records] == [
+            "dir", "file", "dir", "file", "dir", "file"
+        ]
+
+    def test_paths_are_relative_to_the_root(self, nested_directory):
+        records = [
+            json.loads(line)
+            for line in NdjsonFormatter().format(nested_directory).splitlines()
+        ]
+        assert [record["path"] for record in records] == [
+            ".",
+            "main.py",
+            "core",
+            "core/scanner.py",
+            "core/utils",
+            "core/utils/helper.py",
+        ]
+
+    def test_file_record(self, simple_directory):
+        lines = NdjsonFormatter().format(simple_directory).splitlines()
+        assert json.loads(lines[1]) == {
+            "type": "file",
+            "path": "main.py",
+            "size": 14,
+            "content": "print('hello')",
+        }
+
+    def test_dir_record_counts_children(self, nested_directory):
+        root = json.loads(NdjsonFormatter().format(nested_directory).splitlines()[0])
+        assert root == {"type": "dir", "path": ".", "name": "root", "files": 1, "dirs": 1}
+
+    def test_multiline_content_stays_on_one_line(self):
+        directory = Directory(
+            name="root",
+            files=[File(name="a.txt", content="one\ntwo\n", size=8)],
+            subdirectories=[],
+        )
+        lines = NdjsonFormatter().format(directory).splitlines()
+        assert len(lines) == 2
+        assert json.loads(lines[1])["content"] == "one\ntwo\n"
+
+
+class TestStreamingWrite:
+    @pytest.mark.parametrize(
+        "formatter",
+        [DefaultFormatter(), LLMFormatter(), JsonStringFormatter(), NdjsonFormatter()],
+        ids=["default", "llm", "json", "ndjson"],
+    )
+    def test_write_matches_format(self, formatter, nested_directory):
+        buffer = io.StringIO()
+
+        formatter.write(directory_events(nested_directory), buffer)
+
+        assert buffer.getvalue() == formatter.format(nested_directory)
+
+    def test_write_all_renders_one_pass_with_every_formatter(self, nested_directory):
+        formatters = [DefaultFormatter(), LLMFormatter(), JsonStringFormatter()]
+        buffers = [io.StringIO() for _ in formatters]
+        pulled = []
+
+        def events():
+            for event in directory_events(nested_directory):
+                pulled.append(event)
+                yield event
+
+        write_all(events(), list(zip(formatters, buffers)))
+
+        assert len(pulled) == len(list(directory_events(nested_directory)))
+        for formatter, buffer in zip(formatters, buffers):
+            assert buffer.getvalue() == formatter.format(nested_directory)
+
+    def test_write_to_binary_stream(self, nested_directory):
+        buffer = io.BytesIO()
+
+        DefaultFormatter().write(directory_events(nested_directory), buffer)
+
+        assert buffer.getvalue() == DefaultFormatter().format(nested_directory).encode("utf-8")
+        assert not buffer.closed
+
+    def test_output_starts_before_events_end(self, nested_directory):
+        buffer = io.StringIO()
+        seen = []
+
+        def events():
+            for event in directory_events(nested_directory):
+                seen.append(buffer.getvalue())
+                yield event
+
+        LLMFormatter().write(events(), buffer)
+
+        assert "# root/main.py" in seen[-1]
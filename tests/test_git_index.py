@@ -0,0 +1,160 @@
+import os
+import shutil
+import struct
+import subprocess
+
+import pytest
+
+from core.git_index import GitIndexError, GitIndexReader, find_repository
+from core.git_index_scanner import GitIndexScanner, ParallelGitIndexScanner
+from models import ScanConfig
+
+
+def _entry(name: bytes, mode: int = 0o100644, stage: int = 0) -> bytes:
+    fields = struct.pack(">10I", 0, 0, 0, 0, 0, 0, mode, 0, 0, 1)
+    flags = (stage << 12) | min(len(name), 0xFFF)
+    body = fields + b"\0" * 20 + struct.pack(">H", flags) + name
+    padding = 8 - len(body) % 8
+    return body + b"\0" * padding
+
+
+def _index(*entries: bytes, version: int = 2) -> bytes:
+    return b"DIRC" + struct.pack(">II", version, len(entries)) + b"".join(entries)
+
+
+class TestGitIndexReader:
+    def test_parses_v2_entries(self):
+        data = _index(_entry(b"a/b.txt"), _entry(b"c.py"))
+
+        assert GitIndexReader().parse(data) == ["a/b.txt", "c.py"]
+
+    def test_name_filling_the_padding_exactly(self):
+        # 62 fixed bytes + 2-byte name = 64: still gets 8 NULs of padding.
+        data = _index(_entry(b"ab"), _entry(b"cd"))
+
+        assert GitIndexReader().parse(data) == ["ab", "cd"]
+
+    def test_skips_gitlinks(self):
+        data = _index(_entry(b"sub", mode=0o160000), _entry(b"x"))
+
+        assert GitIndexReader().parse(data) == ["x"]
+
+    def test_conflicted_path_listed_once(self):
+        data = _index(
+            _entry(b"f", stage=1), _entry(b"f", stage=2), _entry(b"f", stage=3)
+        )
+
+        assert GitIndexReader().parse(data) == ["f"]
+
+    def test_rejects_bad_signature(self):
+        with pytest.raises(GitIndexError):
+            GitIndexReader().parse(b"XXXX" + struct.pack(">II", 2, 0))
+
+    def test_rejects_unknown_version(self):
+        with pytest.raises(GitIndexError):
+            GitIndexReader().parse(_index(version=9))
+
+    def test_rejects_truncated_index(self):
+        data = _index(_entry(b"a/b.txt"))
+
+        with pytest.raises(GitIndexError):
+            GitIndexReader().parse(data[:-12])
+
+    def test_missing_index_is_empty(self, tmp_path):
+        assert GitIndexReader().read(str(tmp_path)) == []
+
+
+class TestFindRepository:
+    def test_finds_enclosing_worktree(self, tmp_path):
+        (tmp_path / ".git").mkdir()
+        (tmp_path / "src" / "pkg").mkdir(parents=True)
+
+        repository = find_repository(str(tmp_path / "src" / "pkg"))
+
+        assert repository.worktree == str(tmp_path)
+        assert repository.git_dir == str(tmp_path / ".git")
+
+    def test_follows_gitdir_file(self, tmp_path):
+        (tmp_path / "real").mkdir()
+        (tmp_path / "wt").mkdir()
+        (tmp_path / "wt" / ".git").write_text("gitdir: ../real\n")
+
+        repository = find_repository(str(tmp_path / "wt"))
+
+        assert repository.git_dir == str(tmp_path / "real")
+
+
+@pytest.fixture
+def repo(tmp_path):
+    if shutil.which("git") is None:
+        pytest.skip("git is not installed")
+    (tmp_path / "src").mkdir()
+    (tmp_path / "src" / "main.py").write_text("print(1)")
+    (tmp_path / "src" / "util.py").write_text("x = 1")
+    (tmp_path / "README.md").write_text("# hi")
+    subprocess.run(["git", "init", "-q", str(tmp_path)], check=True)
+    subprocess.run(["git", "-C", str(tmp_path), "add", "-A"], check=True)
+    (tmp_path / "build").mkdir()
+    (tmp_path / "build" / "out.o").write_text("untracked")
+    (tmp_path / "scratch.txt").write_text("untracked")
+    return tmp_path
+
+
+def _paths(directory, prefix=""):
+    paths = {f"{prefix}{f.name}" for f in directory.files}
+    for subdir in directory.subdirectories:
+        paths |= _paths(subdir, f"{prefix}{subdir.name}/")
+    return paths
+
+
+class TestGitIndexScanner:
+    @pytest.mark.parametrize("version", ["2", "3", "4"])
+    def test_lists_only_tracked_files(self, repo, version):
+        subprocess.run(
+            ["git", "-C", str(repo), "update-index", "--index-version", version],
+            check=True,
+        )
+
+        result = GitIndexScanner().scan(str(repo), ScanConfig())
+
+        assert _paths(result.directory) == {"README.md", "src/main.py", "src/util.py"}
+        assert result.file_count == 3
+        assert result.dir_count == 1
+
+    def test_rules_still_apply(self, repo):
+        config = ScanConfig(exclude_files=["util.py"], exclude_content_files=["*.md"])
+
+        result = GitIndexScanner().scan(str(repo), config)
+
+        assert _paths(result.directory) == {"README.md", "src/main.py"}
+        assert result.directory.files[0].content == ""
+
+    def test_scans_subdirectory_of_checkout(self, repo):
+        result = GitIndexScanner().scan(str(repo / "src"), ScanConfig())
+
+        assert _paths(result.directory) == {"main.py", "util.py"}
+
+    def test_skips_deleted_tracked_files(self, repo):
+        os.remove(repo / "src" / "util.py")
+
+        result = GitIndexScanner().scan(str(repo), ScanConfig())
+
+        assert _paths(result.directory) == {"README.md", "src/main.py"}
+
+    def test_only_kept_files_are_stated(self, repo):
+        scanner = GitIndexScanner()
+
+        scanner.scan(str(repo), ScanConfig(exclude_dirs=["src"]))
+
+        assert scanner.stat_calls == 1
+
+    def test_parallel_reads_match(self, repo):
+        expected = GitIndexScanner().scan(str(repo), ScanConfig())
+
+        result = ParallelGitIndexScanner(jobs=2).scan(str(repo), ScanConfig())
+
+        assert result.directory == expected.directory
+
+    def test_outside_repository_raises(self, tmp_path):
+        with pytest.raises(GitIndexError):
+            GitIndexScanner().scan(str(tmp_path), ScanConfig())
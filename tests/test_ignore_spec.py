@@ -0,0 +1,129 @@
+import pytest
+
+from core.ignore_spec import GitignoreSpec, IgnoreStack
+
+
+def _ignored(lines, path, is_dir=False, base=""):
+    return GitignoreSpec(lines, base).ignores(path, is_dir)
+
+
+class TestGitignoreSpec:
+    def test_unanchored_pattern_matches_at_any_level(self):
+        assert _ignored(["*.pyc"], "a.pyc")
+        assert _ignored(["*.pyc"], "src/pkg/a.pyc")
+        assert not _ignored(["*.pyc"], "src/a.py")
+
+    def test_leading_slash_anchors_to_root(self):
+        assert _ignored(["/build"], "build", is_dir=True)
+        assert not _ignored(["/build"], "src/build", is_dir=True)
+
+    def test_internal_slash_anchors_to_root(self):
+        assert _ignored(["build/generated"], "build/generated", is_dir=True)
+        assert not _ignored(["build/generated"], "src/build/generated", is_dir=True)
+
+    def test_trailing_slash_only_matches_directories(self):
+        assert _ignored(["dist/"], "dist", is_dir=True)
+        assert _ignored(["dist/"], "pkg/dist", is_dir=True)
+        assert not _ignored(["dist/"], "dist")
+
+    def test_star_does_not_cross_slash(self):
+        assert _ignored(["docs/*.md"], "docs/a.md")
+        assert not _ignored(["docs/*.md"], "docs/sub/a.md")
+
+    def test_leading_double_star(self):
+        assert _ignored(["**/logs"], "logs", is_dir=True)
+        assert _ignored(["**/logs"], "a/b/logs", is_dir=True)
+
+    def test_trailing_double_star(self):
+        assert _ignored(["abc/**"], "abc/x/y.txt")
+        assert not _ignored(["abc/**"], "abc", is_dir=True)
+
+    def test_middle_double_star(self):
+        assert _ignored(["a/**/b"], "a/b", is_dir=True)
+        assert _ignored(["a/**/b"], "a/x/y/b", is_dir=True)
+        assert not _ignored(["a/**/b"], "c/a/x/b", is_dir=True)
+
+    def test_negation_re_includes(self):
+        spec = GitignoreSpec(["*.log", "!keep.log"])
+
+        assert spec.match("debug.log", False) is True
+        assert spec.match("keep.log", False) is False
+        assert spec.match("main.py", False) is None
+
+    def test_last_matching_line_wins(self):
+        assert _ignored(["!keep.log", "*.log"], "keep.log")
+
+    def test_character_class(self):
+        assert _ignored(["file[0-9].txt"], "file3.txt")
+        assert not _ignored(["file[0-9].txt"], "filex.txt")
+        assert _ignored(["file[!0-9].txt"], "filex.txt")
+
+    def test_question_mark(self):
+        assert _ignored(["?.txt"], "a.txt")
+        assert not _ignored(["?.txt"], "ab.txt")
+
+    def test_comments_blank_lines_and_escapes(self):
+        spec = GitignoreSpec(["# comment", "", r"\#notes", r"\!bang", "trail   "])
+
+        assert spec.ignores("#notes", False)
+        assert spec.ignores("!bang", False)
+        assert spec.ignores("trail", False)
+        assert not spec.ignores("# comment", False)
+
+    def test_escaped_trailing_space_is_kept(self):
+        assert _ignored(["name\\ "], "name ")
+        assert not _ignored(["name\\ "], "name")
+
+    @pytest.mark.parametrize("line", ["[", "a[b", "+x", "(y)", "a|b"])
+    def test_regex_metacharacters_are_literal(self, line):
+        assert _ignored([line], line)
+        assert not _ignored([line], "other")
+
+    def test_base_limits_patterns_to_its_directory(self):
+        spec = GitignoreSpec(["/out", "*.tmp"], base="pkg")
+
+        assert spec.ignores("pkg/out", True)
+        assert spec.ignores("pkg/sub/x.tmp", False)
+        assert not spec.ignores("out", True)
+        assert spec.match("other/x.tmp", False) is None
+
+    def test_root_matches_from_a_directory_above_the_scan_root(self):
+        spec = GitignoreSpec(["/app/build/", "/build/", "!keep.log", "*.log"], root="app")
+
+        assert spec.ignores("build", True)
+        assert not spec.ignores("sub/build", True)
+        assert spec.ignores("sub/x.log", False)
+        assert spec.explain("build", True).line == "/app/build/"
+
+    def test_empty_spec_is_falsy(self):
+        assert not GitignoreSpec(["# only a comment", ""])
+        assert GitignoreSpec(["*.pyc"])
+
+    def test_from_file_missing(self, tmp_path):
+        assert not GitignoreSpec.from_file(str(tmp_path / "missing"))
+
+
+class TestIgnoreStack:
+    def test_empty_stack_ignores_nothing(self):
+        assert not IgnoreStack().ignores("a.log", False)
+
+    def test_push_skips_empty_specs(self):
+        stack = IgnoreStack().push(GitignoreSpec([])).push(None)
+
+        assert len(stack) == 0
+
+    def test_deeper_spec_wins(self):
+        stack = IgnoreStack().push(GitignoreSpec(["*.log"])).push(
+            GitignoreSpec(["!keep.log"], base="pkg")
+        )
+
+        assert stack.ignores("pkg/drop.log", False)
+        assert not stack.ignores("pkg/keep.log", False)
+        assert stack.ignores("keep.log", False)
+
+    def test_push_leaves_parent_unchanged(self):
+        parent = IgnoreStack().push(GitignoreSpec(["*.log"]))
+
+        parent.push(GitignoreSpec(["*.tmp"]))
+
+        assert len(parent) == 1
@@ -0,0 +1,61 @@
+import pytest
+
+from core.include_paths import PathIncludes
+
+
+def _walk(includes, path):
+    state = includes.root
+    for name in path.split("/"):
+        state = includes.step(state, name)
+    return state
+
+
+def _accepts(patterns, path):
+    includes = PathIncludes(patterns)
+    return includes.accepts(_walk(includes, path))
+
+
+def _enters(patterns, path):
+    return bool(_walk(PathIncludes(patterns), path))
+
+
+class TestPathIncludes:
+    @pytest.mark.parametrize(
+        "pattern, path, expected",
+        [
+            ("src/core/**", "src/core/rule.py", True),
+            ("src/core/**", "src/core/sub/x.py", True),
+            ("src/core/**", "src/cli/app.py", False),
+            ("src/core", "src/core/rule.py", True),
+            ("docs/*.md", "docs/a.md", True),
+            ("docs/*.md", "docs/sub/a.md", False),
+            ("**/*.proto", "a.proto", True),
+            ("**/*.proto", "x/y/a.proto", True),
+            ("**/*.proto", "x/y/a.py", False),
+            ("a/**/b.txt", "a/b.txt", True),
+            ("a/**/b.txt", "a/x/y/b.txt", True),
+            ("./README.md", "README.md", True),
+            ("pkg[12]/*", "pkg1/x", True),
+            ("pkg[12]/*", "pkg3/x", False),
+        ],
+    )
+    def test_accepts(self, pattern, path, expected):
+        assert _accepts([pattern], path) is expected
+
+    def test_enters_only_directories_on_the_way(self):
+        patterns = ["src/core/**", "docs/*.md"]
+
+        assert _enters(patterns, "src")
+        assert _enters(patterns, "src/core")
+        assert _enters(patterns, "src/core/deep/er")
+        assert _enters(patterns, "docs")
+        assert not _enters(patterns, "docs/sub")
+        assert not _enters(patterns, "src/cli")
+        assert not _enters(patterns, "node_modules")
+
+    def test_leading_globstar_enters_everything(self):
+        assert _enters(["**/*.proto"], "any/dir")
+
+    def test_any_pattern_may_match(self):
+        assert _accepts(["a/*.py", "b/*.py"], "b/x.py")
+        assert not _accepts(["a/*.py", "b/*.py"], "c/x.py")
@@ -0,0 +1,303 @@
+import pytest
+
+from core.events import collect_directory, directory_events
+from core.minifier import (
+    CPP,
+    CSS,
+    JAVASCRIPT,
+    PYTHON,
+    RUST,
+    SHELL,
+    C,
+    ContentMinifier,
+    minifier_for,
+)
+from models import DirNode, FileNode
+
+
+class TestPythonMinifier:
+    def test_drops_comments_docstrings_and_blank_lines(self):
+        source = (
+            '"""Module docstring."""\n'
+            "\n"
+            "import os  # why\n"
+            "\n"
+            "\n"
+            "# a comment line\n"
+            "def f(x):\n"
+            '    """Docstring."""\n'
+            "    return x   \n"
+        )
+
+        assert PYTHON.minify(source) == "import os\ndef f(x):\n    return x\n"
+
+    def test_keeps_shebang(self):
+        assert PYTHON.minify("#!/usr/bin/env python3\n# c\nx = 1\n") == (
+            "#!/usr/bin/env python3\nx = 1\n"
+        )
+
+    def test_block_left_with_only_a_docstring_gets_ellipsis(self):
+        source = (
+            "class Error(Exception):\n"
+            '    """Raised when it fails."""\n'
+            "\n"
+            "def f():\n"
+            "    '''First.'''\n"
+            "    'Second.'\n"
+            "x = 1\n"
+        )
+
+        minified = PYTHON.minify(source)
+
+        assert minified == (
+            "class Error(Exception):\n    ...\ndef f():\n    'Second.'\nx = 1\n"
+        )
+        compile(minified, "<minified>", "exec")
+
+    def test_docstring_of_def_with_parameters_on_several_lines(self):
+        source = (
+            "async def f(\n"
+            "    a: dict[str, int],\n"
+            ") -> None:\n"
+            '    """Doc."""\n'
+            "    return\n"
+        )
+
+        assert PYTHON.minify(source) == (
+            "async def f(\n    a: dict[str, int],\n) -> None:\n    return\n"
+        )
+
+    @pytest.mark.parametrize(
+        "source",
+        [
+            'def f():\n    f"{g()}"\n',
+            'def f():\n    b"bytes"\n',
+            'with raises(KeyError):\n    f"{mapping[key]}"\n',
+            'if x:\n    "not a docstring"\n',
+            'x = 1\n"not a docstring"\n',
+            '"""Module."""\n"""Not a docstring."""\n',
+        ],
+    )
+    def test_string_statements_that_are_not_docstrings_are_kept(self, source):
+        kept = source.removeprefix('"""Module."""\n')
+
+        assert PYTHON.minify(source) == kept
+
+    def test_prefixed_docstring(self):
+        assert PYTHON.minify('def f():\n    r"""A \\d docstring."""\n    pass\n') == (
+            "def f():\n    pass\n"
+        )
+
+    def test_comment_markers_and_whitespace_inside_strings_are_kept(self):
+        source = (
+            'url = "http://x#frag"  # comment\n'
+            'sql = """\n'
+            "  select *   \n"
+            "\n"
+            '  from t"""\n'
+            "tag = f'{a!r} # not a comment'\n"
+        )
+
+        assert PYTHON.minify(source) == (
+            'url = "http://x#frag"\n'
+            'sql = """\n'
+            "  select *   \n"
+            "\n"
+            '  from t"""\n'
+            "tag = f'{a!r} # not a comment'\n"
+        )
+
+    @pytest.mark.parametrize(
+        "source",
+        [
+            'x = (\n    "in brackets"\n)\n',
+            'x = \\\n    "after a continuation"\n',
+            '"followed by code".join(parts)\n',
+            'x = 1; "after a semicolon"\n',
+        ],
+    )
+    def test_strings_that_are_not_statements_are_kept(self, source):
+        assert PYTHON.minify(source) == source
+
+    def test_unterminated_string_is_left_alone(self):
+        source = 'x = """never closed  \n\n# c\n'
+
+        assert PYTHON.minify(source) == source
+
+    def test_crlf_line_breaks_become_lf(self):
+        assert PYTHON.minify("x = 1  # c\r\n\r\ny = 2\r\n") == "x = 1\ny = 2\n"
+
+    def test_nothing_to_strip(self):
+        source = "x = 1\n"
+
+        assert PYTHON.minify(source) is source
+
+
+class TestCStyleMinifier:
+    def test_c_comments(self):
+        source = (
+            "/* License\n"
+            " * header */\n"
+            "#include <stdio.h>\n"
+            "\n"
+            'int main(void) { // entry\n'
+            '    puts("/* not */ // a comment");\n'
+            "    return 0;\n"
+            "}\n"
+        )
+
+        assert C.minify(source) == (
+            "#include <stdio.h>\n"
+            "int main(void) {\n"
+            '    puts("/* not */ // a comment");\n'
+            "    return 0;\n"
+            "}\n"
+        )
+
+    def test_inline_block_comment_does_not_merge_words(self):
+        assert C.minify("int/**/x = a/* c */+b;\n") == "int x = a+b;\n"
+
+    def test_multiline_block_comment_becomes_a_line_break(self):
+        assert JAVASCRIPT.minify("return /*\n*/ x;\n") == "return\n x;\n"
+
+    def test_char_literals(self):
+        source = "char q = '\"'; // c\nchar s = '/';\n"
+
+        assert C.minify(source) == "char q = '\"';\nchar s = '/';\n"
+
+    def test_javascript_regex_literals_and_division(self):
+        source = (
+            "const re = /\\/\\/+/g; // slashes\n"
+            "const half = total / 2 / count; // division\n"
+            "if (/^https?:\\/\\//.test(url)) go();\n"
+        )
+
+        assert JAVASCRIPT.minify(source) == (
+            "const re = /\\/\\/+/g;\n"
+            "const half = total / 2 / count;\n"
+            "if (/^https?:\\/\\//.test(url)) go();\n"
+        )
+
+    def test_javascript_template_literal_is_kept_verbatim(self):
+        source = "const t = `line // one\n\n   line two`; // c\n"
+
+        assert JAVASCRIPT.minify(source) == "const t = `line // one\n\n   line two`;\n"
+
+    def test_javascript_templates_nested_in_substitutions(self):
+        source = (
+            'const url = `${base ? `https://${base}` : ""}/api`; // c\n'
+            "const t = `${ {a: `}`}['a'] /* ` */ } // kept\n\n`; // c\n"
+            "foo();\n"
+        )
+
+        assert JAVASCRIPT.minify(source) == (
+            'const url = `${base ? `https://${base}` : ""}/api`;\n'
+            "const t = `${ {a: `}`}['a'] /* ` */ } // kept\n\n`;\n"
+            "foo();\n"
+        )
+
+    @pytest.mark.parametrize("source", ["a = `never closed; // c\n", "a = `${ x `; // c\n"])
+    def test_unclosed_javascript_template_is_left_alone(self, source):
+        assert JAVASCRIPT.minify(source) == source
+
+    def test_cpp_raw_string(self):
+        source = 'auto s = R"x(// in raw )" string)x"; // c\n'
+
+        assert CPP.minify(source) == 'auto s = R"x(// in raw )" string)x";\n'
+
+    def test_rust_lifetimes_and_raw_strings(self):
+        source = (
+            "fn f<'a>(x: &'a str) -> &'a str { // c\n"
+            '    let s = r#"// "raw""#; /* c */\n'
+            "    x\n"
+            "}\n"
+        )
+
+        assert RUST.minify(source) == (
+            "fn f<'a>(x: &'a str) -> &'a str {\n"
+            '    let s = r#"// "raw""#;\n'
+            "    x\n"
+            "}\n"
+        )
+
+    def test_nested_rust_comment_is_left_alone(self):
+        source = "/* outer /* inner */ still a comment */\nfn main() {}\n"
+
+        assert RUST.minify(source) == source
+
+    def test_unclosed_block_comment_is_left_alone(self):
+        source = "int x; /* never closed\n"
+
+        assert C.minify(source) == source
+
+    def test_css_has_no_line_comments(self):
+        source = "a { background: url(http://x/y.png); } /* c */\n"
+
+        assert CSS.minify(source) == "a { background: url(http://x/y.png); }\n"
+
+
+class TestShellMinifier:
+    def test_comments_start_a_word(self):
+        source = (
+            "#!/bin/sh\n"
+            "# comment\n"
+            'echo "$#" ${#items[@]} a#b "# kept"  # trailing\n'
+        )
+
+        assert SHELL.minify(source) == (
+            '#!/bin/sh\necho "$#" ${#items[@]} a#b "# kept"\n'
+        )
+
+    def test_heredoc_body_is_kept(self):
+        source = "cat <<-'EOF' # c\n# data, not a comment\n\n\tEOF\n# c\necho done\n"
+
+        assert SHELL.minify(source) == (
+            "cat <<-'EOF' # c\n# data, not a comment\n\n\tEOF\necho done\n"
+        )
+
+    def test_unclosed_quote_is_left_alone(self):
+        source = "echo 'oops  # c\n"
+
+        assert SHELL.minify(source) == source
+
+
+class TestMinifierFor:
+    def test_by_suffix(self):
+        assert minifier_for("main.PY", "") is PYTHON
+        assert minifier_for("app.ts", "") is JAVASCRIPT
+        assert minifier_for("notes.md", "# title") is None
+
+    def test_by_shebang(self):
+        assert minifier_for("manage", "#!/usr/bin/env python3\n") is PYTHON
+        assert minifier_for("configure", "#!/bin/bash\n") is SHELL
+        assert minifier_for("run", "#!/usr/bin/env node\n") is None
+
+
+def _file(name, content):
+    return FileNode(name=name, content=content, size=len(content.encode("utf-8")))
+
+
+class TestContentMinifier:
+    def test_minifies_known_files_only(self):
+        tree = DirNode(
+            name="root",
+            files=[_file("a.py", "x = 1  # ü\n"), _file("README.md", "# Title\n")],
+            subdirectories=[],
+        )
+        minifier = ContentMinifier()
+
+        result = collect_directory(minifier.filter(directory_events(tree)))
+
+        assert [f.content for f in result.files] == ["x = 1\n", "# Title\n"]
+        assert result.files[0].size == tree.files[0].size
+        assert minifier.files == 1
+        assert minifier.input_bytes == len("x = 1  # ü\n".encode("utf-8"))
+        assert minifier.saved_bytes == len("  # ü".encode("utf-8"))
+
+    def test_empty_content_is_skipped(self):
+        tree = DirNode(name="root", files=[_file("a.py", "")], subdirectories=[])
+        minifier = ContentMinifier()
+
+        list(minifier.filter(directory_events(tree)))
+
+        assert minifier.input_bytes == 0
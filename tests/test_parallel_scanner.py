@@ -0,0 +1,95 @@
+import threading
+
+import pytest
+
+from core.file_reader import FileReader
+from core.parallel_scanner import ParallelScanner
+from core.scanner import BaseScanner
+from models import ScanConfig
+
+
+def _make_tree(root):
+    (root / "a.txt").write_text("a")
+    (root / "b.txt").write_text("bb")
+    sub = root / "sub"
+    sub.mkdir()
+    for i in range(20):
+        (sub / f"f{i:02}.txt").write_text(f"content {i}")
+    (sub / "deeper").mkdir()
+    (sub / "deeper" / "z.txt").write_text("z")
+
+
+class _TrackingReader(FileReader):
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.in_flight = 0
+        self.max_in_flight = 0
+        self.threads: set[str] = set()
+
+    def read(self, path, stat=None):
+        with self.lock:
+            self.in_flight += 1
+            self.max_in_flight = max(self.max_in_flight, self.in_flight)
+            self.threads.add(threading.current_thread().name)
+        try:
+            return super().read(path, stat)
+        finally:
+            with self.lock:
+                self.in_flight -= 1
+
+
+class TestParallelScanner:
+    def test_same_result_as_sequential_scan(self, tmp_path):
+        _make_tree(tmp_path)
+
+        expected = BaseScanner().scan(str(tmp_path), ScanConfig())
+        result = ParallelScanner(jobs=4).scan(str(tmp_path), ScanConfig())
+
+        assert result.directory == expected.directory
+        assert result.file_count == expected.file_count
+        assert result.dir_count == expected.dir_count
+
+    def test_reads_run_on_pool_threads(self, tmp_path):
+        _make_tree(tmp_path)
+        reader = _TrackingReader()
+
+        ParallelScanner(reader, jobs=2).scan(str(tmp_path), ScanConfig())
+
+        assert reader.threads
+        assert all(name.startswith("treesnake-read") for name in reader.threads)
+
+    def test_in_flight_bytes_cap_serializes_reads(self, tmp_path):
+        _make_tree(tmp_path)
+        reader = _TrackingReader()
+
+        result = ParallelScanner(reader, jobs=4, max_in_flight_bytes=1).scan(
+            str(tmp_path), ScanConfig()
+        )
+
+        assert reader.max_in_flight == 1
+        sub = result.directory.subdirectories[0]
+        assert [f.content for f in sub.files] == [
+            FileReader().read(str(tmp_path / "sub" / f.name)).content for f in sub.files
+        ]
+
+    def test_placeholders_are_respected(self, tmp_path):
+        (tmp_path / "big.log").write_bytes(b"0" * 100)
+        (tmp_path / "small.txt").write_text("hi")
+        config = ScanConfig(max_file_size=10)
+
+        result = ParallelScanner(jobs=2).scan(str(tmp_path), config)
+
+        contents = {f.name: f.content for f in result.directory.files}
+        assert contents == {"big.log": "[File too large: 100 bytes]", "small.txt": "hi"}
+
+    def test_rejects_non_positive_jobs(self):
+        with pytest.raises(ValueError):
+            ParallelScanner(jobs=0)
+
+    def test_iter_scan_events_match_sequential(self, tmp_path):
+        _make_tree(tmp_path)
+
+        expected = list(BaseScanner().iter_scan(str(tmp_path), ScanConfig()))
+        events = list(ParallelScanner(jobs=4).iter_scan(str(tmp_path), ScanConfig()))
+
+        assert events == expected
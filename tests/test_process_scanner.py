@@ -0,0 +1,105 @@
+from core.process_scanner import ProcessScanner
+from core.scanner import BaseScanner
+from models import ScanConfig
+
+
+def _make_tree(root):
+    (root / "root.txt").write_text("root")
+    for name in ("alpha", "beta", "gamma"):
+        sub = root / name
+        (sub / "inner").mkdir(parents=True)
+        (sub / f"{name}.txt").write_text(name)
+        (sub / "inner" / "deep.txt").write_text(f"deep {name}")
+
+
+class TestProcessScanner:
+    def test_same_result_as_sequential_scan(self, tmp_path):
+        _make_tree(tmp_path)
+
+        expected = BaseScanner().scan(str(tmp_path), ScanConfig())
+        result = ProcessScanner(processes=2, min_entries=0).scan(
+            str(tmp_path), ScanConfig()
+        )
+
+        assert result.directory == expected.directory
+        assert result.file_count == expected.file_count
+        assert result.dir_count == expected.dir_count
+        assert result.stat_calls == expected.stat_calls
+
+    def test_rules_apply_inside_workers(self, tmp_path):
+        _make_tree(tmp_path)
+        config = ScanConfig(exclude_dirs=["inner"], max_depth=1)
+
+        expected = BaseScanner().scan(str(tmp_path), config)
+        result = ProcessScanner(processes=2, min_entries=0).scan(str(tmp_path), config)
+
+        assert result.directory == expected.directory
+
+    def test_ignore_files_apply_inside_workers(self, tmp_path):
+        _make_tree(tmp_path)
+        (tmp_path / ".gitignore").write_text("deep.txt\n")
+        (tmp_path / "beta" / ".gitignore").write_text("!deep.txt\n")
+        config = ScanConfig(ignore_files=[".gitignore"])
+
+        expected = BaseScanner().scan(str(tmp_path), config)
+        result = ProcessScanner(processes=2, min_entries=0).scan(str(tmp_path), config)
+
+        assert result.directory == expected.directory
+        assert result.file_count == 7
+
+    def test_deeper_split_depth(self, tmp_path):
+        _make_tree(tmp_path)
+
+        expected = BaseScanner().scan(str(tmp_path), ScanConfig())
+        result = ProcessScanner(processes=2, split_depth=2, min_entries=0).scan(
+            str(tmp_path), ScanConfig()
+        )
+
+        assert result.directory == expected.directory
+
+    def test_small_tree_is_not_worth_forking(self, tmp_path):
+        _make_tree(tmp_path)
+        rules = ScanConfig().compile()
+
+        assert not ProcessScanner(processes=2)._worth_forking(str(tmp_path), rules)
+        assert ProcessScanner(processes=2, min_entries=1)._worth_forking(
+            str(tmp_path), rules
+        )
+
+    def test_single_subtree_is_not_worth_forking(self, tmp_path):
+        (tmp_path / "only").mkdir()
+        (tmp_path / "only" / "a.txt").write_text("a")
+        rules = ScanConfig().compile()
+
+        assert not ProcessScanner(processes=2, min_entries=1)._worth_forking(
+            str(tmp_path), rules
+        )
+
+    def test_counts_subtrees_at_split_depth(self, tmp_path):
+        for i in range(5):
+            (tmp_path / f"{i}.txt").write_text("x")
+        for name in ("alpha", "beta"):
+            (tmp_path / "src" / name).mkdir(parents=True)
+        rules = ScanConfig().compile()
+
+        assert ProcessScanner(processes=2, split_depth=2, min_entries=5)._worth_forking(
+            str(tmp_path), rules
+        )
+        assert not ProcessScanner(processes=2, min_entries=5)._worth_forking(
+            str(tmp_path), rules
+        )
+
+    def test_rules_are_compiled_once(self, tmp_path, monkeypatch):
+        _make_tree(tmp_path)
+        compiled = []
+        original_compile = ScanConfig.compile
+
+        def counting_compile(self):
+            compiled.append(self)
+            return original_compile(self)
+
+        monkeypatch.setattr(ScanConfig, "compile", counting_compile)
+
+        ProcessScanner(processes=2, min_entries=0).scan(str(tmp_path), ScanConfig())
+
+        assert len(compiled) == 1
@@ -0,0 +1,55 @@
+from core.rule_profiler import RULE_SET_NAMES, RuleProfiler
+from core.scanner import BaseScanner
+from models import ScanConfig
+
+
+def _make_tree(root):
+    (root / "node_modules").mkdir()
+    (root / "src").mkdir()
+    (root / "src" / "a.py").write_text("x")
+    (root / "src" / "b.pyc").write_bytes(b"x")
+    (root / "c.pyc").write_bytes(b"x")
+
+
+class TestRuleProfiler:
+    def test_counts_checks_and_hits_per_rule(self, tmp_path):
+        _make_tree(tmp_path)
+        profiler = RuleProfiler()
+        config = ScanConfig(
+            exclude_dirs=["node_modules", "dist"], exclude_files=["*.pyc"]
+        )
+
+        BaseScanner(rule_profiler=profiler).scan(str(tmp_path), config)
+
+        profiles = {profile.name: profile for profile in profiler.profiles}
+        assert list(profiles) == list(RULE_SET_NAMES)
+        dirs = profiles["exclude_dirs"]
+        assert dirs.calls == 2
+        assert dirs.hits == 1
+        assert dirs.rule_hits == {"node_modules": 1}
+        files = profiles["exclude_files"]
+        assert files.calls == 3
+        assert files.rule_hits == {"*.pyc": 2}
+        assert files.elapsed > 0
+
+    def test_instrumenting_keeps_the_scan_result(self, tmp_path):
+        _make_tree(tmp_path)
+        config = ScanConfig(exclude_dirs=["node_modules"], exclude_files=["*.pyc"])
+
+        expected = BaseScanner().scan(str(tmp_path), config)
+        result = BaseScanner(rule_profiler=RuleProfiler()).scan(str(tmp_path), config)
+
+        assert result.directory == expected.directory
+
+    def test_report_lists_rules_that_never_hit(self, tmp_path):
+        _make_tree(tmp_path)
+        profiler = RuleProfiler()
+        config = ScanConfig(exclude_dirs=["node_modules", "dist"])
+
+        BaseScanner(rule_profiler=profiler).scan(str(tmp_path), config)
+        report = profiler.report()
+
+        assert report.startswith("exclude_dirs: 2 checks, 1 hits")
+        assert "       1  node_modules" in report
+        assert "       0  dist" in report
+        assert "exclude_files" not in report
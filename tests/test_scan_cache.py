@@ -0,0 +1,102 @@
+import os
+import pickle
+
+import pytest
+
+from core.file_reader import SNIFF_BYTES, FileReader
+from core.scan_cache import CachedFileReader, ScanCache
+from core.scanner import BaseScanner
+from models import ScanConfig
+
+
+class _CountingReader(FileReader):
+    def __init__(self):
+        self.reads = []
+
+    def read(self, path, stat=None):
+        self.reads.append(os.path.basename(path))
+        return super().read(path, stat)
+
+
+@pytest.fixture
+def cache_path(tmp_path):
+    return tmp_path / "cache" / "scan_cache.sqlite3"
+
+
+def _scan(root, cache_path, reader):
+    cached = CachedFileReader(ScanCache(cache_path), reader)
+    try:
+        return BaseScanner(cached).scan(str(root), ScanConfig())
+    finally:
+        cached.close()
+
+
+class TestCachedFileReader:
+    def test_second_scan_reads_nothing(self, tmp_path, cache_path):
+        root = tmp_path / "project"
+        root.mkdir()
+        (root / "a.txt").write_text("a")
+        (root / "b.txt").write_text("b")
+
+        first = _scan(root, cache_path, _CountingReader())
+        reader = _CountingReader()
+        second = _scan(root, cache_path, reader)
+
+        assert reader.reads == []
+        assert second.directory == first.directory
+
+    def test_changed_file_is_reread(self, tmp_path, cache_path):
+        root = tmp_path / "project"
+        root.mkdir()
+        (root / "a.txt").write_text("a")
+        (root / "b.txt").write_text("b")
+        _scan(root, cache_path, _CountingReader())
+
+        (root / "b.txt").write_text("changed")
+        reader = _CountingReader()
+        result = _scan(root, cache_path, reader)
+
+        assert reader.reads == ["b.txt"]
+        contents = {f.name: f.content for f in result.directory.files}
+        assert contents == {"a.txt": "a", "b.txt": "changed"}
+
+    def test_unreadable_content_is_not_cached(self, tmp_path, cache_path):
+        root = tmp_path / "project"
+        root.mkdir()
+        (root / "late.txt").write_bytes(b"a" * SNIFF_BYTES + b"\xff")
+        _scan(root, cache_path, _CountingReader())
+
+        reader = _CountingReader()
+        _scan(root, cache_path, reader)
+
+        assert reader.reads == ["late.txt"]
+
+    def test_evicts_least_recently_used_over_limit(self, tmp_path, cache_path):
+        old = tmp_path / "old.txt"
+        new = tmp_path / "new.txt"
+        old.write_text("x" * 10)
+        new.write_text("y" * 10)
+
+        cache = ScanCache(cache_path, max_bytes=100)
+        cache.put(str(old), old.stat(), "x" * 10)
+        cache.close()
+        cache = ScanCache(cache_path, max_bytes=15)
+        cache.put(str(new), new.stat(), "y" * 10)
+        cache.close()
+
+        cache = ScanCache(cache_path)
+        assert cache.get(str(old), old.stat()) is None
+        assert cache.get(str(new), new.stat()) == "y" * 10
+        cache.close()
+
+    def test_survives_pickling(self, tmp_path, cache_path):
+        file = tmp_path / "a.txt"
+        file.write_text("a")
+        cache = ScanCache(cache_path)
+        cache.put(str(file), file.stat(), "a")
+        cache.close()
+
+        clone = pickle.loads(pickle.dumps(cache))
+
+        assert clone.get(str(file), file.stat()) == "a"
+        clone.close()
@@ -120,4 +120,48 @@ class TestScanUseGitignoreResolution:
         )
 
         assert result.exit_code == 0
-        assert _subdir_names(result.stdout) == {"src", "secret_stuff"}
\ No newline at end of file
+        assert _subdir_names(result.stdout) == {"src", "secret_stuff"}
+
+
+def _ndjson_paths(output: str) -> set[str]:
+    return {json.loads(line)["path"] for line in output.splitlines() if line}
+
+
+class TestScanTreesnakeignore:
+    _LINES = "*.log\n!keep.log\n/build/\n"
+
+    def _make_project(self, root):
+        for name in ("build/out.txt", "sub/build/out.txt", "sub/keep.log", "sub/x.log"):
+            (root / name).parent.mkdir(parents=True, exist_ok=True)
+            (root / name).write_text("x", encoding="utf-8")
+        (root / "keep.log").write_text("x", encoding="utf-8")
+        (root / "x.log").write_text("x", encoding="utf-8")
+
+    @pytest.mark.parametrize("use_gitignore", ["--gitignore", "--no-gitignore"])
+    def test_negation_and_anchoring_in_the_scan_root(self, tmp_path, use_gitignore):
+        self._make_project(tmp_path)
+        (tmp_path / ".treesnakeignore").write_text(self._LINES, encoding="utf-8")
+
+        result = runner.invoke(
+            app, ["scan", str(tmp_path), use_gitignore, "-f", "ndjson", "--no-cache"]
+        )
+
+        assert result.exit_code == 0, result.output
+        paths = _ndjson_paths(result.stdout)
+        assert {"keep.log", "sub/keep.log", "sub/build", "sub/build/out.txt"} <= paths
+        assert not {"x.log", "sub/x.log", "build"} & paths
+
+    def test_discovered_above_the_scan_root(self, tmp_path):
+        self._make_project(tmp_path / "app")
+        (tmp_path / ".treesnakeignore").write_text(
+            "*.log\n!keep.log\n/app/build/\n", encoding="utf-8"
+        )
+
+        result = runner.invoke(
+            app, ["scan", str(tmp_path / "app"), "-f", "ndjson", "--no-cache"]
+        )
+
+        assert result.exit_code == 0, result.output
+        paths = _ndjson_paths(result.stdout)
+        assert {"keep.log", "sub/keep.log", "sub/build"} <= paths
+        assert not {"x.log", "sub/x.log", "build"} & paths
@@ -0,0 +1,222 @@
+import contextlib
+import json
+
+import pytest
+from typer.testing import CliRunner
+
+from cli.app import app
+from core.clipboard import ClipboardError
+from core.file_reader import FileReader
+
+runner = CliRunner()
+
+
+@pytest.fixture(autouse=True)
+def _disable_update_check(monkeypatch):
+    monkeypatch.setattr("core.update_checker.UpdateChecker.check", lambda self: None)
+
+
+def _make_project(root):
+    (root / "src").mkdir()
+    (root / "src" / "main.py").write_text("print(1)", encoding="utf-8")
+    (root / "README.md").write_text("# hi", encoding="utf-8")
+
+
+class TestMultipleOutputs:
+    def test_one_scan_fans_out_to_every_output(self, tmp_path, monkeypatch):
+        project = tmp_path / "project"
+        project.mkdir()
+        _make_project(project)
+        reads = []
+        original_read = FileReader.read
+
+        def counting_read(self, path, stat=None):
+            reads.append(path)
+            return original_read(self, path, stat)
+
+        monkeypatch.setattr(FileReader, "read", counting_read)
+        out = tmp_path / "out"
+
+        result = runner.invoke(
+            app,
+            [
+                "scan", str(project), "--no-cache",
+                "-f", "llm", "-o", "stdout",
+                "-f", "json", "-o", "file", "--out-file", str(out / "scan.json"),
+                "-f", "ndjson", "-o", "file", "--out-file", str(out / "scan.ndjson"),
+            ],
+        )
+
+        assert result.exit_code == 0, result.output
+        assert "# project/src/main.py" in result.stdout
+        assert json.loads((out / "scan.json").read_text(encoding="utf-8"))["name"] == "project"
+        records = (out / "scan.ndjson").read_text(encoding="utf-8").splitlines()
+        assert [json.loads(line)["path"] for line in records] == [
+            ".", "README.md", "src", "src/main.py"
+        ]
+        assert len(reads) == 2
+
+    def test_single_output_flag_goes_with_every_format(self, tmp_path):
+        (tmp_path / "p").mkdir()
+        _make_project(tmp_path / "p")
+
+        result = runner.invoke(
+            app,
+            [
+                "scan", str(tmp_path / "p"), "-f", "llm", "-f", "json", "-o", "file",
+                "--out-file", str(tmp_path / "a.txt"), "--out-file", str(tmp_path / "b.json"),
+            ],
+        )
+
+        assert result.exit_code == 0, result.output
+        assert (tmp_path / "a.txt").read_text(encoding="utf-8").startswith("# p/")
+        json.loads((tmp_path / "b.json").read_text(encoding="utf-8"))
+
+    def test_config_outputs_list(self, tmp_path):
+        project = tmp_path / "p"
+        project.mkdir()
+        _make_project(project)
+        config = tmp_path / "treesnake.json"
+        config.write_text(
+            json.dumps(
+                {
+                    "config": {},
+                    "outputs": [
+                        f"llm:file:{tmp_path / 'ctx.txt'}",
+                        f"json:file:{tmp_path / 'scan.json.gz'}",
+                    ],
+                }
+            ),
+            encoding="utf-8",
+        )
+
+        result = runner.invoke(app, ["scan", str(project), "--config", str(config)])
+
+        assert result.exit_code == 0, result.output
+        assert (tmp_path / "ctx.txt").exists()
+        assert (tmp_path / "scan.json.gz").read_bytes()[:2] == b"\x1f\x8b"
+
+    @pytest.mark.parametrize(
+        "args, message",
+        [
+            (["-f", "llm", "-f", "json", "-f", "default", "-o", "stdout", "-o", "file"],
+             "same number of times"),
+            (["-f", "llm", "-f", "json", "-o", "stdout"], "more than once"),
+            (["-f", "llm", "-f", "json", "-o", "file", "--out-file", "x.txt"],
+             "one --out-file per file output"),
+        ],
+    )
+    def test_rejects_inconsistent_outputs(self, tmp_path, args, message):
+        _make_project(tmp_path)
+
+        result = runner.invoke(app, ["scan", str(tmp_path), *args])
+
+        assert result.exit_code == 1
+        assert message in result.output
+
+
+class TestFileOutput:
+    @pytest.mark.parametrize("name", ["scan.txt", "scan.txt.gz"])
+    def test_failing_scan_leaves_existing_out_file_unchanged(self, tmp_path, name):
+        (tmp_path / "p").mkdir()
+        _make_project(tmp_path / "p")
+        out = tmp_path / name
+        out.write_bytes(b"previous scan")
+
+        result = runner.invoke(
+            app,
+            ["scan", str(tmp_path / "p"), "--from-git-index", "-o", "file", "--out-file", str(out)],
+        )
+
+        assert result.exit_code == 1
+        assert out.read_bytes() == b"previous scan"
+        assert sorted(path.name for path in tmp_path.iterdir()) == ["p", name]
+
+    def test_out_file_is_replaced_once_written(self, tmp_path):
+        (tmp_path / "p").mkdir()
+        _make_project(tmp_path / "p")
+        out = tmp_path / "scan.txt"
+        out.write_text("previous scan", encoding="utf-8")
+        out.chmod(0o640)
+
+        result = runner.invoke(
+            app, ["scan", str(tmp_path / "p"), "-f", "llm", "-o", "file", "--out-file", str(out)]
+        )
+
+        assert result.exit_code == 0, result.output
+        assert out.read_text(encoding="utf-8").startswith("# p/")
+        assert out.stat().st_mode & 0o777 == 0o640
+        assert sorted(path.name for path in tmp_path.iterdir()) == ["p", "scan.txt"]
+
+
+class TestClipboardOutput:
+    def test_output_is_streamed_into_the_clipboard(self, tmp_path, monkeypatch):
+        (tmp_path / "p").mkdir()
+        _make_project(tmp_path / "p")
+        copied = []
+
+        class FakeClipboard:
+            def open(self):
+                return contextlib.nullcontext(_Recorder(copied))
+
+            def copy(self, text):
+                raise AssertionError("the whole text should never be built")
+
+        monkeypatch.setattr("cli.utils.Clipboard", FakeClipboard)
+
+        result = runner.invoke(
+            app, ["scan", str(tmp_path / "p"), "--no-cache", "-f", "llm", "-o", "clipboard"]
+        )
+
+        assert result.exit_code == 0, result.output
+        assert "Copied to clipboard." in result.stderr
+        assert len(copied) > 1
+        assert "# p/src/main.py" in "".join(copied)
+
+    def test_clipboard_error_exits_with_message(self, tmp_path, monkeypatch):
+        (tmp_path / "p").mkdir()
+        _make_project(tmp_path / "p")
+
+        class BrokenClipboard:
+            def open(self):
+                raise ClipboardError("xclip not found")
+
+        monkeypatch.setattr("cli.utils.Clipboard", BrokenClipboard)
+
+        result = runner.invoke(
+            app, ["scan", str(tmp_path / "p"), "--no-cache", "-o", "clipboard"]
+        )
+
+        assert result.exit_code == 1
+        assert "Clipboard error: xclip not found" in result.stderr
+
+
+class TestMinify:
+    def test_minifies_source_files_and_reports_the_saving(self, tmp_path):
+        (tmp_path / "main.py").write_text(
+            '"""Entry point."""\n\n# say hi\nprint(1)  # one\n', encoding="utf-8"
+        )
+        (tmp_path / "README.md").write_text("# hi\n", encoding="utf-8")
+
+        result = runner.invoke(
+            app, ["scan", str(tmp_path), "--no-cache", "-f", "llm", "--minify"]
+        )
+
+        assert result.exit_code == 0, result.output
+        assert "print(1)\n" in result.stdout
+        assert "say hi" not in result.stdout
+        assert "Entry point" not in result.stdout
+        assert "# hi" in result.stdout
+        assert "Minified 1 files: saved 36 bytes" in result.stderr
+
+
+class _Recorder:
+    def __init__(self, writes):
+        self._writes = writes
+
+    def write(self, text):
+        self._writes.append(text)
+        return len(text)
+
+    def flush(self):
+        pass
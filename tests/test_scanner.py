@@ -1,7 +1,10 @@
+import os
+
 import pytest
 
-from core.scanner import BaseScanner
-from models import ScanConfig
+from core.file_reader import FileReader
+from core.scanner import BaseScanner, ScanError, track_scan
+from models import EnterDirEvent, ExitDirEvent, FileEvent, ScanConfig, ScanStats
 
 
 @pytest.fixture
@@ -145,6 +148,19 @@ class TestBaseScanner:
         small_file = next(f for f in result.directory.files if f.name == "small.txt")
         assert small_file.content == "hi"
 
+    def test_head_and_tail_lines_truncate_large_files(self, tmp_path, scanner):
+        big = tmp_path / "big.log"
+        big.write_text("".join(f"{i}\n" for i in range(100)))
+        (tmp_path / "small.txt").write_text("a\nb\nc\n")
+        config = ScanConfig(max_file_size=10, head_lines=1, tail_lines=1)
+
+        result = scanner.scan(str(tmp_path), config)
+
+        contents = {f.name: f.content for f in result.directory.files}
+        assert contents["big.log"].startswith("0\n[... ")
+        assert contents["big.log"].endswith("omitted ...]\n99\n")
+        assert contents["small.txt"] == "a\nb\nc\n"
+
     def test_exclude_content_files_wins_over_max_file_size(self, tmp_path, scanner):
         big = tmp_path / "big.log"
         big.write_bytes(b"0" * 100)
@@ -183,6 +199,169 @@ class TestBaseScanner:
         assert len(result.directory.subdirectories) == 1
 
 
+    def test_ignore_patterns_are_path_aware(self, tmp_path, scanner):
+        (tmp_path / "build" / "generated").mkdir(parents=True)
+        (tmp_path / "build" / "generated" / "out.c").write_text("x")
+        (tmp_path / "build" / "keep.txt").write_text("x")
+        (tmp_path / "a.log").write_text("x")
+        (tmp_path / "keep.log").write_text("x")
+        config = ScanConfig(ignore_patterns=["build/generated/", "*.log", "!keep.log"])
+
+        result = scanner.scan(str(tmp_path), config)
+
+        assert {f.name for f in result.directory.files} == {"keep.log"}
+        (build,) = result.directory.subdirectories
+        assert [f.name for f in build.files] == ["keep.txt"]
+        assert build.subdirectories == []
+
+    def test_ignored_directories_are_never_listed(self, tmp_path, scanner, monkeypatch):
+        (tmp_path / "node_modules" / "pkg").mkdir(parents=True)
+        (tmp_path / "src").mkdir()
+        listed = []
+        real_scandir = os.scandir
+
+        def scandir(path):
+            listed.append(os.path.basename(path))
+            return real_scandir(path)
+
+        monkeypatch.setattr("core.scanner.os.scandir", scandir)
+        scanner.scan(str(tmp_path), ScanConfig(ignore_patterns=["/node_modules"]))
+
+        assert "node_modules" not in listed
+        assert "pkg" not in listed
+        assert "src" in listed
+
+
+    def test_nested_ignore_files_apply_below_their_directory(self, tmp_path, scanner):
+        (tmp_path / ".gitignore").write_text("*.log\n")
+        pkg = tmp_path / "pkg"
+        (pkg / "out").mkdir(parents=True)
+        (pkg / ".gitignore").write_text("/out\n!keep.log\n")
+        (pkg / "out" / "big.bin").write_text("x")
+        (pkg / "keep.log").write_text("x")
+        (pkg / "drop.log").write_text("x")
+        (tmp_path / "out").mkdir()
+        (tmp_path / "keep.log").write_text("x")
+        config = ScanConfig(ignore_files=[".gitignore"])
+
+        result = scanner.scan(str(tmp_path), config)
+
+        root = result.directory
+        assert {f.name for f in root.files} == {".gitignore"}
+        assert {d.name for d in root.subdirectories} == {"out", "pkg"}
+        pkg_node = next(d for d in root.subdirectories if d.name == "pkg")
+        assert {f.name for f in pkg_node.files} == {".gitignore", "keep.log"}
+        assert pkg_node.subdirectories == []
+
+    def test_ignore_files_are_read_in_listed_order(self, tmp_path, scanner):
+        (tmp_path / ".gitignore").write_text("*.txt\n")
+        (tmp_path / ".treesnakeignore").write_text("!notes.txt\n")
+        (tmp_path / "notes.txt").write_text("x")
+        (tmp_path / "other.txt").write_text("x")
+        config = ScanConfig(ignore_files=[".gitignore", ".treesnakeignore"])
+
+        result = scanner.scan(str(tmp_path), config)
+
+        names = {f.name for f in result.directory.files}
+        assert "notes.txt" in names
+        assert "other.txt" not in names
+
+
+    def test_include_paths_prune_unrelated_directories(
+        self, tmp_path, scanner, monkeypatch
+    ):
+        (tmp_path / "src" / "core").mkdir(parents=True)
+        (tmp_path / "src" / "cli").mkdir()
+        (tmp_path / "docs" / "deep").mkdir(parents=True)
+        (tmp_path / "src" / "core" / "rule.py").write_text("x")
+        (tmp_path / "src" / "cli" / "app.py").write_text("x")
+        (tmp_path / "src" / "top.py").write_text("x")
+        (tmp_path / "README.md").write_text("x")
+        listed = []
+        real_scandir = os.scandir
+
+        def scandir(path):
+            listed.append(os.path.relpath(path, tmp_path))
+            return real_scandir(path)
+
+        monkeypatch.setattr("core.scanner.os.scandir", scandir)
+        config = ScanConfig(include_paths=["src/core/**", "README.md"])
+
+        result = scanner.scan(str(tmp_path), config)
+
+        assert sorted(listed) == [".", "src", os.path.join("src", "core")]
+        assert [f.name for f in result.directory.files] == ["README.md"]
+        (src,) = result.directory.subdirectories
+        assert src.files == []
+        assert [d.name for d in src.subdirectories] == ["core"]
+        assert [f.name for f in src.subdirectories[0].files] == ["rule.py"]
+
+
+class _CountingReader(FileReader):
+    def __init__(self):
+        self.reads = 0
+
+    def read(self, path, stat=None):
+        self.reads += 1
+        return super().read(path, stat)
+
+
+class TestIterScan:
+    def test_event_order(self, tmp_path, scanner, empty_config):
+        sub = tmp_path / "sub"
+        sub.mkdir()
+        (sub / "nested.txt").write_text("nested")
+        (tmp_path / "root.txt").write_text("root")
+
+        events = list(scanner.iter_scan(str(tmp_path), empty_config))
+
+        assert [type(e) for e in events] == [
+            EnterDirEvent,
+            FileEvent,
+            EnterDirEvent,
+            FileEvent,
+            ExitDirEvent,
+            ExitDirEvent,
+        ]
+        assert events[0] == EnterDirEvent(name=tmp_path.name, file_count=1, dir_count=1)
+        assert events[1].file.content == "root"
+        assert events[3].file.name == "nested.txt"
+
+    def test_counts_exclude_filtered_entries(self, tmp_path, scanner):
+        (tmp_path / "main.py").write_text("code")
+        (tmp_path / "data.pyc").write_bytes(b"\xff")
+        (tmp_path / ".git").mkdir()
+        (tmp_path / "dist").mkdir()
+        config = ScanConfig(
+            exclude_files=["*.pyc"], exclude_dirs=[".git"], exclude_content_dirs=["dist"]
+        )
+
+        first = next(scanner.iter_scan(str(tmp_path), config))
+
+        assert (first.file_count, first.dir_count) == (1, 1)
+
+    def test_reads_lazily(self, tmp_path, empty_config):
+        for name in ("a.txt", "b.txt", "c.txt"):
+            (tmp_path / name).write_text(name)
+        reader = _CountingReader()
+
+        events = BaseScanner(reader).iter_scan(str(tmp_path), empty_config)
+        next(events)
+        next(events)
+
+        assert reader.reads == 1
+
+    def test_scan_collects_iter_scan(self, tmp_path, scanner, empty_config):
+        (tmp_path / "sub").mkdir()
+        (tmp_path / "sub" / "x.txt").write_text("x")
+        (tmp_path / "y.txt").write_text("y")
+
+        result = scanner.scan(str(tmp_path), empty_config)
+
+        assert result.directory.files[0].name == "y.txt"
+        assert result.directory.subdirectories[0].files[0].content == "x"
+
+
 class TestScanResult:
     def test_elapsed_is_positive(self, tmp_path, scanner, empty_config):
         result = scanner.scan(str(tmp_path), empty_config)
@@ -214,4 +393,59 @@ class TestScanResult:
         result = scanner.scan(str(tmp_path), empty_config)
 
         assert result.file_count == 2
-        assert result.dir_count == 1
\ No newline at end of file
+        assert result.dir_count == 1
+
+    def test_stat_calls_one_per_kept_file(self, tmp_path, scanner, empty_config):
+        (tmp_path / "a.txt").write_text("a")
+        (tmp_path / "b.txt").write_text("b")
+        (tmp_path / "sub").mkdir()
+
+        result = scanner.scan(str(tmp_path), empty_config)
+
+        assert result.stat_calls == 2
+
+    def test_excluded_files_are_not_stated(self, tmp_path, scanner):
+        (tmp_path / "main.py").write_text("code")
+        (tmp_path / "data.pyc").write_bytes(b"\xff")
+        config = ScanConfig(exclude_files=["*.pyc"])
+
+        result = scanner.scan(str(tmp_path), config)
+
+        assert result.stat_calls == 1
+
+    def test_symlink_is_stated_once(self, tmp_path, scanner, empty_config):
+        target = tmp_path / "target.txt"
+        target.write_text("x")
+        (tmp_path / "link.txt").symlink_to(target)
+
+        result = scanner.scan(str(tmp_path), empty_config)
+
+        assert {f.name for f in result.directory.files} == {"target.txt", "link.txt"}
+        assert result.stat_calls == 2
+
+
+class TestTrackScan:
+    def test_counts_match_scan_result(self, tmp_path, scanner, empty_config):
+        sub = tmp_path / "sub"
+        (sub / "deeper").mkdir(parents=True)
+        (sub / "nested.txt").write_text("x")
+        (tmp_path / "root.txt").write_text("y")
+        stats = ScanStats()
+
+        list(track_scan(scanner.iter_scan(str(tmp_path), empty_config), stats))
+        result = scanner.scan(str(tmp_path), empty_config)
+
+        assert (stats.file_count, stats.dir_count) == (result.file_count, result.dir_count)
+        assert stats.elapsed > 0
+
+    def test_wraps_scanner_errors(self):
+        def failing():
+            yield EnterDirEvent(name="root", file_count=0, dir_count=0)
+            raise OSError("boom")
+
+        events = track_scan(failing(), ScanStats())
+        next(events)
+
+        with pytest.raises(ScanError) as excinfo:
+            next(events)
+        assert isinstance(excinfo.value.__cause__, OSError)
@@ -183,4 +183,16 @@ class TestTemplateRoundTrip:
         result = ConfigReader().read(str(tmp_path / filename))
 
         assert result.config.max_depth == 3
-        assert result.config.max_file_size == 2048
\ No newline at end of file
+        assert result.config.max_file_size == 2048
+
+    @pytest.mark.parametrize("fmt", ["env", "json", "yaml", "toml"])
+    def test_ignore_patterns_root_is_not_written(self, tmp_path, creator_and_extension, fmt):
+        creator, filename = creator_and_extension[fmt]
+        config = ScanConfig(ignore_patterns=["/build/"]).with_ignore_patterns_root("app")
+        creator.create(str(tmp_path), ScanTemplate(config=config))
+
+        written = (tmp_path / filename).read_text(encoding="utf-8")
+        result = ConfigReader().read(str(tmp_path / filename))
+
+        assert "app" not in written.lower()
+        assert result.config.ignore_patterns == ["/build/"]
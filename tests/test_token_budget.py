@@ -0,0 +1,171 @@
+import os
+
+import pytest
+
+from core.file_reader import FileReader
+from core.parallel_scanner import ParallelScanner
+from core.scanner import BaseScanner
+from core.token_budget import (
+    BudgetCandidate,
+    CharRatioEstimator,
+    DepthPriority,
+    PathPatternPriority,
+    SmallestFirstPriority,
+    TokenBudget,
+    WalkOrderPriority,
+)
+from models import ScanConfig
+
+
+class _RecordingReader(FileReader):
+    def __init__(self):
+        super().__init__()
+        self.read_paths: list[str] = []
+
+    def read(self, path, stat=None):
+        self.read_paths.append(os.path.basename(path))
+        return super().read(path, stat)
+
+
+def _make_tree(root):
+    (root / "small.txt").write_text("a" * 40)
+    (root / "big.txt").write_text("b" * 4000)
+    (root / "pkg").mkdir()
+    (root / "pkg" / "mid.txt").write_text("c" * 400)
+
+
+def _files(directory, prefix=""):
+    found = {}
+    for file in directory.files:
+        found[prefix + file.name] = file.content
+    for sub in directory.subdirectories:
+        found.update(_files(sub, f"{prefix}{sub.name}/"))
+    return found
+
+
+def _candidate(path, size=0, order=0):
+    return BudgetCandidate(path=path, size=size, depth=path.count("/"), order=order)
+
+
+class TestCharRatioEstimator:
+    def test_counts_characters_per_token_rounded_up(self):
+        estimator = CharRatioEstimator(chars_per_token=4)
+        assert estimator.count("") == 0
+        assert estimator.count("abcd") == 1
+        assert estimator.count("abcde") == 2
+        assert estimator.estimate_size(9) == 3
+
+    def test_rejects_non_positive_ratio(self):
+        with pytest.raises(ValueError):
+            CharRatioEstimator(chars_per_token=0)
+
+
+class TestBudgetPriorities:
+    def test_smallest_first(self):
+        candidates = [_candidate("a", 30, 0), _candidate("b", 10, 1)]
+        ordered = sorted(candidates, key=SmallestFirstPriority().key)
+        assert [c.path for c in ordered] == ["b", "a"]
+
+    def test_depth(self):
+        candidates = [_candidate("x/y/deep", order=0), _candidate("top", order=1)]
+        ordered = sorted(candidates, key=DepthPriority().key)
+        assert [c.path for c in ordered] == ["top", "x/y/deep"]
+
+    def test_walk_order(self):
+        candidates = [_candidate("b", 1, 1), _candidate("a", 9, 0)]
+        ordered = sorted(candidates, key=WalkOrderPriority().key)
+        assert [c.path for c in ordered] == ["a", "b"]
+
+    def test_path_patterns_rank_by_first_matching_pattern(self):
+        priority = PathPatternPriority(["docs/*.md", "src/**"])
+        candidates = [
+            _candidate("setup.py", order=0),
+            _candidate("src/core/scanner.py", order=1),
+            _candidate("docs/index.md", order=2),
+        ]
+        ordered = sorted(candidates, key=priority.key)
+        assert [c.path for c in ordered] == [
+            "docs/index.md",
+            "src/core/scanner.py",
+            "setup.py",
+        ]
+
+
+class TestTokenBudget:
+    def test_rejects_negative_budget(self):
+        with pytest.raises(ValueError):
+            TokenBudget(-1)
+
+    def test_unlimited_budget_keeps_every_file(self, tmp_path):
+        _make_tree(tmp_path)
+        budget = TokenBudget(100_000)
+
+        result = BaseScanner(token_budget=budget).scan(str(tmp_path), ScanConfig())
+
+        assert result.directory == BaseScanner().scan(str(tmp_path), ScanConfig()).directory
+        assert budget.omitted == 0
+
+    def test_files_over_budget_are_not_read_but_still_listed(self, tmp_path):
+        _make_tree(tmp_path)
+        reader = _RecordingReader()
+        budget = TokenBudget(200)
+
+        result = BaseScanner(reader, token_budget=budget).scan(str(tmp_path), ScanConfig())
+
+        files = _files(result.directory)
+        assert set(files) == {"small.txt", "big.txt", "pkg/mid.txt"}
+        assert files["small.txt"] == "a" * 40
+        assert files["pkg/mid.txt"] == "c" * 400
+        assert files["big.txt"].startswith("[Omitted: over token budget")
+        assert sorted(reader.read_paths) == ["mid.txt", "small.txt"]
+        assert budget.omitted == 1
+        assert budget.used_tokens <= budget.max_tokens
+
+    def test_priority_decides_who_gets_the_budget(self, tmp_path):
+        _make_tree(tmp_path)
+        budget = TokenBudget(1100, priority=PathPatternPriority(["big.txt"]))
+
+        result = BaseScanner(token_budget=budget).scan(str(tmp_path), ScanConfig())
+
+        files = _files(result.directory)
+        assert files["big.txt"] == "b" * 4000
+        assert files["small.txt"] == "a" * 40
+        assert files["pkg/mid.txt"].startswith("[Omitted")
+        assert budget.omitted == 1
+
+    def test_zero_budget_still_emits_the_tree(self, tmp_path):
+        _make_tree(tmp_path)
+        budget = TokenBudget(0)
+
+        result = BaseScanner(token_budget=budget).scan(str(tmp_path), ScanConfig())
+
+        assert result.file_count == 3
+        assert result.dir_count == 1
+        # small.txt costs no more than its placeholder would.
+        assert _files(result.directory)["small.txt"] == "a" * 40
+        assert budget.omitted == 2
+
+    def test_enforce_cuts_files_the_estimate_undercounted(self, tmp_path):
+        class _Optimistic(CharRatioEstimator):
+            def estimate_size(self, size):
+                return 0
+
+        _make_tree(tmp_path)
+        budget = TokenBudget(250, estimator=_Optimistic(chars_per_token=4))
+
+        result = BaseScanner(token_budget=budget).scan(str(tmp_path), ScanConfig())
+
+        files = _files(result.directory)
+        assert files["big.txt"].startswith("[Omitted")
+        assert budget.used_tokens <= budget.max_tokens
+
+    def test_parallel_scanner_honours_the_budget(self, tmp_path):
+        _make_tree(tmp_path)
+        budget = TokenBudget(200)
+
+        result = ParallelScanner(jobs=2, token_budget=budget).scan(str(tmp_path), ScanConfig())
+
+        files = _files(result.directory)
+        assert files["big.txt"].startswith("[Omitted")
+        assert files["small.txt"] == "a" * 40
+        assert budget.omitted == 1
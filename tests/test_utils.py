@@ -1,55 +1,94 @@
-from cli.utils import apply_gitignore
-from models import ScanConfig
+import gzip
+
+from cli.types import Compression, OutputDest
+from cli.utils import apply_gitignore, write_output
+from core.events import directory_events
+from core.formatter import JsonStringFormatter, LLMFormatter, NdjsonFormatter
+from models import Directory, File, ScanConfig
+
+
+def _directory():
+    return Directory(
+        name="root",
+        files=[File(name="main.py", content="print(1)", size=8)],
+        subdirectories=[],
+    )
 
 
 class TestApplyGitignore:
-    def test_returns_same_config_when_no_gitignore_present(self, tmp_path):
+    def test_adds_ignore_files(self):
+        result = apply_gitignore(ScanConfig())
+
+        assert result.ignore_files == [".gitignore", ".treesnakeignore"]
+
+    def test_keeps_existing_ignore_files_first(self):
+        config = ScanConfig(ignore_files=[".dockerignore", ".gitignore"])
+
+        result = apply_gitignore(config)
+
+        assert result.ignore_files == [".dockerignore", ".gitignore", ".treesnakeignore"]
+
+    def test_does_not_mutate_original_config(self):
         config = ScanConfig(exclude_dirs=["venv"])
 
-        result = apply_gitignore(config, tmp_path)
+        apply_gitignore(config)
 
-        assert result.exclude_dirs == ["venv"]
-        assert result.exclude_files == []
+        assert config.ignore_files == []
 
-    def test_merges_patterns_additively(self, tmp_path):
-        (tmp_path / ".gitignore").write_text("*.pyc\ndist/\n", encoding="utf-8")
-        config = ScanConfig(exclude_dirs=["venv"], exclude_files=["*.log"])
+    def test_preserves_other_config_fields(self):
+        config = ScanConfig(
+            max_depth=2, include_files=["*.py"], ignore_patterns=["/build"]
+        )
 
-        result = apply_gitignore(config, tmp_path)
+        result = apply_gitignore(config)
 
-        assert set(result.exclude_dirs) == {"venv", "dist", "*.pyc"}
-        assert set(result.exclude_files) == {"*.log", "*.pyc"}
+        assert result.max_depth == 2
+        assert result.include_files == ["*.py"]
+        assert result.ignore_patterns == ["/build"]
 
-    def test_does_not_mutate_original_config(self, tmp_path):
-        (tmp_path / ".gitignore").write_text("dist/\n", encoding="utf-8")
-        config = ScanConfig(exclude_dirs=["venv"])
 
-        apply_gitignore(config, tmp_path)
+class TestWriteOutput:
+    def test_streams_to_file(self, tmp_path):
+        out_file = tmp_path / "nested" / "out.txt"
 
-        assert config.exclude_dirs == ["venv"]
+        write_output(
+            LLMFormatter(), directory_events(_directory()), OutputDest.file, out_file
+        )
 
-    def test_deduplicates_overlapping_patterns(self, tmp_path):
-        (tmp_path / ".gitignore").write_text("*.pyc\n", encoding="utf-8")
-        config = ScanConfig(exclude_files=["*.pyc"])
+        assert out_file.read_text(encoding="utf-8") == LLMFormatter().format(_directory())
 
-        result = apply_gitignore(config, tmp_path)
+    def test_compresses_file(self, tmp_path):
+        out_file = tmp_path / "out.txt.gz"
 
-        assert result.exclude_files.count("*.pyc") == 1
+        write_output(
+            LLMFormatter(),
+            directory_events(_directory()),
+            OutputDest.file,
+            out_file,
+            Compression.gzip,
+        )
 
-    def test_empty_gitignore_leaves_config_unchanged(self, tmp_path):
-        (tmp_path / ".gitignore").write_text("", encoding="utf-8")
-        config = ScanConfig(exclude_dirs=["venv"])
+        text = gzip.decompress(out_file.read_bytes()).decode("utf-8")
+        assert text == LLMFormatter().format(_directory())
 
-        result = apply_gitignore(config, tmp_path)
+    def test_stdout_output_ends_with_one_newline(self, capsys):
+        write_output(LLMFormatter(), directory_events(_directory()), OutputDest.stdout, None)
 
-        assert result.exclude_dirs == ["venv"]
+        assert capsys.readouterr().out == LLMFormatter().format(_directory())
 
-    def test_preserves_other_config_fields(self, tmp_path):
-        (tmp_path / ".gitignore").write_text("dist/\n", encoding="utf-8")
-        config = ScanConfig(max_depth=2, max_file_size=1024, include_files=["*.py"])
+    def test_stdout_newline_is_added_when_missing(self, capsys):
+        formatter = JsonStringFormatter()
 
-        result = apply_gitignore(config, tmp_path)
+        write_output(formatter, directory_events(_directory()), OutputDest.stdout, None)
 
-        assert result.max_depth == 2
-        assert result.max_file_size == 1024
-        assert result.include_files == ["*.py"]
\ No newline at end of file
+        assert capsys.readouterr().out == formatter.format(_directory()) + "\n"
+
+    def test_ndjson_to_stdout_has_no_blank_line(self, capsysbinary):
+        write_output(
+            NdjsonFormatter(), directory_events(_directory()), OutputDest.stdout, None
+        )
+
+        assert capsysbinary.readouterr().out == (
+            b'{"type": "dir", "path": ".", "name": "root", "files": 1, "dirs": 0}\n'
+            b'{"type": "file", "path": "main.py", "size": 8, "content": "print(1)"}\n'
+        )